@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for volume "In Use" detection
+
+Compares the old nested scan (every volume against every container's
+mounts) with core.build_mount_index() on synthetic data: 2,000 volumes and
+500 containers with a few mounts each. No Docker daemon is needed.
+"""
+
+import random
+import time
+
+import core
+
+def make_synthetic_inventory(volume_count=2000, container_count=500, mounts_per_container=4):
+    """Create fake volume names and container dictionaries"""
+    rng = random.Random(42)
+    volumes = [f"volume_{i:05d}" for i in range(volume_count)]
+
+    containers = []
+    for i in range(container_count):
+        mounts = []
+        for name in rng.sample(volumes, mounts_per_container):
+            mounts.append({'Type': 'volume', 'Name': name, 'Destination': f"/data/{name}"})
+        mounts.append({'Type': 'bind', 'Source': f"/srv/app{i}", 'Destination': '/srv'})
+        containers.append({'Id': f"{i:064x}", 'Mounts': mounts})
+
+    return volumes, containers
+
+def nested_scan(volumes, containers):
+    """The previous O(volumes x containers x mounts) detection"""
+    in_use = {}
+    for volume_name in volumes:
+        used = False
+        for container in containers:
+            for mount in container.get('Mounts', []):
+                if mount.get('Type') == 'volume' and mount.get('Name') == volume_name:
+                    used = True
+                    break
+            if used:
+                break
+        in_use[volume_name] = used
+    return in_use
+
+def indexed_scan(volumes, containers):
+    """Detection through the reverse mount index"""
+    index = core.build_mount_index(containers)
+    return {volume_name: volume_name in index for volume_name in volumes}
+
+def benchmark(rounds=3):
+    volumes, containers = make_synthetic_inventory()
+    print(f"Synthetic inventory: {len(volumes)} volumes, {len(containers)} containers\n")
+
+    results = {}
+    reference = None
+    for name, func in [('nested', nested_scan), ('indexed', indexed_scan)]:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            in_use = func(volumes, containers)
+            timings.append(time.perf_counter() - start)
+
+        if reference is None:
+            reference = in_use
+        assert in_use == reference, f"{name} scan disagrees with the nested scan"
+
+        results[name] = min(timings)
+        print(f"  {name:8s} best {min(timings) * 1000:10.2f} ms")
+
+    used = sum(1 for v in reference.values() if v)
+    print(f"\n{used} of {len(volumes)} volumes in use")
+    print(f"Speedup: {results['nested'] / results['indexed']:.0f}x")
+
+if __name__ == '__main__':
+    benchmark()
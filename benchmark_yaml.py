@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for YAML catalog loading
+
+Parses every service definition in the services directory with the
+pure-Python SafeLoader and, if available, the libyaml CSafeLoader, and
+prints the time each backend needs to load the whole catalog.
+"""
+
+import os
+import sys
+import time
+
+import yaml
+
+import core
+import yaml_io
+
+def load_catalog(services_dir, filenames, loader):
+    """Parse all service files with the given loader class"""
+    services = []
+    for filename in filenames:
+        with open(os.path.join(services_dir, filename), 'r') as f:
+            services.append(yaml_io.safe_load(f, loader=loader))
+    return services
+
+def benchmark(rounds=5):
+    services_dir = core.get_services_directory()
+    filenames = sorted(f for f in os.listdir(services_dir) if f.endswith('.yml'))
+
+    backends = [('python', yaml.SafeLoader)]
+    if hasattr(yaml, 'CSafeLoader'):
+        backends.append(('libyaml', yaml.CSafeLoader))
+    else:
+        print("libyaml is not available, only the pure-Python loader is measured")
+
+    print(f"Loading {len(filenames)} service files from {services_dir} ({rounds} rounds)")
+    print(f"Default backend: {yaml_io.YAML_BACKEND}\n")
+
+    results = {}
+    reference = None
+    for name, loader in backends:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            services = load_catalog(services_dir, filenames, loader)
+            timings.append(time.perf_counter() - start)
+
+        # Both backends must produce identical data
+        if reference is None:
+            reference = services
+        elif services != reference:
+            print(f"✗ {name} backend produced different results")
+            sys.exit(1)
+
+        results[name] = min(timings)
+        print(f"  {name:8s} best {min(timings) * 1000:8.1f} ms   mean {sum(timings) / len(timings) * 1000:8.1f} ms")
+
+    if 'libyaml' in results:
+        print(f"\nSpeedup: {results['python'] / results['libyaml']:.1f}x")
+
+if __name__ == '__main__':
+    benchmark()
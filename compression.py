@@ -0,0 +1,273 @@
+"""
+Streaming compression for docker_helper backups
+Compresses chunk streams straight into the output file in a single pass
+"""
+
+import gzip
+import lzma
+import os
+import shutil
+import subprocess
+import time
+import collections
+import concurrent.futures
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# File suffix of each compression format
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst', 'xz': '.xz', 'none': ''}
+
+# Level used when none is given, and the valid range of each format
+DEFAULT_LEVELS = {'gzip': 6, 'zstd': 3, 'xz': 6, 'none': 0}
+LEVEL_RANGES = {'gzip': (1, 9), 'zstd': (1, 19), 'xz': (0, 9), 'none': (0, 0)}
+
+# Minimum seconds between two progress callbacks
+PROGRESS_INTERVAL = 1.0
+
+# Compression threads used when none is given
+DEFAULT_THREADS = os.cpu_count() or 1
+
+# Uncompressed size of one block of the thread-pool compressor
+PARALLEL_BLOCK_SIZE = 1024 * 1024
+
+def available_formats():
+    """
+    Compression formats usable on this machine.
+
+    gzip and xz come with Python; zstd needs the zstandard module or the
+    zstd command line tool.
+
+    Returns:
+        list: Format names, e.g. ['gzip', 'zstd', 'xz', 'none']
+    """
+    formats = ['gzip']
+    if zstandard is not None or shutil.which('zstd'):
+        formats.append('zstd')
+    formats.extend(['xz', 'none'])
+    return formats
+
+class _ProcessWriter:
+    """Pipes written data through a compressor process into a file."""
+
+    def __init__(self, command, fileobj):
+        self.command = command
+        fileobj.flush()
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=fileobj)
+
+    def write(self, data):
+        self._process.stdin.write(data)
+
+    def close(self):
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise OSError(f"{self.command[0]} exited with status {self._process.returncode}")
+
+    def abort(self):
+        """Stop the process after a failed stream, without raising."""
+        self._process.kill()
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._process.wait()
+
+class _PlainWriter:
+    """Writes data unchanged, for the 'none' format."""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def write(self, data):
+        self._fileobj.write(data)
+
+    def close(self):
+        pass
+
+class _ParallelBlockWriter:
+    """
+    Compresses fixed-size blocks on a thread pool and writes them in order.
+
+    Each block becomes a complete gzip member or xz stream; decompressors
+    read the concatenation as one file. zlib and lzma release the GIL while
+    compressing, so the blocks really are compressed in parallel. At most
+    two blocks per thread are held in memory.
+    """
+
+    def __init__(self, fileobj, compress, threads):
+        self._fileobj = fileobj
+        self._compress = compress
+        self._threads = threads
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+        self._pending = collections.deque()
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= PARALLEL_BLOCK_SIZE:
+            self._submit(bytes(self._buffer[:PARALLEL_BLOCK_SIZE]))
+            del self._buffer[:PARALLEL_BLOCK_SIZE]
+
+    def _submit(self, block):
+        self._pending.append(self._executor.submit(self._compress, block))
+        while len(self._pending) > 2 * self._threads:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def close(self):
+        try:
+            if self._buffer or not self._pending:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+
+    def abort(self):
+        """Drop the pending blocks after a failed stream."""
+        self._executor.shutdown(cancel_futures=True)
+
+def compression_backend(fmt, threads=1):
+    """
+    Name of the compressor open_compressor() uses, for display.
+
+    Args:
+        fmt: 'gzip', 'zstd', 'xz' or 'none'
+        threads: Number of compression threads
+
+    Returns:
+        str: e.g. 'pigz', 'zstd tool', 'Python thread pool'
+    """
+    if fmt == 'none':
+        return 'none'
+    if fmt == 'zstd':
+        return 'zstandard' if zstandard is not None else 'zstd tool'
+    if threads <= 1:
+        return 'Python'
+    if fmt == 'gzip' and shutil.which('pigz'):
+        return 'pigz'
+    if fmt == 'xz' and shutil.which('xz'):
+        return 'xz tool'
+    return 'Python thread pool'
+
+def open_compressor(fileobj, fmt='gzip', level=None, threads=1):
+    """
+    Wrap a binary file in a streaming compressor.
+
+    With more than one thread gzip uses pigz and xz uses `xz -T` when they
+    are installed, and a thread pool compressing independent blocks
+    otherwise. zstd is multithreaded natively.
+
+    Args:
+        fileobj: Open binary file to write the compressed data to
+        fmt: 'gzip', 'zstd', 'xz' or 'none'
+        level: Compression level, or None for the format's default
+        threads: Number of compression threads
+
+    Returns:
+        Writer with write(data) and close(); close() does not close fileobj
+
+    Raises:
+        ValueError: If the format is unknown or not available
+    """
+    if fmt not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression format: {fmt}")
+    if level is None:
+        level = DEFAULT_LEVELS[fmt]
+    backend = compression_backend(fmt, threads)
+
+    if fmt == 'gzip':
+        if backend == 'pigz':
+            return _ProcessWriter(['pigz', '-c', f"-{level}", '-p', str(threads)], fileobj)
+        if backend == 'Python thread pool':
+            return _ParallelBlockWriter(fileobj, lambda block: gzip.compress(block, level, mtime=0), threads)
+        # mtime=0 keeps the output reproducible
+        return gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=level, mtime=0)
+    if fmt == 'xz':
+        if backend == 'xz tool':
+            return _ProcessWriter(['xz', '-q', '-c', f"-{level}", '-T', str(threads)], fileobj)
+        if backend == 'Python thread pool':
+            return _ParallelBlockWriter(fileobj, lambda block: lzma.compress(block, preset=level), threads)
+        return lzma.LZMAFile(fileobj, mode='wb', preset=level)
+    if fmt == 'zstd':
+        if zstandard is not None:
+            # threads=0 keeps zstandard single-threaded
+            compressor = zstandard.ZstdCompressor(level=level, threads=threads if threads > 1 else 0)
+            return compressor.stream_writer(fileobj, closefd=False)
+        if shutil.which('zstd'):
+            return _ProcessWriter(['zstd', '-q', '-c', f"-{level}", f"-T{threads}"], fileobj)
+        raise ValueError("zstd compression needs the zstandard module or the zstd tool")
+    return _PlainWriter(fileobj)
+
+def _abort_writer(writer):
+    """Release a writer after a failed stream without masking the failure."""
+    try:
+        if hasattr(writer, 'abort'):
+            writer.abort()
+        else:
+            writer.close()
+    except Exception:
+        pass
+
+def format_size(size):
+    """Byte count for display, e.g. "12.3 MB"."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{int(size)} B"
+        size /= 1024
+
+def format_transfer(stats):
+    """One-line summary of stream_to_file() statistics."""
+    rate = stats['bytes_in'] / stats['seconds'] if stats['seconds'] > 0 else 0
+    text = f"{format_size(stats['bytes_in'])} in {stats['seconds']:.1f}s ({format_size(rate)}/s)"
+    if stats['bytes_out'] != stats['bytes_in']:
+        text += f", written {format_size(stats['bytes_out'])}"
+    return text
+
+def stream_to_file(chunks, path, fmt='gzip', level=None, progress=None, threads=1):
+    """
+    Compress a stream of byte chunks into a file in one pass.
+
+    Nothing is staged on disk: each chunk is compressed as it arrives. If
+    the stream fails the compressor is stopped, the partial file is removed
+    and the stream's error is raised.
+
+    Args:
+        chunks: Iterable of bytes (e.g. a Docker export or archive stream)
+        path: Output file path, including the format's suffix
+        fmt: 'gzip', 'zstd', 'xz' or 'none'
+        level: Compression level, or None for the format's default
+        progress: Optional callable receiving the statistics so far, called
+            at most every PROGRESS_INTERVAL seconds
+        threads: Number of compression threads
+
+    Returns:
+        dict: bytes_in, bytes_out and seconds
+    """
+    started = time.monotonic()
+    last_report = started
+    bytes_in = 0
+
+    try:
+        with open(path, 'wb') as f:
+            writer = open_compressor(f, fmt, level, threads)
+            try:
+                for chunk in chunks:
+                    writer.write(chunk)
+                    bytes_in += len(chunk)
+                    if progress is not None and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                        last_report = time.monotonic()
+                        progress({'bytes_in': bytes_in, 'bytes_out': f.tell(), 'seconds': last_report - started})
+            except BaseException:
+                # The stream's own error is the one to report
+                _abort_writer(writer)
+                raise
+            writer.close()
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    return {'bytes_in': bytes_in, 'bytes_out': os.path.getsize(path), 'seconds': time.monotonic() - started}
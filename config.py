@@ -4,7 +4,7 @@ Handles remote Docker host configurations
 """
 
 import os
-import yaml
+import yaml_io
 import logging
 
 CONFIG_FILE = os.path.expanduser('~/.config/docker_helper/config.yml')
@@ -27,7 +27,7 @@ def load_config():
 
     try:
         with open(CONFIG_FILE, 'r') as f:
-            config = yaml.safe_load(f) or {}
+            config = yaml_io.safe_load(f) or {}
             logging.info(f"Loaded configuration from {CONFIG_FILE}")
             return config
     except Exception as e:
@@ -44,7 +44,7 @@ def save_config(config):
     ensure_config_dir()
     try:
         with open(CONFIG_FILE, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+            yaml_io.dump(config, f, default_flow_style=False)
         logging.info(f"Saved configuration to {CONFIG_FILE}")
     except Exception as e:
         logging.error(f"Error saving config file: {e}")
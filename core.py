@@ -1,15 +1,30 @@
 import os
+import copy
+import json
+import functools
 import yaml
 import docker
+import yaml_io
+import compression
 import logging
 import random
+import heapq
+import queue
+import threading
+import time
+import datetime
+import re
+import shlex
+import socket
+import sys
+import concurrent.futures
 
 # Set up logging
 logging.basicConfig(filename='docker_helper.log', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def get_client(docker_host=None):
+def _connect_client(docker_host=None, timeout=None):
     """
-    Get a Docker client, either local or remote via SSH.
+    Create and verify a new Docker client, either local or remote via SSH.
 
     Args:
         docker_host: Optional Docker host connection string. Supports:
@@ -18,6 +33,8 @@ def get_client(docker_host=None):
             - "ssh://user@host:port": Connect via SSH with custom port
             - "unix:///var/run/docker.sock": Local socket (explicit)
             - "tcp://host:port": TCP connection
+        timeout: Optional seconds to wait while connecting and verifying;
+            later API calls use docker-py's default timeout
 
     Returns:
         Docker client instance
@@ -25,11 +42,12 @@ def get_client(docker_host=None):
     Raises:
         ConnectionError: If connection fails
     """
+    client_timeout = timeout or docker.constants.DEFAULT_TIMEOUT_SECONDS
     try:
         if docker_host:
             # Connect to remote or specific host
             logging.info(f"Connecting to Docker host: {docker_host}")
-            client = docker.DockerClient(base_url=docker_host)
+            client = docker.DockerClient(base_url=docker_host, timeout=client_timeout)
             # Test connection
             client.ping()
             logging.info(f"Successfully connected to Docker host: {docker_host}")
@@ -39,13 +57,15 @@ def get_client(docker_host=None):
             logging.info(f"Connected to Docker daemon. Server name: {info.get('Name', 'Unknown')}")
         else:
             # Connect to local Docker daemon
-            client = docker.from_env()
+            client = docker.from_env(timeout=client_timeout)
             logging.info("Connected to local Docker daemon")
 
             # Verify connection
             info = client.info()
             logging.info(f"Connected to local Docker daemon. Server name: {info.get('Name', 'Unknown')}")
 
+        # The client is cached and shared, so later calls get the default timeout
+        client.api.timeout = docker.constants.DEFAULT_TIMEOUT_SECONDS
         return client
     except docker.errors.DockerException as e:
         logging.error(f"Error connecting to Docker: {e}")
@@ -54,9 +74,171 @@ def get_client(docker_host=None):
         else:
             raise ConnectionError("Error connecting to Docker. Please make sure Docker is running.")
 
+# Seconds a cached client is trusted before it is pinged again
+CLIENT_HEALTH_TTL = 30
+
+# Seconds an unused cached client is kept open
+CLIENT_IDLE_TIMEOUT = 600
+
+class ClientRegistry:
+    """
+    Cache of live Docker clients, keyed by docker_host (None for local).
+
+    Reusing a client keeps its connection pool, including an open SSH
+    transport for ssh:// hosts, so switching back to a host is instant.
+    Clients are pinged again only after CLIENT_HEALTH_TTL seconds and are
+    closed once unused for CLIENT_IDLE_TIMEOUT seconds.
+
+    A caller that keeps using a client over a long time (like the GUI's
+    active host, whose worker threads hold on to it) pins it. Pinned clients
+    are never evicted as idle, and a pinned client that is replaced after a
+    failed health check is only closed once it is unpinned.
+    """
+
+    def __init__(self, connect=_connect_client, health_ttl=CLIENT_HEALTH_TTL, idle_timeout=CLIENT_IDLE_TIMEOUT):
+        self._connect = connect
+        self.health_ttl = health_ttl
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._entries = {}
+        # id(client) -> pin count, and pinned clients waiting to be closed
+        self._pins = {}
+        self._retired = {}
+
+    def get(self, docker_host=None, timeout=None):
+        """
+        Get a cached client for docker_host, connecting if needed.
+
+        May ping or connect, so call it off the GUI main loop. timeout
+        bounds a new connection, see _connect_client().
+
+        Raises:
+            ConnectionError: If connection fails
+        """
+        self.evict_idle()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(docker_host)
+
+        if entry is not None:
+            if now - entry['checked'] <= self.health_ttl:
+                entry['used'] = now
+                return entry['client']
+            try:
+                entry['client'].ping()
+                entry['checked'] = entry['used'] = now
+                return entry['client']
+            except Exception as e:
+                logging.warning(f"Cached Docker client for {docker_host or 'local'} failed health check: {e}")
+                self.discard(docker_host)
+
+        client = self._connect(docker_host, timeout=timeout) if timeout else self._connect(docker_host)
+        with self._lock:
+            existing = self._entries.get(docker_host)
+            if existing is not None:
+                # Another thread connected first, keep its client
+                _close_client(client)
+                existing['used'] = now
+                return existing['client']
+            self._entries[docker_host] = {'client': client, 'checked': now, 'used': now}
+        return client
+
+    def pin(self, client):
+        """Keep client open while it is in use, see unpin()"""
+        with self._lock:
+            self._pins[id(client)] = self._pins.get(id(client), 0) + 1
+
+    def unpin(self, client):
+        """Release a pin; a client replaced in the meantime is closed once no pins remain"""
+        with self._lock:
+            count = self._pins.get(id(client), 0) - 1
+            if count > 0:
+                self._pins[id(client)] = count
+                return
+            self._pins.pop(id(client), None)
+            retired = self._retired.pop(id(client), None)
+            for entry in self._entries.values():
+                if entry['client'] is client:
+                    # Restart the idle timer from the moment it was let go
+                    entry['used'] = time.monotonic()
+        if retired is not None:
+            _close_client(retired)
+
+    def is_cached(self, docker_host=None):
+        with self._lock:
+            return docker_host in self._entries
+
+    def discard(self, docker_host=None):
+        """Forget the client for docker_host, closing it unless it is pinned"""
+        with self._lock:
+            entry = self._entries.pop(docker_host, None)
+            if entry is not None and id(entry['client']) in self._pins:
+                self._retired[id(entry['client'])] = entry['client']
+                return
+        if entry is not None:
+            _close_client(entry['client'])
+
+    def evict_idle(self):
+        """Close unpinned clients that have not been used for idle_timeout seconds"""
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                host for host, entry in self._entries.items()
+                if now - entry['used'] > self.idle_timeout and id(entry['client']) not in self._pins
+            ]
+            entries = [self._entries.pop(host) for host in idle]
+        for host, entry in zip(idle, entries):
+            logging.info(f"Closing idle Docker client for {host or 'local'}")
+            _close_client(entry['client'])
+
+    def close_all(self):
+        with self._lock:
+            clients = [entry['client'] for entry in self._entries.values()] + list(self._retired.values())
+            self._entries.clear()
+            self._retired.clear()
+            self._pins.clear()
+        for client in clients:
+            _close_client(client)
+
+def _close_client(client):
+    try:
+        client.close()
+    except Exception:
+        pass
+
+_client_registry = ClientRegistry()
+
+def get_client(docker_host=None, timeout=None):
+    """
+    Get a Docker client, either local or remote via SSH.
+
+    Clients are cached per docker_host, see ClientRegistry.
+
+    Args:
+        docker_host: Optional Docker host connection string. Supports:
+            - None: Connect to local Docker daemon (default)
+            - "ssh://user@host": Connect via SSH (uses SSH keys)
+            - "ssh://user@host:port": Connect via SSH with custom port
+            - "unix:///var/run/docker.sock": Local socket (explicit)
+            - "tcp://host:port": TCP connection
+        timeout: Optional seconds to wait for a new connection
+
+    Returns:
+        Docker client instance
+
+    Raises:
+        ConnectionError: If connection fails
+    """
+    return _client_registry.get(docker_host, timeout)
+
+def get_client_registry():
+    """Get the process-wide Docker client registry."""
+    return _client_registry
+
 def handle_configure(token, domain):
     with open('duckdns.yml', 'w') as f:
-        yaml.dump({'duckdns': {'token': token, 'domain': domain}}, f)
+        yaml_io.dump({'duckdns': {'token': token, 'domain': domain}}, f)
     return "DuckDNS settings updated."
 
 # Determine the services directory path
@@ -91,10 +273,205 @@ def get_services_directory():
 
     raise FileNotFoundError("Services directory not found. Please ensure docker-helper is installed correctly.")
 
+# Compiled catalog index location and format version
+CATALOG_INDEX_FILE = os.path.expanduser('~/.cache/docker_helper/services_index.json')
+CATALOG_INDEX_VERSION = 3
+
+# Fields kept in the lightweight catalog summary records
+SERVICE_SUMMARY_FIELDS = ('name', 'description', 'image')
+
+# Number of fully parsed service definitions kept in memory
+SERVICE_DEFINITION_CACHE_SIZE = 32
+
+def _scan_service_files(services_dir):
+    """
+    Stat every service definition file in the services directory.
+
+    Args:
+        services_dir: Path to the services directory
+
+    Returns:
+        dict: Mapping of filename to (mtime_ns, size)
+    """
+    stats = {}
+    with os.scandir(services_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.yml') and entry.is_file():
+                st = entry.stat()
+                stats[entry.name] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+@functools.lru_cache(maxsize=SERVICE_DEFINITION_CACHE_SIZE)
+def _parse_service_definition(service_file, mtime_ns, size):
+    """
+    Parse a service definition file.
+
+    The file's mtime and size are part of the cache key, so an edited file
+    is re-parsed on its next use instead of being served stale.
+    """
+    with open(service_file, 'r') as f:
+        return yaml_io.safe_load(f)
+
+def _summarize_service(service):
+    """Reduce a full service definition to its summary record, leaving out missing fields."""
+    return {field: service[field] for field in SERVICE_SUMMARY_FIELDS if field in service}
+
+def _write_service_index(services_dir, entries, skipped=None):
+    """
+    Write the compiled catalog index, keyed by service name.
+
+    Files that could not be indexed are recorded under 'skipped', keyed by
+    file name, so they are not re-parsed until they change. The write goes
+    to a temporary file first so a concurrent reader never sees a
+    half-written index.
+    """
+    index = {
+        'version': CATALOG_INDEX_VERSION,
+        'services_dir': os.path.abspath(services_dir),
+        'services': entries,
+        'skipped': skipped or {}
+    }
+
+    try:
+        os.makedirs(os.path.dirname(CATALOG_INDEX_FILE), exist_ok=True)
+        tmp_file = f"{CATALOG_INDEX_FILE}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(tmp_file, CATALOG_INDEX_FILE)
+        logging.info(f"Wrote service catalog index with {len(entries)} services to {CATALOG_INDEX_FILE}")
+    except (OSError, TypeError, ValueError) as e:
+        logging.warning(f"Could not write service catalog index: {e}")
+
+def _read_service_index(services_dir):
+    """
+    Read the compiled catalog index entries.
+
+    Returns:
+        tuple: (entries keyed by service name, skipped files keyed by file
+            name), both empty if the index is missing, unreadable or was
+            built for another directory
+    """
+    try:
+        with open(CATALOG_INDEX_FILE, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}, {}
+
+    if index.get('version') != CATALOG_INDEX_VERSION:
+        return {}, {}
+    if index.get('services_dir') != os.path.abspath(services_dir):
+        return {}, {}
+
+    return index.get('services', {}), index.get('skipped', {})
+
+def _load_catalog(services_dir, force_rebuild=False):
+    """
+    Load the catalog index entries, refreshing any stale ones.
+
+    Entries whose file still has the recorded mtime and size are used as-is.
+    Only new or changed files are parsed, and the index is rewritten if
+    anything changed. Files that fail to parse, lack a name or duplicate
+    another file's service name are recorded as skipped with their mtime
+    and size, so they are not parsed again on every lookup.
+
+    Returns:
+        dict: Index entries keyed by service name
+    """
+    stats = _scan_service_files(services_dir)
+    entries, skipped = ({}, {}) if force_rebuild else _read_service_index(services_dir)
+
+    # Unchanged files keep their entries
+    catalog = {}
+    for name, entry in entries.items():
+        if stats.get(entry.get('file')) == (entry.get('mtime_ns'), entry.get('size')):
+            catalog[name] = entry
+
+    # Unchanged skipped files stay skipped, unless the file they duplicated is gone
+    still_skipped = {}
+    for filename, entry in skipped.items():
+        if stats.get(filename) != (entry.get('mtime_ns'), entry.get('size')):
+            continue
+        if entry.get('duplicate_of') and entry['duplicate_of'] not in catalog:
+            continue
+        still_skipped[filename] = entry
+
+    indexed_files = {entry['file'] for entry in catalog.values()} | set(still_skipped)
+    changed = len(catalog) != len(entries) or len(still_skipped) != len(skipped)
+
+    for filename in sorted(stats):
+        if filename in indexed_files:
+            continue
+
+        # Stale or new file: fall back to parsing it
+        changed = True
+        mtime_ns, size = stats[filename]
+        skip = {'mtime_ns': mtime_ns, 'size': size}
+        try:
+            service = _parse_service_definition(os.path.join(services_dir, filename), mtime_ns, size)
+        except yaml.YAMLError as e:
+            logging.error(f"Error parsing service definition file {filename}: {e}")
+            still_skipped[filename] = dict(skip, error=f"YAML error: {e}")
+            continue
+        if not isinstance(service, dict) or 'name' not in service:
+            still_skipped[filename] = dict(skip, error="No service name")
+            continue
+        if service['name'] in catalog:
+            logging.warning(f"Service {service['name']} in {filename} is already defined in {catalog[service['name']]['file']}")
+            still_skipped[filename] = dict(skip, error="Duplicate service name", duplicate_of=service['name'])
+            continue
+
+        catalog[service['name']] = {
+            'file': filename,
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'summary': _summarize_service(service)
+        }
+
+    if changed:
+        logging.info("Service catalog index missing or stale, refreshed changed service files")
+        _write_service_index(services_dir, catalog, still_skipped)
+
+    return catalog
+
+def rebuild_service_index():
+    """
+    Re-parse every service definition and rewrite the catalog index.
+
+    Returns:
+        int: Number of services written to the index
+
+    Raises:
+        FileNotFoundError: If services directory cannot be found
+    """
+    services_dir = get_services_directory()
+    return len(_load_catalog(services_dir, force_rebuild=True))
+
+def get_service_summaries():
+    """
+    Get lightweight summary records for all available services.
+
+    Each record only holds the name, description and image, read from the
+    compiled catalog index. Use load_service_config() to get the full
+    definition of a single service.
+
+    Returns:
+        list: List of summary dictionaries
+    """
+    try:
+        services_dir = get_services_directory()
+    except FileNotFoundError:
+        logging.warning("Services directory not found")
+        return []
+
+    return [dict(entry['summary']) for entry in _load_catalog(services_dir).values()]
+
 def load_service_config(service_name):
     """
     Load a service configuration from a YAML file.
 
+    Parsed definitions are kept in a small LRU cache, so repeated loads of
+    the same unchanged file do not re-parse it.
+
     Args:
         service_name: Name of the service (without .yml extension)
 
@@ -109,41 +486,209 @@ def load_service_config(service_name):
     service_file = os.path.join(services_dir, f"{service_name}.yml")
 
     if not os.path.exists(service_file):
-        raise FileNotFoundError(f"Service configuration not found: {service_name}")
+        # The file name may differ from the service name, look it up in the catalog
+        entry = _load_catalog(services_dir).get(service_name)
+        if not entry:
+            raise FileNotFoundError(f"Service configuration not found: {service_name}")
+        service_file = os.path.join(services_dir, entry['file'])
 
-    with open(service_file, 'r') as f:
-        service_config = yaml.safe_load(f)
+    st = os.stat(service_file)
+    service_config = _parse_service_definition(service_file, st.st_mtime_ns, st.st_size)
 
     logging.info(f"Loaded service configuration: {service_name}")
-    return service_config
+    # Hand out a copy so callers cannot modify the cached definition
+    return copy.deepcopy(service_config)
 
 def get_available_services():
     """
-    Get a list of all available service configurations.
+    Get a list of all available services.
+
+    Served from the compiled catalog index like get_service_summaries(), so
+    listing the catalog does not parse every definition file. Use
+    load_service_config() for a service's full definition.
 
     Returns:
-        list: List of service configuration dictionaries
+        list: List of summary dictionaries (name, description, image)
     """
-    services = []
-    try:
-        services_dir = get_services_directory()
-    except FileNotFoundError:
-        logging.warning("Services directory not found")
-        return services
-
-    for filename in os.listdir(services_dir):
-        if filename.endswith('.yml'):
-            try:
-                with open(os.path.join(services_dir, filename), 'r') as f:
-                    services.append(yaml.safe_load(f))
-            except yaml.YAMLError as e:
-                logging.error(f"Error parsing service definition file {filename}: {e}")
-    return services
+    return get_service_summaries()
 
 def get_installed_services(client):
     return [container.name for container in client.containers.list(all=True)]
 
-def install_service(client, service_config, config_values):
+# Image pulls running at the same time during batch installs
+IMAGE_PULL_PARALLEL = 4
+
+def normalize_image_reference(image):
+    """
+    Normalize an image reference so equivalent spellings compare equal.
+
+    "nginx" and "nginx:latest" refer to the same image; references with a
+    digest are left untouched.
+    """
+    name = image.rsplit('/', 1)[-1]
+    if '@' in image or ':' in name:
+        return image
+    return f"{image}:latest"
+
+# Minimum seconds between two progress callbacks of one pull
+PULL_PROGRESS_INTERVAL = 1.0
+
+class PullProgress:
+    """
+    Aggregated progress of one streaming image pull.
+
+    The daemon reports progress per layer; this sums the download bytes of
+    every layer seen so far into an overall rate and ETA. Layer sizes are
+    only known once a layer starts downloading, so the ETA firms up as the
+    pull goes on.
+    """
+
+    def __init__(self, image):
+        self.image = image
+        self.layers = {}
+        self.status = 'Waiting'
+        self.started = time.monotonic()
+        self.finished = None
+
+    def update(self, event):
+        """Apply one decoded event from the pull stream."""
+        layer = event.get('id')
+        status = event.get('status', '')
+        detail = event.get('progressDetail') or {}
+
+        if layer and status == 'Downloading' and detail.get('total'):
+            self.layers[layer] = [detail.get('current', 0), detail['total']]
+        elif layer in self.layers and status in ('Download complete', 'Verifying Checksum', 'Pull complete'):
+            self.layers[layer][0] = self.layers[layer][1]
+
+        if status:
+            self.status = status
+
+    def finish(self):
+        self.finished = time.monotonic()
+        self.status = 'Done'
+
+    @property
+    def downloaded(self):
+        return sum(current for current, _ in self.layers.values())
+
+    @property
+    def total(self):
+        return sum(total for _, total in self.layers.values())
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def rate(self):
+        """Download rate in bytes per second."""
+        return self.downloaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """Estimated seconds left, or None while the rate is unknown."""
+        if self.rate <= 0:
+            return None
+        return (self.total - self.downloaded) / self.rate
+
+    def format(self):
+        """One-line summary, e.g. "nginx:latest: 45% of 62.3 MB at 8.1 MB/s, ETA 0:04"."""
+        mb = 1024 * 1024
+        if self.finished is not None:
+            return f"{self.image}: pulled {self.downloaded / mb:.1f} MB in {self.elapsed:.1f}s ({self.rate / mb:.1f} MB/s)"
+        if not self.total:
+            return f"{self.image}: {self.status}"
+
+        percent = 100 * self.downloaded / self.total
+        text = f"{self.image}: {percent:.0f}% of {self.total / mb:.1f} MB at {self.rate / mb:.1f} MB/s"
+        if self.eta is not None:
+            minutes, seconds = divmod(int(self.eta), 60)
+            text += f", ETA {minutes}:{seconds:02d}"
+        return text
+
+def pull_image(client, image, progress=None):
+    """
+    Pull an image from its registry, streaming the daemon's progress.
+
+    Args:
+        client: Docker client instance
+        image: Image reference (repository[:tag] or repository@digest)
+        progress: Optional callable receiving a PullProgress, called at most
+            every PULL_PROGRESS_INTERVAL seconds and once when done
+
+    Returns:
+        docker.models.images.Image: The pulled image
+
+    Raises:
+        docker.errors.APIError: If the daemon reports an error during the pull
+    """
+    reference = normalize_image_reference(image)
+    logging.info(f"Pulling image: {reference}")
+
+    state = PullProgress(reference)
+    last_report = 0.0
+    for event in client.api.pull(reference, stream=True, decode=True):
+        if 'error' in event:
+            raise docker.errors.APIError(f"Failed to pull {reference}: {event['error']}")
+        state.update(event)
+        if progress is not None and time.monotonic() - last_report >= PULL_PROGRESS_INTERVAL:
+            last_report = time.monotonic()
+            progress(state)
+
+    state.finish()
+    if progress is not None:
+        progress(state)
+
+    # Logged per registry, to see which registries are slow
+    registry = docker.auth.resolve_repository_name(docker.utils.parse_repository_tag(reference)[0])[0]
+    logging.info(f"{state.format()} from {registry}")
+
+    return client.images.get(reference)
+
+class ImagePuller:
+    """
+    Pulls images concurrently, each distinct reference only once.
+
+    Pulls start as soon as they are scheduled, so a batch can queue every
+    image up front and each install only waits for its own image.
+    """
+
+    def __init__(self, client, parallel=IMAGE_PULL_PARALLEL, progress=None):
+        self.client = client
+        self.progress = progress
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, parallel))
+        self._pulls = {}
+        self._lock = threading.Lock()
+
+    def pull(self, image):
+        """
+        Schedule a pull unless the same image is already scheduled.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the pulled image
+        """
+        key = normalize_image_reference(image)
+        with self._lock:
+            if key not in self._pulls:
+                self._pulls[key] = self._pool.submit(pull_image, self.client, key, self.progress)
+            return self._pulls[key]
+
+    def wait(self, image):
+        """Wait for an image's pull and return it, raising its error if it failed."""
+        return self.pull(image).result()
+
+    def close(self):
+        """Wait for the scheduled pulls and stop the worker threads."""
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def install_service(client, service_config, config_values, puller=None, progress=None):
     """
     Install (create and start) a Docker container from a service configuration.
 
@@ -151,6 +696,8 @@ def install_service(client, service_config, config_values):
         client: Docker client instance
         service_config: Service definition dictionary from YAML
         config_values: User-provided configuration values
+        puller: Optional ImagePuller that already pulls the image for a batch
+        progress: Optional callable receiving the PullProgress of the image pull
 
     Returns:
         str: Success message with container ID
@@ -224,10 +771,12 @@ def install_service(client, service_config, config_values):
                 ports[port_key] = host_port
                 logging.info(f"Port mapping: {host_port} -> {container_port}/{protocol}")
 
-        # Pull image if not present
-        logging.info(f"Pulling image: {image}")
+        # Pull image if not present (or wait for the batch's pre-pull)
         try:
-            client.images.pull(image)
+            if puller is not None:
+                puller.wait(image)
+            else:
+                pull_image(client, image, progress)
         except docker.errors.ImageNotFound:
             raise ValueError(f"Image not found: {image}")
         except Exception as e:
@@ -264,6 +813,50 @@ def install_service(client, service_config, config_values):
         logging.error(f"Error installing service '{service_config.get('name')}': {e}")
         raise
 
+def install_services(client, installs, parallel=1, pull_parallel=IMAGE_PULL_PARALLEL, progress=None):
+    """
+    Install several services, pulling their images concurrently first.
+
+    Every distinct image in the batch is pulled up front with at most
+    pull_parallel pulls at once. Each service is installed as soon as its own
+    image is ready, with at most parallel installs at once, so a slow pull
+    does not hold back services whose images are already there.
+
+    Args:
+        client: Docker client instance
+        installs: Dictionary mapping service names to (service_config, config_values)
+        parallel: Maximum number of containers created at the same time
+        pull_parallel: Maximum number of images pulled at the same time
+        progress: Optional callable receiving the PullProgress of each pull
+
+    Yields:
+        tuple: (service_name, result, error) as each service finishes
+    """
+    results = queue.Queue()
+
+    # The puller is closed first: its finished pulls submit installs to the pool,
+    # which must still accept them if the caller stops iterating early
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, parallel)) as pool, \
+            ImagePuller(client, pull_parallel, progress) as puller:
+
+        def install(service_name):
+            service_config, config_values = installs[service_name]
+            try:
+                results.put((service_name, install_service(client, service_config, config_values, puller), None))
+            except Exception as e:
+                results.put((service_name, None, e))
+
+        for service_name, (service_config, _) in installs.items():
+            image = service_config.get('image')
+            if not image:
+                # install_service reports the missing image
+                pool.submit(install, service_name)
+                continue
+            puller.pull(image).add_done_callback(lambda _, name=service_name: pool.submit(install, name))
+
+        for _ in range(len(installs)):
+            yield results.get()
+
 def uninstall_service(client, service_name):
     """
     Uninstall (stop and remove) a Docker container.
@@ -422,6 +1015,141 @@ def restart_service(client, service_name):
         logging.error(error_msg)
         raise docker.errors.APIError(error_msg)
 
+def run_batch(operation, items, parallel=1):
+    """
+    Run an operation for several items, optionally in parallel.
+
+    Results are yielded in completion order, so callers can report each one
+    as soon as it finishes. Errors are returned per item rather than raised,
+    so one failure does not stop the rest of the batch.
+
+    Args:
+        operation: Callable taking one item
+        items: Items to run the operation for (e.g. service names)
+        parallel: Maximum number of operations running at the same time
+
+    Yields:
+        tuple: (item, result, error) where error is the raised exception or None
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        futures = {pool.submit(operation, item): item for item in items}
+        for future in concurrent.futures.as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                yield item, None, e
+
+# Containers of one dependency level acted on at the same time
+STACK_LEVEL_PARALLEL = 8
+
+def _container_name(container):
+    """Name of a /containers/json entry, without the leading slash."""
+    names = container.get('Names') or []
+    return names[0].lstrip('/') if names else container['Id'][:12]
+
+def get_stack_containers(client, stack_name):
+    """
+    Get all containers of a compose stack with one list call.
+
+    Returns:
+        list: /containers/json entries labeled with the stack's project name
+    """
+    return client.api.containers(all=True, filters={'label': f'com.docker.compose.project={stack_name}'})
+
+def stack_dependency_levels(containers):
+    """
+    Group a stack's containers into dependency levels.
+
+    Dependencies come from the com.docker.compose.depends_on label, whose
+    entries look like "db:service_healthy:false" (or just "db" from older
+    Compose versions) and name compose services. Every container in a level
+    only depends on containers in earlier levels, so a level can be started
+    in parallel once the previous one is up.
+
+    Args:
+        containers: /containers/json entries of one stack
+
+    Returns:
+        list: Lists of containers, in start order
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    by_service = {}
+    for container in containers:
+        labels = container.get('Labels') or {}
+        service = labels.get('com.docker.compose.service') or _container_name(container)
+        by_service.setdefault(service, []).append(container)
+
+    depends_on = {}
+    for service, service_containers in by_service.items():
+        labels = service_containers[0].get('Labels') or {}
+        entries = labels.get('com.docker.compose.depends_on') or ''
+        # Dependencies outside the stack's current containers cannot be ordered, skip them
+        depends_on[service] = {
+            entry.split(':')[0].strip() for entry in entries.split(',')
+            if entry.split(':')[0].strip() in by_service
+        } - {service}
+
+    levels = []
+    placed = set()
+    while len(placed) < len(by_service):
+        ready = sorted(s for s in by_service if s not in placed and depends_on[s] <= placed)
+        if not ready:
+            cycle = sorted(s for s in by_service if s not in placed)
+            raise ValueError(f"Circular depends_on between services: {', '.join(cycle)}")
+        levels.append([c for s in ready for c in by_service[s]])
+        placed.update(ready)
+    return levels
+
+def stack_lifecycle(client, stack_name, action, parallel=STACK_LEVEL_PARALLEL):
+    """
+    Start, stop or restart a compose stack in dependency order.
+
+    Each dependency level runs in parallel. Start goes from dependencies to
+    dependents, stop goes the other way, and restart stops the whole stack
+    before starting it again. If a container fails to start, the levels
+    after it are skipped, since their dependencies are not up.
+
+    Args:
+        client: Docker client instance
+        stack_name: Compose project name
+        action: 'start', 'stop' or 'restart'
+        parallel: Maximum number of containers acted on at the same time
+
+    Yields:
+        tuple: (container_name, result, error) as each container finishes
+
+    Raises:
+        ValueError: If the action is unknown, the stack has no containers or
+            its dependencies contain a cycle
+    """
+    if action not in ('start', 'stop', 'restart'):
+        raise ValueError(f"Unknown stack action: {action}")
+
+    containers = get_stack_containers(client, stack_name)
+    if not containers:
+        raise ValueError(f"No containers found for stack '{stack_name}'")
+
+    levels = [[_container_name(c) for c in level] for level in stack_dependency_levels(containers)]
+    logging.info(f"Stack '{stack_name}' {action} order: {levels}")
+
+    if action in ('stop', 'restart'):
+        for level in reversed(levels):
+            yield from run_batch(lambda name: stop_service(client, name), level, parallel=parallel)
+
+    if action in ('start', 'restart'):
+        for i, level in enumerate(levels):
+            failed = False
+            for name, result, error in run_batch(lambda name: start_service(client, name), level, parallel=parallel):
+                failed = failed or error is not None
+                yield name, result, error
+            if failed:
+                for skipped in [name for later in levels[i + 1:] for name in later]:
+                    yield skipped, None, RuntimeError("Skipped because a dependency failed to start")
+                break
+
 def get_status(client, services):
     statuses = []
     if not services:
@@ -435,62 +1163,397 @@ def get_status(client, services):
             statuses.append(f"- {service_name}: not installed")
     return "\n".join(statuses)
 
-def get_running_container_details(client):
-    from datetime import datetime, timezone
-    details = []
-    running_containers = client.containers.list(filters={'status': 'running'})
-    for container in running_containers:
-        name = container.name
-        short_id = container.short_id
+# Defaults for querying all saved remote hosts at once
+FLEET_MAX_WORKERS = 8
+FLEET_HOST_TIMEOUT = 15
+
+def get_host_status(docker_host, timeout=FLEET_HOST_TIMEOUT):
+    """
+    Get container states of one Docker host.
 
-        # Get status
-        status = container.status
+    Uses the host's cached client from the client registry, so a host that
+    is also open in the GUI or checked again shares one SSH connection.
+
+    Args:
+        docker_host: Docker host connection string
+        timeout: Seconds to wait when a new connection is needed
+
+    Returns:
+        dict: 'running' and 'total' counts and 'containers' as (name, state) pairs
+
+    Raises:
+        ConnectionError: If the host cannot be reached
+    """
+    containers = get_client(docker_host, timeout).api.containers(all=True)
 
-        # Get image name (strip tag for cleaner display)
-        image = container.image.tags[0] if container.image.tags else container.image.short_id
+    states = []
+    for container in containers:
+        names = container.get('Names') or []
+        name = names[0].lstrip('/') if names else container['Id'][:12]
+        states.append((name, container.get('State', 'unknown')))
 
-        # Calculate uptime
+    return {
+        'running': sum(1 for _, state in states if state == 'running'),
+        'total': len(states),
+        'containers': sorted(states)
+    }
+
+def iter_fleet_status(remote_hosts, max_workers=FLEET_MAX_WORKERS, timeout=FLEET_HOST_TIMEOUT):
+    """
+    Query several Docker hosts concurrently, yielding results as they arrive.
+
+    At most max_workers hosts are queried at the same time. A host that has
+    not answered within timeout seconds of being queued is reported as timed
+    out and no longer waited for, so hung hosts holding every slot never
+    hold back the results of the others. A hung query keeps its slot until
+    it actually returns, so max_workers is never exceeded, and each new
+    connection is bounded by the timeout as well.
+
+    Args:
+        remote_hosts: Mapping of host name to its configuration, as returned
+            by config.list_remote_hosts()
+        max_workers: Maximum number of hosts queried at the same time
+        timeout: Seconds to wait for each host
+
+    Yields:
+        tuple: (name, docker_host, status, error) where exactly one of
+            status (see get_host_status()) and error (str) is set
+    """
+    results = queue.Queue()
+    slots = threading.Semaphore(max_workers)
+
+    def query(name, docker_host):
+        with slots:
+            # Reported as timed out while it waited for a slot
+            if name not in hosts:
+                return
+            try:
+                results.put((name, docker_host, get_host_status(docker_host, timeout=timeout), None))
+            except Exception as e:
+                results.put((name, docker_host, None, str(e)))
+
+    # Daemon threads: a host stuck in its SSH handshake must not keep the process alive
+    hosts = {}
+    queued = time.monotonic()
+    for name, info in remote_hosts.items():
+        hosts[name] = info['docker_host']
+        threading.Thread(target=query, args=(name, info['docker_host']), daemon=True).start()
+
+    while hosts:
         try:
-            start_time_str = container.attrs['State']['StartedAt']
-            start_time = datetime.fromisoformat(start_time_str.split('.')[0] + 'Z').replace(tzinfo=timezone.utc)
-            uptime_delta = datetime.now(timezone.utc) - start_time
-
-            # Format uptime nicely
-            days = uptime_delta.days
-            hours, remainder = divmod(uptime_delta.seconds, 3600)
-            minutes, _ = divmod(remainder, 60)
-
-            if days > 0:
-                uptime = f"{days}d {hours}h"
-            elif hours > 0:
-                uptime = f"{hours}h {minutes}m"
-            else:
-                uptime = f"{minutes}m"
-        except Exception:
-            uptime = "N/A"
-
-        # Get ports
-        ports = container.ports
-        port_mapping = []
-        for container_port, host_ports in ports.items():
-            if host_ports:
-                host_port_num = host_ports[0]['HostPort']
-                container_port_num = container_port.split('/')[0]
-                port_mapping.append(f"{host_port_num}:{container_port_num}")
-
-        networks = container.attrs['NetworkSettings']['Networks']
-        network_names = ", ".join(networks.keys())
-
-        details.append({
-            "id": short_id,
-            "name": name,
-            "status": status,
-            "image": image,
-            "uptime": uptime,
-            "ports": "\n".join(port_mapping) or "N/A",
-            "network": network_names or "N/A"
-        })
-    return details
+            name, docker_host, status, error = results.get(timeout=0.5)
+            if name in hosts:
+                del hosts[name]
+                yield name, docker_host, status, error
+        except queue.Empty:
+            pass
+
+        if time.monotonic() - queued > timeout:
+            for name in list(hosts):
+                yield name, hosts.pop(name), None, f"Timed out after {timeout} seconds"
+
+def _short_image_id(image_id):
+    """Shorten an image ID the same way docker-py's Image.short_id does."""
+    if image_id.startswith('sha256:'):
+        return image_id[:17]
+    return image_id[:10]
+
+def _format_status_uptime(status_text):
+    """
+    Turn the daemon's human readable status ("Up 3 hours (healthy)") into an uptime.
+
+    Returns:
+        str: Uptime such as "3 hours", or "N/A" if the container is not up
+    """
+    if not status_text or not status_text.startswith('Up '):
+        return "N/A"
+    uptime = status_text[3:]
+    # Drop health/paused suffixes
+    if ' (' in uptime:
+        uptime = uptime.split(' (')[0]
+    return uptime
+
+def _image_display_names(images):
+    """Map image IDs to their first tag, or the short ID for untagged images."""
+    image_names = {}
+    for image in images:
+        tags = [t for t in (image.get('RepoTags') or []) if t != '<none>:<none>']
+        image_names[image['Id']] = tags[0] if tags else _short_image_id(image['Id'])
+    return image_names
+
+def _container_row(container, image_names):
+    """Build a display row from a /containers/json entry."""
+    names = container.get('Names') or []
+    name = names[0].lstrip('/') if names else container['Id'][:12]
+
+    image_id = container.get('ImageID', '')
+    image = image_names.get(image_id) or container.get('Image') or _short_image_id(image_id)
+
+    # The daemon lists IPv4 and IPv6 bindings separately, keep one per container port
+    port_mapping = []
+    seen_ports = set()
+    for port in container.get('Ports') or []:
+        if 'PublicPort' not in port:
+            continue
+        key = (port.get('PrivatePort'), port.get('Type'))
+        if key in seen_ports:
+            continue
+        seen_ports.add(key)
+        port_mapping.append(f"{port['PublicPort']}:{port['PrivatePort']}")
+
+    networks = (container.get('NetworkSettings') or {}).get('Networks') or {}
+    network_names = ", ".join(networks.keys())
+
+    return {
+        "id": container['Id'][:12],
+        "name": name,
+        "status": container.get('State', 'unknown'),
+        "image": image,
+        "uptime": _format_status_uptime(container.get('Status', '')),
+        "ports": "\n".join(port_mapping) or "N/A",
+        "network": network_names or "N/A"
+    }
+
+def get_container_snapshot(client, all=False):
+    """
+    Get a table of containers using two API round-trips.
+
+    Lists containers with one /containers/json call and images with one
+    /images/json call, then joins them in memory. Unlike client.containers.list(),
+    this does not inspect each container or fetch each image separately, which
+    matters a lot on ssh:// hosts.
+
+    Args:
+        client: Docker client instance
+        all: Include stopped containers (default: running only)
+
+    Returns:
+        list: Rows with id, name, status, image, uptime, ports and network keys
+    """
+    containers = client.api.containers(all=all)
+    image_names = _image_display_names(client.api.images())
+    return [_container_row(container, image_names) for container in containers]
+
+def build_mount_index(containers):
+    """
+    Build a reverse index from volume name to the containers mounting it.
+
+    Scans every container's mounts once, so checking whether a volume is in
+    use becomes a dictionary lookup instead of a scan over all containers.
+
+    Args:
+        containers: Container dictionaries with 'Id' and 'Mounts' keys, as
+            returned by the /containers/json endpoint or container.attrs
+
+    Returns:
+        dict: Mapping of volume name to a list of container IDs
+    """
+    index = {}
+    for container in containers:
+        for mount in container.get('Mounts') or []:
+            if mount.get('Type') == 'volume' and mount.get('Name'):
+                index.setdefault(mount['Name'], []).append(container['Id'])
+    return index
+
+class InventorySnapshot:
+    """
+    Containers, images, volumes and networks of a Docker host, fetched together.
+
+    All four lists are fetched once, concurrently, with the low-level list
+    endpoints. The raw API dictionaries are kept as-is and indexed so the
+    resource tabs and cleanup dialogs can answer "who uses this?" without
+    further API calls:
+
+        volume_index:  volume name -> IDs of containers mounting it
+        image_index:   image ID -> containers created from it
+        project_index: compose project -> containers in it
+        network_index: network name -> containers attached to it
+    """
+
+    def __init__(self, containers, images, volumes, networks):
+        self.containers = containers
+        self.images = images
+        self.volumes = volumes
+        self.networks = networks
+
+        self.volume_index = build_mount_index(containers)
+        self.image_index = {}
+        self.project_index = {}
+        self.network_index = {}
+
+        for container in containers:
+            image_id = container.get('ImageID')
+            if image_id:
+                self.image_index.setdefault(image_id, []).append(container)
+
+            project = (container.get('Labels') or {}).get('com.docker.compose.project')
+            if project:
+                self.project_index.setdefault(project, []).append(container)
+
+            networks = (container.get('NetworkSettings') or {}).get('Networks') or {}
+            for network_name in networks:
+                self.network_index.setdefault(network_name, []).append(container)
+
+    @classmethod
+    def fetch(cls, client):
+        """
+        Fetch a new snapshot from the Docker host.
+
+        Args:
+            client: Docker client instance
+
+        Returns:
+            InventorySnapshot: The fetched snapshot
+
+        Raises:
+            docker.errors.APIError: If any of the list calls fails
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            containers = pool.submit(client.api.containers, all=True)
+            images = pool.submit(client.api.images)
+            volumes = pool.submit(client.api.volumes)
+            networks = pool.submit(client.api.networks)
+
+            return cls(
+                containers.result(),
+                images.result(),
+                (volumes.result() or {}).get('Volumes') or [],
+                networks.result()
+            )
+
+    def container_rows(self, running_only=True):
+        """
+        Build container display rows, as returned by get_container_snapshot().
+
+        Args:
+            running_only: Only include running containers (default: True)
+
+        Returns:
+            list: Container rows
+        """
+        return [
+            _container_row(container, self.image_names)
+            for container in self.containers
+            if not running_only or container.get('State') == 'running'
+        ]
+
+    @functools.cached_property
+    def image_names(self):
+        """Image ID -> display name, built on first use."""
+        return _image_display_names(self.images)
+
+    def container_row(self, container):
+        """Build the display row of one /containers/json entry."""
+        return _container_row(container, self.image_names)
+
+    def apply_update(self, update):
+        """
+        Return a new snapshot with one event update applied.
+
+        Args:
+            update: (kind, key, item) tuple from fetch_event_update(); item
+                None means the resource is gone
+
+        Returns:
+            InventorySnapshot: The updated snapshot
+        """
+        kind, key, item = update
+        containers, images, volumes, networks = self.containers, self.images, self.volumes, self.networks
+
+        if kind == 'container':
+            containers = _replace_item(containers, 'Id', key, item)
+        elif kind == 'images':
+            images = item
+        elif kind == 'volume':
+            volumes = _replace_item(volumes, 'Name', key, item)
+        elif kind == 'network':
+            networks = _replace_item(networks, 'Id', key, item)
+
+        return InventorySnapshot(containers, images, volumes, networks)
+
+    def volume_in_use(self, volume_name):
+        return volume_name in self.volume_index
+
+    def image_in_use(self, image_id):
+        return image_id in self.image_index
+
+    def network_in_use(self, network_name):
+        return network_name in self.network_index
+
+def _replace_item(items, key_field, key, item):
+    """Replace (or add, or with item None remove) the entry whose key_field equals key."""
+    result = [i for i in items if i.get(key_field) != key]
+    if item is not None:
+        result.append(item)
+    return result
+
+# Container event actions that do not change the container's listing
+IGNORED_CONTAINER_ACTIONS = ('exec_', 'attach', 'detach', 'resize', 'top', 'archive-path', 'extract-to-dir', 'copy', 'export', 'commit')
+
+def fetch_event_update(client, event):
+    """
+    Fetch the resource a Docker event refers to.
+
+    Only the affected resource is listed again (one filtered list call), so
+    following the event stream costs work proportional to what changed.
+
+    Args:
+        client: Docker client instance
+        event: Decoded event from client.events(decode=True)
+
+    Returns:
+        tuple or None: (kind, key, item) for InventorySnapshot.apply_update(),
+            or None if the event does not affect the inventory
+    """
+    event_type = event.get('Type')
+    action = event.get('Action') or ''
+    actor = event.get('Actor') or {}
+    actor_id = actor.get('ID')
+
+    if event_type == 'container':
+        if action.startswith(IGNORED_CONTAINER_ACTIONS):
+            return None
+        found = client.api.containers(all=True, filters={'id': actor_id})
+        return ('container', actor_id, found[0] if found else None)
+
+    if event_type == 'image':
+        # The image list cannot be filtered by ID, and tags move between images
+        return ('images', None, client.api.images())
+
+    if event_type == 'volume':
+        if action not in ('create', 'destroy'):
+            return None
+        # The name filter matches substrings, pick the exact volume
+        found = (client.api.volumes(filters={'name': actor_id}) or {}).get('Volumes') or []
+        found = [v for v in found if v.get('Name') == actor_id]
+        return ('volume', actor_id, found[0] if found else None)
+
+    if event_type == 'network':
+        if action in ('connect', 'disconnect'):
+            # Attachments are recorded on the container
+            container_id = (actor.get('Attributes') or {}).get('container')
+            if not container_id:
+                return None
+            found = client.api.containers(all=True, filters={'id': container_id})
+            return ('container', container_id, found[0] if found else None)
+        if action not in ('create', 'destroy', 'remove'):
+            return None
+        found = client.api.networks(ids=[actor_id])
+        return ('network', actor_id, found[0] if found else None)
+
+    return None
+
+def get_running_container_details(client):
+    """
+    Get display rows for all running containers.
+
+    Args:
+        client: Docker client instance
+
+    Returns:
+        list: Rows as returned by get_container_snapshot()
+    """
+    return get_container_snapshot(client)
 
 def get_full_container_details(client, container_id):
     try:
@@ -546,15 +1609,1191 @@ def get_full_container_details(client, container_id):
     return report
 
 
-def update_service(client, service_name):
+class _ChunkReader:
+    """Read-only file object over an iterator of byte chunks, for streaming tarfile mode."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+# Seconds to wait for a directory listing inside a container
+LIST_DIRECTORY_TIMEOUT = 10
+
+def list_container_directory(client, container_id, path, timeout=LIST_DIRECTORY_TIMEOUT):
+    """
+    List a directory inside a container.
+
+    Runs ls through the Docker API, so on ssh:// hosts it goes over the
+    cached client's connection instead of a new `docker -H` process with
+    its own SSH handshake.
+
+    Args:
+        client: Docker client instance
+        container_id: ID or name of the container
+        path: Directory path inside the container
+        timeout: Seconds to wait before giving up on a hung container
+
+    Returns:
+        list: Entries as printed by `ls -1Ap` (directories end with '/')
+
+    Raises:
+        OSError: If the path cannot be listed or the listing timed out
+    """
+    def run_ls():
+        exec_id = client.api.exec_create(container_id, ['ls', '-1Ap', path], stdout=True, stderr=True)['Id']
+        stdout, stderr = client.api.exec_start(exec_id, demux=True)
+        return stdout, stderr, client.api.exec_inspect(exec_id).get('ExitCode')
+
+    # exec_start has no timeout of its own; a daemon thread is left behind if it hangs
+    results = queue.Queue()
+
+    def worker():
+        try:
+            results.put((run_ls(), None))
+        except Exception as e:
+            results.put((None, e))
+
+    threading.Thread(target=worker, daemon=True).start()
+    try:
+        result, error = results.get(timeout=timeout)
+    except queue.Empty:
+        raise OSError(f"Timed out listing {path} after {timeout} seconds")
+    if error is not None:
+        raise error
+    stdout, stderr, exit_code = result
+
+    if exit_code != 0:
+        error = (stderr or b'').decode('utf-8', errors='replace')
+        raise OSError(f"Cannot access path: {path}\n{error}")
+
+    return (stdout or b'').decode('utf-8', errors='replace').strip().split('\n')
+
+def copy_from_container(client, container_id, container_path, host_path):
+    """
+    Copy a file or directory out of a container, like `docker cp`.
+
+    The archive is streamed from the API and extracted as it arrives, over
+    the cached client's connection.
+
+    Args:
+        client: Docker client instance
+        container_id: ID or name of the container
+        container_path: File or directory path inside the container
+        host_path: Existing local directory to copy into
+
+    Returns:
+        str: Local path of the copied file or directory
+
+    Raises:
+        docker.errors.NotFound: If the container or path does not exist
+    """
+    import tarfile
+
+    stream, _ = client.api.get_archive(container_id, container_path)
+    with tarfile.open(fileobj=_ChunkReader(stream), mode='r|') as tar:
+        if hasattr(tarfile, 'tar_filter'):
+            # Refuse absolute paths and entries escaping host_path
+            tar.extractall(host_path, filter='tar')
+        else:
+            tar.extractall(host_path)
+
+    return os.path.join(host_path, os.path.basename(container_path.rstrip('/')))
+
+def export_container(client, container_id, path, fmt='gzip', level=None, progress=None, threads=1):
+    """
+    Export a container's filesystem into a compressed tar file.
+
+    The export stream is compressed as it arrives, so no uncompressed copy
+    is written to disk.
+
+    Args:
+        client: Docker client instance
+        container_id: ID or name of the container
+        path: Output file path
+        fmt: Compression format, see compression.COMPRESSION_SUFFIXES
+        level: Compression level, or None for the format's default
+        progress: Optional callable receiving transfer statistics
+        threads: Number of compression threads
+
+    Returns:
+        dict: bytes_in, bytes_out and seconds
+    """
+    stream = client.api.export(container_id)
+    try:
+        stats = compression.stream_to_file(stream, path, fmt, level, progress, threads)
+    finally:
+        stream.close()
+    logging.info(f"Exported container {container_id} to {path}: {compression.format_transfer(stats)}")
+    return stats
+
+def backup_mount(client, container_id, destination, path, fmt='gzip', level=None, progress=None, threads=1):
+    """
+    Back up a container mount (volume or bind) into a compressed tar file.
+
+    The daemon tars the mount on the Docker host and the archive is streamed
+    back over the API, so this works on ssh:// hosts and never reads the
+    mount's source path on the local machine. Like `docker cp`, the archive
+    holds the mount directory under its basename.
+
+    Args:
+        client: Docker client instance
+        container_id: ID or name of the container
+        destination: Mount point inside the container
+        path: Output file path
+        fmt: Compression format, see compression.COMPRESSION_SUFFIXES
+        level: Compression level, or None for the format's default
+        progress: Optional callable receiving transfer statistics
+        threads: Number of compression threads
+
+    Returns:
+        dict: bytes_in, bytes_out and seconds
+
+    Raises:
+        docker.errors.NotFound: If the container or mount point does not exist
+    """
+    stream, _ = client.api.get_archive(container_id, destination)
+    try:
+        stats = compression.stream_to_file(stream, path, fmt, level, progress, threads)
+    finally:
+        stream.close()
+    logging.info(f"Backed up {destination} of container {container_id} to {path}: {compression.format_transfer(stats)}")
+    return stats
+
+class LogStream:
+    """
+    A container's log stream, split into decoded lines.
+
+    Chunks from the daemon are not aligned to lines, so partial lines are
+    carried over to the next chunk. Only the current chunk is held in
+    memory, whatever the size of the log. close() may be called from another
+    thread to end a follow.
+    """
+
+    def __init__(self, client, container_id, tail=100, timestamps=True, follow=False, since=None, until=None):
+        self._closed = False
+        self._stream = client.api.logs(
+            container_id, stream=True, follow=follow, tail=tail,
+            timestamps=timestamps, since=since, until=until
+        )
+
+    def __iter__(self):
+        pending = b''
+        try:
+            for chunk in self._stream:
+                pending += chunk
+                *lines, pending = pending.split(b'\n')
+                for line in lines:
+                    yield line.decode('utf-8', errors='replace')
+        except Exception:
+            # Closing the stream from another thread aborts the read
+            if not self._closed:
+                raise
+        if pending and not self._closed:
+            yield pending.decode('utf-8', errors='replace')
+
+    def close(self):
+        """Stop reading; ends a follow that is waiting for new lines."""
+        self._closed = True
+        self._stream.close()
+
+# Relative time units accepted by parse_log_time, in seconds
+LOG_TIME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+def parse_log_time(text, now=None):
+    """
+    Parse a log search time bound.
+
+    Accepts a relative age ("90s", "30m", "2h", "1d", "1w") or a local date
+    and time ("2024-05-01", "2024-05-01 14:00", "2024-05-01T14:00:30").
+
+    Args:
+        text: Time bound as typed by the user
+        now: Optional reference time (epoch seconds) for relative ages
+
+    Returns:
+        int: Epoch seconds, as accepted by the since/until log parameters
+
+    Raises:
+        ValueError: If the text is not a valid time bound
+    """
+    text = text.strip()
+    unit = LOG_TIME_UNITS.get(text[-1:].lower())
+    if unit and text[:-1].isdigit():
+        return int((now if now is not None else time.time()) - int(text[:-1]) * unit)
+
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%Y-%m-%d'):
+        try:
+            return int(datetime.datetime.strptime(text, fmt).timestamp())
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time '{text}': use e.g. 30m, 2h, 1d or 2024-05-01 14:00")
+
+class LogSearch:
+    """
+    Lines of a container's log that match a pattern.
+
+    The daemon limits the log to the since/until range, and the remaining
+    lines are filtered as they stream in, so only the current line is held
+    in memory. scanned and matches count progress for display.
+    """
+
+    def __init__(self, client, container_id, pattern, regex=False, ignore_case=True,
+                 since=None, until=None, timestamps=True, follow=False):
+        """
+        Raises:
+            ValueError: If the pattern is not a valid regular expression or
+                since is later than until
+        """
+        if since is not None and until is not None and since > until:
+            raise ValueError("The start time is later than the end time")
+        if regex:
+            try:
+                self._match = re.compile(pattern, re.IGNORECASE if ignore_case else 0).search
+            except re.error as e:
+                raise ValueError(f"Invalid regular expression: {e}")
+        elif ignore_case:
+            needle = pattern.lower()
+            self._match = lambda message: needle in message.lower()
+        else:
+            self._match = lambda message: pattern in message
+
+        self.timestamps = timestamps
+        self.scanned = 0
+        self.matches = 0
+        self._stream = LogStream(client, container_id, tail='all', timestamps=timestamps,
+                                 follow=follow, since=since, until=until)
+
+    def __iter__(self):
+        for line in self._stream:
+            self.scanned += 1
+            # Only the message is searched, not the timestamp
+            message = line.split(' ', 1)[-1] if self.timestamps else line
+            if self._match(message):
+                self.matches += 1
+                yield line
+
+    def close(self):
+        self._stream.close()
+
+def parse_log_timestamp(line):
+    """
+    Split a line logged with timestamps=True into (epoch seconds, message).
+
+    Returns:
+        tuple: (float or None, str); None if the line has no valid timestamp
+    """
+    stamp, _, message = line.partition(' ')
+    base, _, fraction = stamp.rstrip('Z').partition('.')
+    try:
+        seconds = datetime.datetime.strptime(base, '%Y-%m-%dT%H:%M:%S').replace(tzinfo=datetime.timezone.utc).timestamp()
+    except ValueError:
+        return None, line
+    return seconds + (float(f"0.{fraction}") if fraction.isdigit() else 0.0), message
+
+# Seconds a merged log tail waits for slower containers before releasing lines
+MERGED_LOG_WINDOW = 1.0
+
+class MergedLogTail:
+    """
+    Logs of several containers, merged into one stream by timestamp.
+
+    Each container gets one streaming connection, read on its own thread into
+    a shared heap. Lines leave the heap in timestamp order (a k-way merge)
+    once every container has either logged something later or been quiet for
+    the merge window; a container that logs nothing cannot hold back the
+    others for longer than that. Without follow, the streams end and the
+    result is an exact merge.
+
+    Iterating yields (container_name, timestamp, message); close() may be
+    called from another thread.
+    """
+
+    def __init__(self, client, containers, tail=100, follow=True, window=MERGED_LOG_WINDOW):
+        """
+        Args:
+            client: Docker client instance
+            containers: List of (container_id, container_name)
+            tail: Lines of history to start with, per container
+            follow: Keep streaming new lines
+            window: Seconds to wait for a quiet container
+        """
+        self.window = window
+        self._heap = []
+        self._sequence = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._streams = {}
+        self._last_timestamp = {}
+        self._last_arrival = {}
+        self._running = set(name for _, name in containers)
+        self._started = time.monotonic()
+        # Newest timestamp seen and when, to follow the daemon's clock rather than ours
+        self._newest = (float('-inf'), self._started)
+
+        for container_id, name in containers:
+            threading.Thread(target=self._read, args=(client, container_id, name, tail, follow), daemon=True).start()
+
+    def _read(self, client, container_id, name, tail, follow):
+        try:
+            stream = LogStream(client, container_id, tail=tail, timestamps=True, follow=follow)
+            with self._cond:
+                self._streams[name] = stream
+                if self._closed:
+                    stream.close()
+                    return
+            for line in stream:
+                timestamp, message = parse_log_timestamp(line)
+                with self._cond:
+                    if timestamp is None:
+                        timestamp = self._last_timestamp.get(name, 0.0)
+                    self._last_timestamp[name] = timestamp
+                    self._last_arrival[name] = time.monotonic()
+                    if timestamp >= self._newest[0]:
+                        self._newest = (timestamp, time.monotonic())
+                    heapq.heappush(self._heap, (timestamp, self._sequence, name, message))
+                    self._sequence += 1
+                    self._cond.notify()
+        except Exception as e:
+            if not self._closed:
+                logging.warning(f"Log stream of '{name}' ended: {e}")
+        finally:
+            with self._cond:
+                self._running.discard(name)
+                self._cond.notify()
+
+    def _watermark(self):
+        """Lines up to this timestamp can no longer be preceded by another container's line."""
+        now = time.monotonic()
+        daemon_now = self._newest[0] + (now - self._newest[1])
+        watermark = float('inf')
+        for name in self._running:
+            if now - self._last_arrival.get(name, self._started) < self.window:
+                # Still sending (or just started): wait for it to move past
+                watermark = min(watermark, self._last_timestamp.get(name, float('-inf')))
+            else:
+                # Quiet: its next line will be newer than the window
+                watermark = min(watermark, max(self._last_timestamp.get(name, float('-inf')), daemon_now - self.window))
+        return watermark
+
+    def __iter__(self):
+        while True:
+            with self._cond:
+                watermark = self._watermark()
+                ready = []
+                while self._heap and self._heap[0][0] <= watermark:
+                    timestamp, _, name, message = heapq.heappop(self._heap)
+                    ready.append((name, timestamp, message))
+                if not ready:
+                    if self._closed or (not self._running and not self._heap):
+                        return
+                    self._cond.wait(self.window / 4)
+                    continue
+            yield from ready
+
+    def close(self):
+        """Close every container's stream."""
+        with self._cond:
+            self._closed = True
+            streams = list(self._streams.values())
+            self._cond.notify()
+        for stream in streams:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+def _repo_digests(image):
+    """Manifest digests an image was pulled by, e.g. {'sha256:...'}."""
+    return {d.split('@', 1)[1] for d in image.attrs.get('RepoDigests') or [] if '@' in d}
+
+def check_image_update(client, container):
+    """
+    Check whether a newer image is available for a container.
+
+    The registry manifest digest is fetched with a single HEAD-style
+    distribution request, so nothing is downloaded. A container can also be
+    stale when its image tag was pulled again but the container was not
+    recreated; that case needs no pull at all.
+
+    Args:
+        client: Docker client instance
+        container: docker.models.containers.Container to check
+
+    Returns:
+        dict: image, local_digest, remote_digest, pull_needed, update_available
+
+    Raises:
+        docker.errors.APIError: If the registry cannot be queried
+    """
+    image = container.attrs['Config']['Image']
+
+    try:
+        local_image = client.images.get(image)
+    except docker.errors.ImageNotFound:
+        local_image = None
+
+    local_digests = _repo_digests(local_image) if local_image else set()
+    remote_digest = client.images.get_registry_data(normalize_image_reference(image)).id
+
+    pull_needed = remote_digest not in local_digests
+    container_stale = local_image is None or container.attrs.get('Image') != local_image.id
+
+    return {
+        'image': image,
+        'local_digest': sorted(local_digests)[0] if local_digests else None,
+        'remote_digest': remote_digest,
+        'pull_needed': pull_needed,
+        'update_available': pull_needed or container_stale,
+    }
+
+# Docker's default /dev/shm size, left out of generated commands
+DEFAULT_SHM_SIZE = 64 * 1024 * 1024
+
+# Config keys accepted by the container create endpoint
+CREATE_CONFIG_KEYS = (
+    'Hostname', 'Domainname', 'User', 'AttachStdin', 'AttachStdout', 'AttachStderr',
+    'ExposedPorts', 'Tty', 'OpenStdin', 'StdinOnce', 'Env', 'Cmd', 'Healthcheck',
+    'ArgsEscaped', 'Image', 'Volumes', 'WorkingDir', 'Entrypoint', 'NetworkDisabled',
+    'MacAddress', 'OnBuild', 'Labels', 'StopSignal', 'StopTimeout', 'Shell',
+)
+
+# Config keys whose value is inherited from the image unless overridden
+IMAGE_DEFAULT_KEYS = ('Cmd', 'Entrypoint', 'WorkingDir', 'User', 'Healthcheck', 'StopSignal',
+                      'Shell', 'OnBuild', 'ArgsEscaped')
+
+# Endpoint settings that are chosen by the user rather than assigned at runtime
+# (API 1.44+ keeps a user-assigned MAC address per endpoint)
+ENDPOINT_KEYS = ('IPAMConfig', 'Links', 'Aliases', 'DriverOpts', 'MacAddress')
+
+def _derived_mac_address(ip_address):
+    """MAC address older daemons derive from a container's IPv4 address, or None."""
+    octets = (ip_address or '').split('.')
+    if len(octets) != 4 or not all(o.isdigit() for o in octets):
+        return None
+    return '02:42:' + ':'.join(f"{int(o):02x}" for o in octets)
+
+def container_spec(attrs, image_config=None):
+    """
+    Capture everything needed to create an equivalent container.
+
+    The result round-trips the inspected Config, HostConfig and network
+    endpoints into the shape of a create call. When the configuration of the
+    image the container was created from is given, values the container
+    only inherited from that image (default command, ENV, labels, ...) are
+    left out, so a recreation from a newer image picks up the newer
+    defaults. Anonymous volumes are carried over as named binds so their
+    data survives the recreation.
+
+    Args:
+        attrs: Container inspect data (container.attrs)
+        image_config: Optional Config section of the container's image
+
+    Returns:
+        dict: name, config (create body without HostConfig), host_config and
+            endpoints (network name -> endpoint settings)
+    """
+    source = attrs['Config']
+    image_config = image_config or {}
+
+    config = {key: copy.deepcopy(source[key]) for key in CREATE_CONFIG_KEYS if source.get(key) not in (None, '', [], {})}
+
+    # The default hostname is the container ID
+    if config.get('Hostname') == attrs['Id'][:12]:
+        del config['Hostname']
+
+    entrypoint_overridden = source.get('Entrypoint') != image_config.get('Entrypoint')
+    for key in IMAGE_DEFAULT_KEYS:
+        # Overriding the entrypoint clears the image's command, so the command must be kept
+        if key == 'Cmd' and entrypoint_overridden:
+            continue
+        if key in config and config[key] == image_config.get(key):
+            del config[key]
+
+    image_env = set(image_config.get('Env') or [])
+    if 'Env' in config:
+        config['Env'] = [e for e in config['Env'] if e not in image_env] or None
+    for key in ('Labels', 'ExposedPorts', 'Volumes'):
+        if key in config:
+            inherited = image_config.get(key) or {}
+            config[key] = {k: v for k, v in config[key].items() if k not in inherited or inherited[k] != v} or None
+    config = {k: v for k, v in config.items() if v is not None}
+
+    host_config = copy.deepcopy(attrs['HostConfig'])
+
+    # Reuse anonymous volumes instead of creating empty ones
+    mounted = {b.split(':')[1] for b in host_config.get('Binds') or [] if ':' in b}
+    mounted.update(m.get('Target') for m in host_config.get('Mounts') or [])
+    for mount in attrs.get('Mounts') or []:
+        if mount.get('Type') == 'volume' and mount['Destination'] not in mounted:
+            bind = f"{mount['Name']}:{mount['Destination']}" + ('' if mount.get('RW', True) else ':ro')
+            host_config['Binds'] = (host_config.get('Binds') or []) + [bind]
+
+    endpoints = {}
+    short_id = attrs['Id'][:12]
+    for network_name, endpoint in (attrs.get('NetworkSettings', {}).get('Networks') or {}).items():
+        settings = {key: copy.deepcopy(endpoint[key]) for key in ENDPOINT_KEYS if endpoint.get(key)}
+        if 'Aliases' in settings:
+            settings['Aliases'] = [a for a in settings['Aliases'] if a != short_id] or None
+        # A MAC derived from the current IP was assigned, not chosen, and would clash once the IP moves on
+        if settings.get('MacAddress') == _derived_mac_address(endpoint.get('IPAddress')):
+            settings['MacAddress'] = None
+        endpoints[network_name] = {k: v for k, v in settings.items() if v is not None}
+
+    return {
+        'name': attrs['Name'].lstrip('/'),
+        'config': config,
+        'host_config': host_config,
+        'endpoints': endpoints,
+    }
+
+def get_container_spec(client, container):
+    """
+    Capture a container's spec, leaving out the defaults of its image.
+
+    Args:
+        client: Docker client instance
+        container: docker.models.containers.Container
+
+    Returns:
+        dict: See container_spec()
+    """
+    try:
+        image_config = client.api.inspect_image(container.attrs['Image'])['Config']
+    except docker.errors.NotFound:
+        # Image was removed; keep every value
+        image_config = None
+    return container_spec(container.attrs, image_config)
+
+def _primary_network(spec):
+    """Network the container joins at create time, or None for host/none/container modes."""
+    mode = spec['host_config'].get('NetworkMode') or 'default'
+    if mode == 'default':
+        return 'bridge'
+    if mode in ('host', 'none') or mode.startswith('container:'):
+        return None
+    return mode
+
+def create_container_from_spec(client, spec, name=None):
+    """
+    Create a container from a captured spec with a single create call.
+
+    Daemons before API 1.44 accept only one network at create time; further
+    networks are connected right after creation, before the container starts.
+
+    Args:
+        client: Docker client instance
+        spec: Spec from container_spec()
+        name: Container name (defaults to the captured name)
+
+    Returns:
+        docker.models.containers.Container: The created (not started) container
+    """
+    primary = _primary_network(spec)
+    all_at_once = docker.utils.version_gte(client.api.api_version, '1.44')
+    endpoints = {
+        network: settings for network, settings in spec['endpoints'].items()
+        if all_at_once or network == primary
+    }
+
+    body = dict(spec['config'], HostConfig=spec['host_config'])
+    if endpoints:
+        body['NetworkingConfig'] = {'EndpointsConfig': endpoints}
+
+    container_id = client.api.create_container_from_config(body, name=name or spec['name'])['Id']
+
+    for network, settings in spec['endpoints'].items():
+        if network in endpoints or primary is None:
+            continue
+        ipam = settings.get('IPAMConfig') or {}
+        client.api.connect_container_to_network(
+            container_id, network,
+            aliases=settings.get('Aliases'),
+            links=settings.get('Links'),
+            ipv4_address=ipam.get('IPv4Address'),
+            ipv6_address=ipam.get('IPv6Address'),
+            driver_opt=settings.get('DriverOpts'),
+        )
+
+    return client.containers.get(container_id)
+
+def _published_host_ports(spec):
+    """Whether a spec binds host ports, which two containers cannot share."""
+    return any(bindings for bindings in (spec['host_config'].get('PortBindings') or {}).values())
+
+def _format_duration(nanoseconds):
+    """Docker duration in nanoseconds as a CLI/compose duration, e.g. "30s"."""
+    seconds = nanoseconds / 1e9
+    return f"{seconds:g}s"
+
+def _port_mapping(container_port, binding):
+    """One PortBindings entry as a "-p"-style mapping."""
+    if container_port.endswith('/tcp'):
+        container_port = container_port[:-4]
+    host_ip, host_port = binding.get('HostIp') or '', binding.get('HostPort') or ''
+    if host_ip and host_ip not in ('0.0.0.0', '::'):
+        return f"{host_ip}:{host_port}:{container_port}"
+    return f"{host_port}:{container_port}" if host_port else container_port
+
+def _mount_option(mount):
+    """One HostConfig.Mounts entry as a --mount value."""
+    parts = [f"type={mount.get('Type', 'volume')}"]
+    if mount.get('Source'):
+        parts.append(f"source={mount['Source']}")
+    parts.append(f"target={mount['Target']}")
+    if mount.get('ReadOnly'):
+        parts.append('readonly')
+    return ','.join(parts)
+
+def _healthcheck_options(healthcheck):
+    """A Healthcheck config as (flag, value) pairs for docker run."""
+    test = healthcheck.get('Test') or []
+    if test == ['NONE']:
+        return [('--no-healthcheck', None)]
+    options = []
+    if test[:1] == ['CMD-SHELL']:
+        options.append(('--health-cmd', test[1]))
+    elif test[:1] == ['CMD']:
+        options.append(('--health-cmd', shlex.join(test[1:])))
+    for key, flag in [('Interval', '--health-interval'), ('Timeout', '--health-timeout'),
+                      ('StartPeriod', '--health-start-period')]:
+        if healthcheck.get(key):
+            options.append((flag, _format_duration(healthcheck[key])))
+    if healthcheck.get('Retries'):
+        options.append(('--health-retries', str(healthcheck['Retries'])))
+    return options
+
+def spec_to_run_args(spec):
+    """
+    Turn a captured spec into docker run arguments.
+
+    Args:
+        spec: Spec from container_spec()
+
+    Returns:
+        tuple: (options, command, extra_networks) where options are (flag,
+            value or None) pairs for "docker run -d", command is the image
+            followed by its arguments, and extra_networks lists (network,
+            aliases) to connect afterwards
+    """
+    config, host_config = spec['config'], spec['host_config']
+    options = [('--name', spec['name'])]
+
+    def add(flag, value=None):
+        options.append((flag, None if value is None else str(value)))
+
+    if config.get('Hostname'):
+        add('--hostname', config['Hostname'])
+    if config.get('User'):
+        add('--user', config['User'])
+    if config.get('WorkingDir'):
+        add('--workdir', config['WorkingDir'])
+    if config.get('Tty'):
+        add('--tty')
+    if config.get('OpenStdin'):
+        add('--interactive')
+    for env in config.get('Env') or []:
+        add('-e', env)
+    for key, value in (config.get('Labels') or {}).items():
+        add('--label', f"{key}={value}")
+    for port in config.get('ExposedPorts') or {}:
+        add('--expose', port)
+    if config.get('StopSignal'):
+        add('--stop-signal', config['StopSignal'])
+    if config.get('StopTimeout') is not None:
+        add('--stop-timeout', config['StopTimeout'])
+    for flag, value in _healthcheck_options(config.get('Healthcheck') or {}):
+        add(flag, value)
+
+    for container_port, bindings in (host_config.get('PortBindings') or {}).items():
+        for binding in bindings or []:
+            add('-p', _port_mapping(container_port, binding))
+    if host_config.get('PublishAllPorts'):
+        add('--publish-all')
+    for bind in host_config.get('Binds') or []:
+        add('-v', bind)
+    for mount in host_config.get('Mounts') or []:
+        add('--mount', _mount_option(mount))
+    for container in host_config.get('VolumesFrom') or []:
+        add('--volumes-from', container)
+    for path, options in (host_config.get('Tmpfs') or {}).items():
+        add('--tmpfs', f"{path}:{options}" if options else path)
+
+    restart = host_config.get('RestartPolicy') or {}
+    if restart.get('Name') and restart['Name'] != 'no':
+        name = restart['Name']
+        if name == 'on-failure' and restart.get('MaximumRetryCount'):
+            name += f":{restart['MaximumRetryCount']}"
+        add('--restart', name)
+    if host_config.get('AutoRemove'):
+        add('--rm')
+
+    primary = _primary_network(spec)
+    mode = host_config.get('NetworkMode') or 'default'
+    if mode not in ('default', 'bridge'):
+        add('--network', mode)
+    if primary:
+        for alias in spec['endpoints'].get(primary, {}).get('Aliases') or []:
+            add('--network-alias', alias)
+        ip = (spec['endpoints'].get(primary, {}).get('IPAMConfig') or {}).get('IPv4Address')
+        if ip:
+            add('--ip', ip)
+        mac_address = spec['endpoints'].get(primary, {}).get('MacAddress') or config.get('MacAddress')
+        if mac_address:
+            add('--mac-address', mac_address)
+    for link in host_config.get('Links') or []:
+        add('--link', link)
+    for server in host_config.get('Dns') or []:
+        add('--dns', server)
+    for host in host_config.get('ExtraHosts') or []:
+        add('--add-host', host)
+
+    if host_config.get('Privileged'):
+        add('--privileged')
+    for cap in host_config.get('CapAdd') or []:
+        add('--cap-add', cap)
+    for cap in host_config.get('CapDrop') or []:
+        add('--cap-drop', cap)
+    for option in host_config.get('SecurityOpt') or []:
+        add('--security-opt', option)
+    for device in host_config.get('Devices') or []:
+        add('--device', f"{device['PathOnHost']}:{device['PathInContainer']}:{device.get('CgroupPermissions', 'rwm')}")
+    for rule in host_config.get('DeviceCgroupRules') or []:
+        add('--device-cgroup-rule', rule)
+    for request in host_config.get('DeviceRequests') or []:
+        if request.get('Capabilities') == [['gpu']]:
+            count = request.get('Count')
+            add('--gpus', 'all' if count == -1 else ('device=' + ','.join(request['DeviceIDs'])
+                                                    if request.get('DeviceIDs') else count))
+    for group in host_config.get('GroupAdd') or []:
+        add('--group-add', group)
+    for key, value in (host_config.get('Sysctls') or {}).items():
+        add('--sysctl', f"{key}={value}")
+    for ulimit in host_config.get('Ulimits') or []:
+        add('--ulimit', f"{ulimit['Name']}={ulimit['Soft']}:{ulimit['Hard']}")
+    for key, flag in [('PidMode', '--pid'), ('IpcMode', '--ipc'), ('UsernsMode', '--userns'),
+                      ('Runtime', '--runtime')]:
+        if host_config.get(key) and host_config[key] not in ('private', 'shareable', 'runc'):
+            add(flag, host_config[key])
+    if host_config.get('Init'):
+        add('--init')
+    if host_config.get('ReadonlyRootfs'):
+        add('--read-only')
+    if host_config.get('ShmSize') and host_config['ShmSize'] != DEFAULT_SHM_SIZE:
+        add('--shm-size', host_config['ShmSize'])
+    if host_config.get('Memory'):
+        add('--memory', host_config['Memory'])
+    if host_config.get('NanoCpus'):
+        add('--cpus', f"{host_config['NanoCpus'] / 1e9:g}")
+    if host_config.get('CpusetCpus'):
+        add('--cpuset-cpus', host_config['CpusetCpus'])
+
+    log_config = host_config.get('LogConfig') or {}
+    if log_config.get('Type') and (log_config['Type'] != 'json-file' or log_config.get('Config')):
+        add('--log-driver', log_config['Type'])
+        for key, value in (log_config.get('Config') or {}).items():
+            add('--log-opt', f"{key}={value}")
+
+    # --entrypoint takes a single executable; its arguments move in front of the command
+    entrypoint = config.get('Entrypoint') or []
+    if entrypoint:
+        add('--entrypoint', entrypoint[0])
+    command = [config['Image']] + entrypoint[1:] + (config.get('Cmd') or [])
+
+    extra_networks = [
+        (network, settings.get('Aliases') or [])
+        for network, settings in spec['endpoints'].items() if primary and network != primary
+    ]
+    return options, command, extra_networks
+
+def spec_to_compose_service(spec):
+    """
+    Turn a captured spec into a docker-compose service definition.
+
+    Args:
+        spec: Spec from container_spec()
+
+    Returns:
+        tuple: (service dict, named volumes used, networks used)
+    """
+    config, host_config = spec['config'], spec['host_config']
+    labels = config.get('Labels') or {}
+    service = {'image': config['Image'], 'container_name': spec['name']}
+    volumes_used, networks_used = set(), set()
+
+    if config.get('Entrypoint'):
+        service['entrypoint'] = config['Entrypoint']
+    if config.get('Cmd'):
+        service['command'] = config['Cmd']
+    for key, compose_key in [('Hostname', 'hostname'), ('User', 'user'), ('WorkingDir', 'working_dir'),
+                             ('StopSignal', 'stop_signal')]:
+        if config.get(key):
+            service[compose_key] = config[key]
+    if config.get('Tty'):
+        service['tty'] = True
+    if config.get('OpenStdin'):
+        service['stdin_open'] = True
+
+    env = {}
+    for entry in config.get('Env') or []:
+        key, _, value = entry.partition('=')
+        env[key] = value
+    if env:
+        service['environment'] = env
+
+    ports = [
+        _port_mapping(container_port, binding)
+        for container_port, bindings in (host_config.get('PortBindings') or {}).items()
+        for binding in bindings or []
+    ]
+    if ports:
+        service['ports'] = ports
+    if config.get('ExposedPorts'):
+        service['expose'] = list(config['ExposedPorts'])
+
+    volumes = []
+    for bind in host_config.get('Binds') or []:
+        volumes.append(bind)
+        source = bind.split(':')[0]
+        if not source.startswith('/'):
+            volumes_used.add(source)
+    for mount in host_config.get('Mounts') or []:
+        entry = {'type': mount.get('Type', 'volume'), 'target': mount['Target']}
+        if mount.get('Source'):
+            entry['source'] = mount['Source']
+            if entry['type'] == 'volume':
+                volumes_used.add(mount['Source'])
+        if mount.get('ReadOnly'):
+            entry['read_only'] = True
+        volumes.append(entry)
+    if volumes:
+        service['volumes'] = volumes
+    if host_config.get('Tmpfs'):
+        service['tmpfs'] = [f"{path}:{options}" if options else path for path, options in host_config['Tmpfs'].items()]
+
+    primary = _primary_network(spec)
+    mode = host_config.get('NetworkMode') or 'default'
+    if primary is None:
+        service['network_mode'] = mode
+    else:
+        networks = {}
+        for network, settings in spec['endpoints'].items():
+            if network == 'bridge' and mode in ('default', 'bridge') and len(spec['endpoints']) == 1:
+                continue
+            entry = {}
+            if settings.get('Aliases'):
+                entry['aliases'] = settings['Aliases']
+            ipam = settings.get('IPAMConfig') or {}
+            if ipam.get('IPv4Address'):
+                entry['ipv4_address'] = ipam['IPv4Address']
+            if settings.get('MacAddress'):
+                entry['mac_address'] = settings['MacAddress']
+            networks[network] = entry or None
+            networks_used.add(network)
+        if networks:
+            service['networks'] = networks if any(networks.values()) else list(networks)
+
+    restart = (host_config.get('RestartPolicy') or {}).get('Name')
+    if restart and restart != 'no':
+        service['restart'] = restart
+    for key, compose_key in [('Privileged', 'privileged'), ('Init', 'init'), ('ReadonlyRootfs', 'read_only')]:
+        if host_config.get(key):
+            service[compose_key] = True
+    for key, compose_key in [('CapAdd', 'cap_add'), ('CapDrop', 'cap_drop'), ('SecurityOpt', 'security_opt'),
+                             ('Dns', 'dns'), ('ExtraHosts', 'extra_hosts'), ('GroupAdd', 'group_add'),
+                             ('DeviceCgroupRules', 'device_cgroup_rules'), ('VolumesFrom', 'volumes_from')]:
+        if host_config.get(key):
+            service[compose_key] = list(host_config[key])
+    if host_config.get('Devices'):
+        service['devices'] = [
+            f"{d['PathOnHost']}:{d['PathInContainer']}:{d.get('CgroupPermissions', 'rwm')}"
+            for d in host_config['Devices']
+        ]
+    if host_config.get('Sysctls'):
+        service['sysctls'] = dict(host_config['Sysctls'])
+    if host_config.get('Ulimits'):
+        service['ulimits'] = {u['Name']: {'soft': u['Soft'], 'hard': u['Hard']} for u in host_config['Ulimits']}
+    for key, compose_key in [('PidMode', 'pid'), ('IpcMode', 'ipc'), ('Runtime', 'runtime')]:
+        if host_config.get(key) and host_config[key] not in ('private', 'shareable', 'runc'):
+            service[compose_key] = host_config[key]
+    if host_config.get('ShmSize') and host_config['ShmSize'] != DEFAULT_SHM_SIZE:
+        service['shm_size'] = host_config['ShmSize']
+    if host_config.get('Memory'):
+        service['mem_limit'] = host_config['Memory']
+    if host_config.get('NanoCpus'):
+        service['cpus'] = host_config['NanoCpus'] / 1e9
+
+    log_config = host_config.get('LogConfig') or {}
+    if log_config.get('Type') and (log_config['Type'] != 'json-file' or log_config.get('Config')):
+        service['logging'] = {'driver': log_config['Type']}
+        if log_config.get('Config'):
+            service['logging']['options'] = dict(log_config['Config'])
+
+    healthcheck = config.get('Healthcheck') or {}
+    if healthcheck.get('Test') == ['NONE']:
+        service['healthcheck'] = {'disable': True}
+    elif healthcheck.get('Test'):
+        service['healthcheck'] = {'test': healthcheck['Test']}
+        for key, compose_key in [('Interval', 'interval'), ('Timeout', 'timeout'), ('StartPeriod', 'start_period')]:
+            if healthcheck.get(key):
+                service['healthcheck'][compose_key] = _format_duration(healthcheck[key])
+        if healthcheck.get('Retries'):
+            service['healthcheck']['retries'] = healthcheck['Retries']
+
+    depends_on = {}
+    for entry in (labels.get('com.docker.compose.depends_on') or '').split(','):
+        parts = entry.strip().split(':')
+        if parts[0]:
+            depends_on[parts[0]] = {'condition': parts[1] if len(parts) > 1 else 'service_started'}
+    if depends_on:
+        service['depends_on'] = depends_on
+
+    # Compose sets its own labels again when the stack is deployed
+    custom_labels = {k: v for k, v in labels.items() if not k.startswith('com.docker.compose')}
+    if custom_labels:
+        service['labels'] = custom_labels
+
+    return service, volumes_used, networks_used
+
+UPDATE_STRATEGIES = ('recreate', 'blue-green')
+
+# Suffix of the temporary container name during a blue/green update
+BLUE_GREEN_SUFFIX = '-update'
+
+# Suffix the replaced container carries until the new one has taken its name
+BLUE_GREEN_OLD_SUFFIX = '-old'
+
+# Seconds a new container gets to become healthy during a blue/green update
+UPDATE_READY_TIMEOUT = 120
+
+# Seconds a container without healthcheck or reachable port must keep running
+UPDATE_GRACE_SECONDS = 5
+
+def _container_probe_targets(client, container):
+    """
+    (address, port) pairs of a container's TCP ports on its own network.
+
+    Probing the container directly shows whether the application listens;
+    a published host port would be accepted by docker-proxy before that.
+    Container addresses are only routable from the machine running a local
+    Linux daemon, so there are no targets otherwise.
+    """
+    if not sys.platform.startswith('linux') or client.api.base_url != 'http+docker://localhost':
+        return []
+    settings = container.attrs['NetworkSettings']
+    ports = sorted({int(port.split('/')[0]) for port in (settings.get('Ports') or {}) if port.endswith('/tcp')})
+    addresses = [n['IPAddress'] for n in (settings.get('Networks') or {}).values() if n.get('IPAddress')]
+    return [(addresses[0], port) for port in ports] if addresses else []
+
+def wait_until_ready(client, container, timeout=UPDATE_READY_TIMEOUT, grace=UPDATE_GRACE_SECONDS):
+    """
+    Wait until a freshly started container is ready to take over.
+
+    A container with a Docker healthcheck must report healthy. Otherwise, on
+    a local Linux daemon, one of its TCP ports must accept connections on
+    the container's own address. Where neither is possible there is no real
+    readiness signal; the container only has to keep running for the grace
+    period, and the returned description says so.
+
+    Args:
+        client: Docker client instance
+        container: The started container
+        timeout: Seconds to wait before giving up
+        grace: Seconds a container without healthcheck or probe must stay up
+
+    Returns:
+        str: How readiness was established (e.g. "healthy")
+
+    Raises:
+        RuntimeError: If the container exits, turns unhealthy or times out
+    """
+    started = time.monotonic()
+
+    while True:
+        container.reload()
+        state = container.attrs['State']
+        if state['Status'] in ('exited', 'dead'):
+            raise RuntimeError(f"container exited with code {state.get('ExitCode')}")
+
+        health = state.get('Health')
+        if health:
+            if health['Status'] == 'healthy':
+                return 'healthy'
+            if health['Status'] == 'unhealthy':
+                raise RuntimeError("container is unhealthy")
+        else:
+            targets = _container_probe_targets(client, container)
+            for address, port in targets:
+                try:
+                    with socket.create_connection((address, port), timeout=1):
+                        return f"port {port} listening"
+                except OSError:
+                    pass
+            if not targets and time.monotonic() - started >= grace:
+                return f"no healthcheck, assumed ready after running {grace}s"
+
+        if time.monotonic() - started >= timeout:
+            raise RuntimeError(f"container not ready after {timeout}s")
+        time.sleep(1)
+
+def _writable_mounts(container):
+    """Destinations of a container's writable volume and bind mounts."""
+    return [
+        mount.get('Destination') for mount in container.attrs.get('Mounts') or []
+        if mount.get('Type') in ('volume', 'bind') and mount.get('RW')
+    ]
+
+def _static_addresses(spec):
+    """Networks whose endpoint in the spec has fixed IP or MAC addresses."""
+    return [
+        network for network, settings in spec['endpoints'].items()
+        if any((settings.get('IPAMConfig') or {}).values()) or settings.get('MacAddress')
+    ]
+
+def _without_fixed_addresses(spec):
+    """Copy of a spec without fixed IP and MAC addresses, which two containers cannot share."""
+    spec = copy.deepcopy(spec)
+    spec['config'].pop('MacAddress', None)
+    for settings in spec['endpoints'].values():
+        settings.pop('IPAMConfig', None)
+        settings.pop('MacAddress', None)
+    return spec
+
+def _restore_fixed_addresses(client, container, spec):
+    """
+    Give a container the fixed IP and MAC addresses of a spec.
+
+    Addresses can only be set when connecting, so each affected network is
+    disconnected and connected again.
+    """
+    mac_address = spec['config'].get('MacAddress')
+    primary = _primary_network(spec)
+    networks = set(_static_addresses(spec))
+    if mac_address and primary:
+        networks.add(primary)
+
+    for network in networks:
+        settings = spec['endpoints'].get(network, {})
+        ipam = settings.get('IPAMConfig') or {}
+        network_mac = settings.get('MacAddress') or (mac_address if network == primary else None)
+        logging.info(f"Reconnecting '{spec['name']}' to {network} with its fixed address")
+        client.api.disconnect_container_from_network(container.id, network)
+        client.api.connect_container_to_network(
+            container.id, network,
+            aliases=settings.get('Aliases'),
+            links=settings.get('Links'),
+            ipv4_address=ipam.get('IPv4Address'),
+            ipv6_address=ipam.get('IPv6Address'),
+            link_local_ips=ipam.get('LinkLocalIPs'),
+            driver_opt=settings.get('DriverOpts'),
+            mac_address=network_mac,
+        )
+
+def _blue_green_replace(client, old_container, service_name, spec, stop_old=False):
+    """
+    Replace a container by starting its successor under a temporary name.
+
+    The old container keeps serving until the new one is ready, unless
+    stop_old is set; it is then stopped just before its successor starts (a
+    stop-then-start, not a zero-downtime swap) and started again on
+    rollback. Fixed IP and MAC addresses are left out of the temporary
+    container and restored once the old container is gone. The old container
+    is renamed out of the way before the new one takes its name, so a failed
+    rename can still be rolled back.
+
+    Args:
+        client: Docker client instance
+        old_container: The running container to replace
+        service_name: Name of the container
+        spec: Spec of the new container from get_container_spec()
+        stop_old: Stop the old container before starting the new one
+
+    Returns:
+        tuple: (new_container, readiness description)
+
+    Raises:
+        RuntimeError: If the new container fails; the old one is kept
+    """
+    temp_name = f"{service_name}{BLUE_GREEN_SUFFIX}"
+    old_name = f"{service_name}{BLUE_GREEN_OLD_SUFFIX}"
+
+    # Leftovers from an interrupted update
+    for name in (temp_name, old_name):
+        try:
+            client.containers.get(name).remove(force=True)
+        except docker.errors.NotFound:
+            pass
+
+    logging.info(f"Creating updated container '{temp_name}' next to '{service_name}'")
+    new_container = create_container_from_spec(client, _without_fixed_addresses(spec), temp_name)
+
+    stopped_old = False
+    renamed_old = False
+    try:
+        if stop_old and old_container.status == 'running':
+            logging.info(f"Stopping '{service_name}' before starting its successor")
+            old_container.stop(timeout=10)
+            stopped_old = True
+        new_container.start()
+        readiness = wait_until_ready(client, new_container)
+
+        logging.info(f"Renaming '{service_name}' to '{old_name}' and '{temp_name}' to '{service_name}'")
+        old_container.rename(old_name)
+        renamed_old = True
+        new_container.rename(service_name)
+    except Exception as e:
+        logging.error(f"Updated container for '{service_name}' failed: {e}; rolling back")
+        new_container.remove(force=True)
+        if renamed_old:
+            old_container.rename(service_name)
+        if stopped_old:
+            old_container.start()
+        raise RuntimeError(f"Update of '{service_name}' rolled back: {e}")
+
+    logging.info(f"Removing old container '{old_name}'")
+    old_container.remove(force=True)
+    if spec['config'].get('MacAddress') or _static_addresses(spec):
+        _restore_fixed_addresses(client, new_container, spec)
+    return new_container, readiness
+
+def update_service(client, service_name, check_only=False, progress=None, strategy='recreate',
+                   allow_shared_mounts=False):
     """
     Update a Docker container to the latest image version.
 
-    This recreates the container with the same configuration but latest image.
+    The local image digest is compared with the registry's manifest digest
+    first, and the container is only recreated (with the same configuration
+    but latest image) when they differ.
+
+    With the 'recreate' strategy the old container is stopped and removed
+    before the new one is created. With 'blue-green' the new container is
+    started under a temporary name and only replaces the old one once it is
+    ready; if it never becomes ready the old container is kept. A container
+    that publishes host ports, or has writable volume or bind mounts that
+    both would write to at once, is stopped just before its successor
+    starts: a stop-then-start rather than a zero-downtime swap, still rolled
+    back on failure. allow_shared_mounts keeps containers with writable
+    mounts running side by side.
 
     Args:
         client: Docker client instance
         service_name: Name of the container to update
+        check_only: Only report whether an update is available
+        progress: Optional callable receiving the PullProgress of the image pull
+        strategy: 'recreate' or 'blue-green'
+        allow_shared_mounts: Keep the old container running next to the new
+            one even if they share writable volume or bind mounts
 
     Returns:
         str: Success message
@@ -562,32 +2801,58 @@ def update_service(client, service_name):
     Raises:
         docker.errors.NotFound: If container doesn't exist
         docker.errors.APIError: If Docker operation fails
+        RuntimeError: If check_only and the registry cannot be queried
     """
+    if strategy not in UPDATE_STRATEGIES:
+        raise ValueError(f"Unknown update strategy: {strategy}")
+
     try:
         logging.info(f"Updating service: {service_name}")
 
         # Get existing container
         old_container = client.containers.get(service_name)
 
-        # Get container configuration
-        config = old_container.attrs['Config']
-        host_config = old_container.attrs['HostConfig']
-
-        # Extract important settings
-        image = config['Image']
-        environment = config.get('Env', [])
-        volumes = host_config.get('Binds', [])
-        port_bindings = host_config.get('PortBindings', {})
-        restart_policy = host_config.get('RestartPolicy', {})
+        image = old_container.attrs['Config']['Image']
 
-        logging.info(f"Pulling latest image: {image}")
+        # Compare digests; images without registry access fall back to a pull
+        try:
+            update = check_image_update(client, old_container)
+        except docker.errors.APIError as e:
+            logging.warning(f"Could not query registry for {image}: {e}")
+            if check_only:
+                # A failed check is an error, so batch callers count it and exit non-zero
+                raise RuntimeError(f"Could not check '{service_name}' ({image}): {e}")
+            update = {'pull_needed': True, 'update_available': True}
+
+        if check_only:
+            if update['update_available']:
+                return f"⬆ Update available for '{service_name}' ({image})"
+            return f"✓ Service '{service_name}' is up to date ({image})"
+
+        if not update['update_available']:
+            logging.info(f"Image {image} for '{service_name}' is unchanged, skipping update")
+            return f"✓ Service '{service_name}' is already up to date"
+
+        # Capture the full configuration, minus the old image's defaults
+        spec = get_container_spec(client, old_container)
 
         # Pull latest image
-        try:
-            client.images.pull(image)
-        except Exception as e:
-            logging.warning(f"Failed to pull image {image}: {e}")
-            return f"⚠ Failed to pull latest image for '{service_name}': {e}"
+        if update['pull_needed']:
+            try:
+                pull_image(client, image, progress)
+            except Exception as e:
+                logging.warning(f"Failed to pull image {image}: {e}")
+                return f"⚠ Failed to pull latest image for '{service_name}': {e}"
+
+        if strategy == 'blue-green':
+            # Host ports cannot be bound twice, and writable mounts must not be written by both
+            shared = [] if allow_shared_mounts else _writable_mounts(old_container)
+            if shared:
+                logging.warning(f"'{service_name}' has writable mounts ({', '.join(shared)}), stopping it before its successor starts")
+            stop_old = bool(_published_host_ports(spec) or shared)
+            new_container, readiness = _blue_green_replace(client, old_container, service_name, spec, stop_old)
+            logging.info(f"Container '{service_name}' updated blue/green ({readiness}), ID: {new_container.short_id}")
+            return f"✓ Service '{service_name}' updated successfully ({readiness}, new ID: {new_container.short_id})"
 
         # Stop and remove old container
         logging.info(f"Stopping old container '{service_name}'")
@@ -597,32 +2862,10 @@ def update_service(client, service_name):
         logging.info(f"Removing old container '{service_name}'")
         old_container.remove()
 
-        # Parse volumes for new container
-        volume_dict = {}
-        if volumes:
-            for volume in volumes:
-                parts = volume.split(':')
-                if len(parts) >= 2:
-                    volume_dict[parts[0]] = {'bind': parts[1], 'mode': 'rw'}
-
-        # Parse port bindings
-        ports_dict = {}
-        if port_bindings:
-            for container_port, host_info in port_bindings.items():
-                if host_info:
-                    ports_dict[container_port] = host_info[0]['HostPort']
-
         # Create new container with same configuration
         logging.info(f"Creating updated container '{service_name}'")
-        new_container = client.containers.run(
-            image=image,
-            name=service_name,
-            environment=environment,
-            volumes=volume_dict,
-            ports=ports_dict,
-            detach=True,
-            restart_policy=restart_policy
-        )
+        new_container = create_container_from_spec(client, spec, service_name)
+        new_container.start()
 
         logging.info(f"Container '{service_name}' updated successfully with ID: {new_container.short_id}")
         return f"✓ Service '{service_name}' updated successfully (new ID: {new_container.short_id})"
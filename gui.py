@@ -4,11 +4,345 @@ from gi.repository import Gtk, Pango, Gdk, GLib
 import core
 import config
 import yaml
+import yaml_io
+import compression
 import os
 import threading
+import collections
+import concurrent.futures
 import subprocess
 import shutil
 
+# Seconds between automatic refreshes of the Docker resource tabs
+AUTO_REFRESH_SECONDS = 30
+
+# Event updates kept for replay onto a full refresh that was fetched meanwhile
+INVENTORY_REPLAY_EVENTS = 1000
+
+# Lines kept in a log view; the oldest are dropped beyond this
+LOG_VIEW_MAX_LINES = 5000
+
+# Milliseconds between two batches of log lines added to a log view
+LOG_FLUSH_MS = 100
+
+# Colors telling apart the containers in a merged log view
+LOG_SOURCE_COLORS = ['#1f77b4', '#d62728', '#2ca02c', '#9467bd', '#ff7f0e', '#17becf', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22']
+
+def sync_list_store(store, rows, key_column=0):
+    """
+    Update a Gtk.ListStore in place so it holds exactly the given rows.
+
+    Rows are matched by the value in key_column (container ID, volume name,
+    image ID, ...). Rows whose values changed are updated with set_row(),
+    rows that vanished are removed and new rows are appended. Unchanged rows
+    are left alone, so their selection is kept and the view is not relaid out.
+
+    Args:
+        store: Gtk.ListStore to update
+        rows: List of row value lists
+        key_column: Index of the column that identifies a row
+
+    Returns:
+        tuple: (added, updated, removed) row counts
+    """
+    wanted = {row[key_column]: row for row in rows}
+    seen = set()
+    added = updated = removed = 0
+
+    tree_iter = store.get_iter_first()
+    while tree_iter is not None:
+        key = store.get_value(tree_iter, key_column)
+        row = wanted.get(key)
+        if row is None or key in seen:
+            # remove() moves the iter to the next row, or invalidates it at the end
+            if not store.remove(tree_iter):
+                tree_iter = None
+            removed += 1
+            continue
+
+        seen.add(key)
+        if list(store[tree_iter]) != list(row):
+            store.set_row(tree_iter, row)
+            updated += 1
+        tree_iter = store.iter_next(tree_iter)
+
+    for row in rows:
+        if row[key_column] not in seen:
+            store.append(row)
+            seen.add(row[key_column])
+            added += 1
+
+    return added, updated, removed
+
+def index_list_store(store, key_column=0):
+    """
+    Map each row's key to a Gtk.TreeRowReference, for update_list_store_row().
+
+    Row references follow their row when other rows are added or removed,
+    so the index stays valid until the store is re-synced.
+    """
+    return {row[key_column]: Gtk.TreeRowReference.new(store, row.path) for row in store}
+
+def update_list_store_row(store, index, key, row):
+    """
+    Add, update or (with row None) remove the single row with the given key.
+
+    The row is found through the index from index_list_store(), without
+    scanning the store, and the index is kept up to date.
+
+    Returns:
+        bool: True if the store changed
+    """
+    ref = index.get(key)
+    tree_iter = store.get_iter(ref.get_path()) if ref is not None and ref.valid() else None
+
+    if row is None:
+        index.pop(key, None)
+        if tree_iter is None:
+            return False
+        store.remove(tree_iter)
+        return True
+
+    if tree_iter is None:
+        tree_iter = store.append(row)
+        index[key] = Gtk.TreeRowReference.new(store, store.get_path(tree_iter))
+        return True
+
+    if list(store[tree_iter]) != list(row):
+        store.set_row(tree_iter, row)
+        return True
+    return False
+
+class RefreshWorker:
+    """
+    Background thread that fetches Docker inventory off the GTK main loop.
+
+    Refresh requests are coalesced: asking for a refresh while one is already
+    running schedules exactly one more. Results are handed back on the main
+    loop through GLib.idle_add as on_result(result, error).
+    """
+
+    def __init__(self, fetch_func, on_result):
+        self.fetch_func = fetch_func
+        self.on_result = on_result
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request_refresh(self):
+        """Ask for a refresh; returns immediately"""
+        self._wakeup.set()
+
+    def stop(self):
+        """Stop the worker thread after the current fetch"""
+        self._stopped = True
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped:
+                return
+
+            result, error = None, None
+            try:
+                result = self.fetch_func()
+            except Exception as e:
+                error = e
+
+            if self._stopped:
+                return
+            GLib.idle_add(self._deliver, result, error)
+
+    def _deliver(self, result, error):
+        self.on_result(result, error)
+        return False
+
+class EventWatcher:
+    """
+    Background thread following the Docker events stream.
+
+    Each event is turned into an update for the single affected resource
+    (fetched on this thread) and handed to the GTK main loop as
+    on_update(client, update). If the stream drops, which happens regularly
+    over SSH, it reconnects with exponential backoff and calls
+    on_connected(client) once it is back so the caller can resync.
+    """
+
+    def __init__(self, get_client, on_update, on_connected, max_backoff=60):
+        self.get_client = get_client
+        self.on_update = on_update
+        self.on_connected = on_connected
+        self.max_backoff = max_backoff
+        self.connected = False
+        self._stream = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def restart(self):
+        """Drop the current stream, e.g. after switching Docker hosts"""
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def stop(self):
+        """Stop following events"""
+        self._stopped.set()
+        self.restart()
+
+    def _run(self):
+        import logging
+        backoff = 1
+        first_connect = True
+
+        while not self._stopped.is_set():
+            client = self.get_client()
+            try:
+                self._stream = client.events(decode=True)
+                self.connected = True
+                backoff = 1
+                if not first_connect:
+                    # Events may have been missed while disconnected
+                    GLib.idle_add(self._deliver, self.on_connected, client)
+                first_connect = False
+
+                for event in self._stream:
+                    if self._stopped.is_set():
+                        break
+                    try:
+                        update = core.fetch_event_update(client, event)
+                    except Exception as e:
+                        logging.warning(f"Could not apply Docker event {event.get('Type')}/{event.get('Action')}: {e}")
+                        continue
+                    if update is not None:
+                        GLib.idle_add(self._deliver, self.on_update, client, update)
+            except Exception as e:
+                if not self._stopped.is_set():
+                    logging.warning(f"Docker event stream dropped: {e}")
+            finally:
+                self.connected = False
+                self._stream = None
+
+            if client is not self.get_client():
+                # Host was switched, reconnect right away
+                first_connect = True
+                continue
+
+            # Wait before reconnecting, waking up early if stopped
+            if self._stopped.wait(backoff):
+                return
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _deliver(self, callback, *args):
+        callback(*args)
+        return False
+
+class LogPump:
+    """
+    Moves log lines from a blocking stream on a worker thread to the GTK
+    main loop in batches.
+
+    open_stream() is called on the worker thread and must return an iterable
+    with a close() method (e.g. core.LogStream). Every LOG_FLUSH_MS the lines
+    read so far are handed to on_lines(lines) in one call. The queue is
+    bounded like the view itself, so if a chatty container outruns the UI
+    the oldest queued lines are dropped instead of piling up.
+    on_finished(error) is called once the stream ends by itself.
+    """
+
+    def __init__(self, open_stream, on_lines, on_finished=None, max_lines=LOG_VIEW_MAX_LINES):
+        self.open_stream = open_stream
+        self.on_lines = on_lines
+        self.on_finished = on_finished
+        self._pending = collections.deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._stream = None
+        self._stopped = False
+        self._done = False
+        self._error = None
+        self.finished = False
+        threading.Thread(target=self._run, daemon=True).start()
+        GLib.timeout_add(LOG_FLUSH_MS, self._flush)
+
+    def stop(self):
+        """Stop reading and close the stream"""
+        self._stopped = True
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _run(self):
+        try:
+            self._stream = self.open_stream()
+            if self._stopped:
+                self._stream.close()
+                return
+            for line in self._stream:
+                if self._stopped:
+                    break
+                with self._lock:
+                    self._pending.append(line)
+        except Exception as e:
+            if not self._stopped:
+                self._error = e
+        finally:
+            self._done = True
+
+    def _flush(self):
+        # Read the flag first so no line appended before the end is missed
+        done = self._done
+        with self._lock:
+            lines = list(self._pending)
+            self._pending.clear()
+
+        if self._stopped:
+            return False
+        if lines:
+            self.on_lines(lines)
+        if done:
+            self.finished = True
+            if self.on_finished:
+                self.on_finished(self._error)
+            return False
+        return True
+
+def append_log_lines(textview, lines, max_lines=LOG_VIEW_MAX_LINES):
+    """
+    Append lines to a log view, keeping at most max_lines lines.
+
+    Lines are plain strings or (text, tag_name) pairs. The view only
+    scrolls along if it was already showing the end.
+    """
+    buffer = textview.get_buffer()
+    adjustment = textview.get_vadjustment()
+    at_bottom = adjustment.get_value() >= adjustment.get_upper() - adjustment.get_page_size() - 1
+
+    end = buffer.get_end_iter()
+    for line in lines:
+        if isinstance(line, tuple):
+            buffer.insert_with_tags_by_name(end, line[0] + "\n", line[1])
+        else:
+            buffer.insert(end, line + "\n")
+
+    # Drop the oldest lines, the buffer always ends with an empty line
+    excess = buffer.get_line_count() - 1 - max_lines
+    if excess > 0:
+        buffer.delete(buffer.get_start_iter(), buffer.get_iter_at_line(excess))
+
+    if at_bottom:
+        mark = buffer.get_mark('log-end') or buffer.create_mark('log-end', buffer.get_end_iter(), False)
+        buffer.move_mark(mark, buffer.get_end_iter())
+        textview.scroll_to_mark(mark, 0.0, False, 0.0, 0.0)
+
 class DockerManagerWindow(Gtk.Window):
     def __init__(self, docker_host=None):
         Gtk.Window.__init__(self, title="Docker Container Manager")
@@ -26,6 +360,26 @@ class DockerManagerWindow(Gtk.Window):
         except ConnectionError as e:
             self.show_error_dialog(str(e))
             return
+        # Worker threads hold on to the active client, keep it from being evicted
+        core.get_client_registry().pin(self.client)
+
+        # Text currently shown on each image pull's progress line
+        self.progress_lines = {}
+
+        # Docker resources are fetched on a background thread
+        self.inventory = core.InventorySnapshot([], [], [], [])
+        # Row references per resource store, for per-row event updates
+        self.row_index = {}
+        # Bumped for every applied event; events a full refresh may have missed are replayed onto it
+        self.inventory_generation = 0
+        self.inventory_events = collections.deque(maxlen=INVENTORY_REPLAY_EVENTS)
+        self.refresh_worker = RefreshWorker(self.fetch_inventory, self.on_inventory_fetched)
+        self.connect("destroy", lambda window: self.refresh_worker.stop())
+        GLib.timeout_add_seconds(AUTO_REFRESH_SECONDS, self.on_auto_refresh)
+
+        # Live updates from the Docker events stream
+        self.event_watcher = EventWatcher(lambda: self.client, self.on_docker_event, self.on_events_reconnected)
+        self.connect("destroy", lambda window: self.event_watcher.stop())
 
         # Main vertical box
         main_vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
@@ -442,6 +796,12 @@ class DockerManagerWindow(Gtk.Window):
         header_label.set_margin_start(12)
         header_box.pack_start(header_label, True, True, 0)
 
+        # Last refresh time
+        self.last_updated_label = Gtk.Label()
+        self.last_updated_label.set_markup('<span size="small" color="#6b7280">Not loaded yet</span>')
+        self.last_updated_label.set_margin_end(12)
+        header_box.pack_start(self.last_updated_label, False, False, 0)
+
         # Add count badge
         self.container_count_label = Gtk.Label()
         self.container_count_label.set_markup('<span size="small">0 running</span>')
@@ -497,6 +857,8 @@ class DockerManagerWindow(Gtk.Window):
         self.running_container_filter.set_visible_func(self.container_filter_func, None)
 
         self.container_treeview = Gtk.TreeView(model=self.running_container_filter)
+        # Several containers can be selected for a merged log view
+        self.container_treeview.get_selection().set_mode(Gtk.SelectionMode.MULTIPLE)
         self.container_treeview.connect("row-activated", self.on_container_activated)
         self.container_treeview.connect("button-press-event", self.on_container_button_press)
         self.container_treeview.set_has_tooltip(True)
@@ -870,6 +1232,30 @@ class DockerManagerWindow(Gtk.Window):
         export_button.connect("clicked", self.on_export_stack_clicked)
         button_box.pack_start(export_button, False, False, 0)
 
+        logs_button = Gtk.Button()
+        logs_button.get_style_context().add_class('command-button')
+        logs_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        logs_box.pack_start(Gtk.Image.new_from_icon_name("utilities-terminal-symbolic", Gtk.IconSize.BUTTON), False, False, 0)
+        logs_box.pack_start(Gtk.Label(label="Stack Logs"), False, False, 0)
+        logs_button.add(logs_box)
+        logs_button.connect("clicked", self.on_stack_logs_clicked)
+        button_box.pack_start(logs_button, False, False, 0)
+
+        # Lifecycle buttons act on the whole stack in depends_on order
+        for label, icon_name, action in [
+            ("Start Stack", "media-playback-start-symbolic", 'start'),
+            ("Stop Stack", "media-playback-stop-symbolic", 'stop'),
+            ("Restart Stack", "view-refresh-symbolic", 'restart'),
+        ]:
+            stack_button = Gtk.Button()
+            stack_button.get_style_context().add_class('command-button')
+            stack_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+            stack_box.pack_start(Gtk.Image.new_from_icon_name(icon_name, Gtk.IconSize.BUTTON), False, False, 0)
+            stack_box.pack_start(Gtk.Label(label=label), False, False, 0)
+            stack_button.add(stack_box)
+            stack_button.connect("clicked", self.on_stack_lifecycle_clicked, action)
+            button_box.pack_start(stack_button, False, False, 0)
+
         vbox.pack_start(button_box, False, False, 0)
         return vbox
 
@@ -1464,7 +1850,8 @@ class DockerManagerWindow(Gtk.Window):
     def update_service_list(self):
         for child in self.service_listbox.get_children():
             self.service_listbox.remove(child)
-        available_services = core.get_available_services()
+        # Only names and descriptions are shown, so the summary records are enough
+        available_services = core.get_service_summaries()
         for service in sorted(available_services, key=lambda s: s['name']):
             row = Gtk.ListBoxRow()
             row.set_margin_top(0)
@@ -1507,9 +1894,7 @@ class DockerManagerWindow(Gtk.Window):
         self.service_listbox.show_all()
 
     def update_running_container_view(self):
-        # Update containers
-        self.running_container_store.clear()
-
+        """Request a background refresh of the Docker resource tabs"""
         # Log the current connection for debugging
         try:
             import logging
@@ -1518,199 +1903,307 @@ class DockerManagerWindow(Gtk.Window):
         except Exception as e:
             pass
 
-        def fetch_containers():
-            return core.get_running_container_details(self.client)
+        self.last_updated_label.set_markup('<span size="small" color="#6b7280">Refreshing...</span>')
+        self.refresh_worker.request_refresh()
 
-        # For remote connections, show progress
-        if self.docker_host:
-            status_messages = [
-                f"Connecting to {self.docker_host}...",
-                "Fetching container list...",
-                "Loading container details..."
-            ]
-            running_containers = self.run_with_progress(
-                "Refreshing Containers",
-                fetch_containers,
-                status_messages
-            )
-            if running_containers is None:
-                running_containers = []
+    def on_auto_refresh(self):
+        """Periodic background refresh, only needed while the event stream is down"""
+        if not self.event_watcher.connected:
+            self.refresh_worker.request_refresh()
+        return True
+
+    def on_docker_event(self, client, update):
+        """Apply a single-resource update from the event stream (GTK main loop)"""
+        from datetime import datetime
+
+        if client is not self.client:
+            return
+        previous = self.inventory
+        self.inventory = previous.apply_update(update)
+        self.inventory_generation += 1
+        self.inventory_events.append((self.inventory_generation, update))
+        if self.row_index:
+            self.apply_event_rows(self.inventory, update, previous)
         else:
-            running_containers = fetch_containers()
-
-        for container in running_containers:
-            self.running_container_store.append([
-                container['id'],
-                container['name'],
-                container['status'],
-                container['image'],
-                container['uptime'],
-                container['ports'],
-                container['network']
-            ])
+            self.populate_resource_views(self.inventory)
+        self.last_updated_label.set_markup(
+            f'<span size="small" color="#6b7280">Updated {datetime.now().strftime("%H:%M:%S")} (live)</span>'
+        )
 
-        # Update networks with "In Use" detection
-        self.network_store.clear()
-        try:
-            networks = self.client.networks.list()
-            for network in networks:
-                network_id = network.short_id
-                network_name = network.name
-                driver = network.attrs.get('Driver', 'N/A')
-                scope = network.attrs.get('Scope', 'N/A')
-
-                # Get subnet info
-                ipam = network.attrs.get('IPAM', {})
-                config = ipam.get('Config', [])
-                subnet = config[0].get('Subnet', 'N/A') if config else 'N/A'
+    def on_events_reconnected(self, client):
+        """Resync after the event stream came back"""
+        if client is self.client:
+            self.refresh_worker.request_refresh()
 
-                # Check if network is in use
-                containers = network.attrs.get('Containers', {})
-                in_use = len(containers) > 0
+    def fetch_inventory(self):
+        """Fetch the inventory snapshot (runs on the refresh worker thread)"""
+        client = self.client
+        generation = self.inventory_generation
+        return client, generation, core.InventorySnapshot.fetch(client)
 
-                # Determine background color
-                # System networks (bridge, host, none) should always show as white
-                if network_name in ['bridge', 'host', 'none']:
-                    bg_color = "#ffffff"  # White for system networks
-                elif not in_use:
-                    bg_color = "#fff3cd"  # Light yellow for unused
-                else:
-                    bg_color = "#ffffff"  # White for in use
+    def on_inventory_fetched(self, result, error):
+        """Apply a fetched inventory snapshot (runs on the GTK main loop)"""
+        from datetime import datetime
 
-                self.network_store.append([network_id, network_name, driver, scope, subnet, "Yes" if in_use else "No", bg_color])
-        except Exception as e:
-            print(f"Error loading networks: {e}")
+        if error is not None:
+            print(f"Error loading Docker resources: {error}")
+            self.last_updated_label.set_markup(
+                f'<span size="small" color="#dc2626">Refresh failed: {GLib.markup_escape_text(str(error))}</span>'
+            )
+            return
 
-        # Update volumes with "In Use" detection
-        self.volume_store.clear()
-        try:
-            volumes = self.client.volumes.list()
-            # Get all containers (not just running) to check volume usage
-            all_containers = self.client.containers.list(all=True)
+        client, generation, inventory = result
+        if client is not self.client:
+            # Fetched from a host we have since switched away from
+            self.refresh_worker.request_refresh()
+            return
+        # Replay events that arrived while this was fetched, so a busy host cannot starve the resync
+        missed = [update for event_generation, update in self.inventory_events if event_generation > generation]
+        if len(missed) < self.inventory_generation - generation:
+            # More events arrived than are kept for replay
+            self.refresh_worker.request_refresh()
+            return
+        for update in missed:
+            inventory = inventory.apply_update(update)
 
-            for volume in volumes:
-                volume_name = volume.name
-                driver = volume.attrs.get('Driver', 'N/A')
-                mountpoint = volume.attrs.get('Mountpoint', 'N/A')
+        self.inventory = inventory
+        self.populate_resource_views(inventory)
+        self.last_updated_label.set_markup(
+            f'<span size="small" color="#6b7280">Updated {datetime.now().strftime("%H:%M:%S")}</span>'
+        )
 
-                # Check if volume is in use by any container
-                in_use = False
-                for container in all_containers:
-                    for mount in container.attrs.get('Mounts', []):
-                        if mount.get('Type') == 'volume' and mount.get('Name') == volume_name:
-                            in_use = True
-                            break
-                    if in_use:
-                        break
+    def populate_resource_views(self, inventory):
+        """
+        Fill the resource tabs from an inventory snapshot.
+
+        The stores are diffed rather than rebuilt, so selection and scroll
+        position survive a refresh. Afterwards the row indexes used by
+        apply_event_rows() are rebuilt.
+        """
+        # Update containers
+        running_containers = inventory.container_rows()
+        container_rows = [self.container_store_row(container) for container in running_containers]
+        sync_list_store(self.running_container_store, container_rows)
 
-                # Add background color based on usage
-                bg_color = "#ffffff" if in_use else "#fff3cd"  # Light yellow for unused
+        # Update networks with "In Use" detection
+        network_rows = []
+        try:
+            for network in inventory.networks:
+                network_rows.append(self.network_store_row(network, inventory))
+        except Exception as e:
+            print(f"Error loading networks: {e}")
+        sync_list_store(self.network_store, network_rows)
 
-                self.volume_store.append([volume_name, driver, mountpoint, "Yes" if in_use else "No", bg_color])
+        # Update volumes with "In Use" detection
+        volume_rows = []
+        try:
+            for volume in inventory.volumes:
+                volume_rows.append(self.volume_store_row(volume, inventory))
         except Exception as e:
             print(f"Error loading volumes: {e}")
+        sync_list_store(self.volume_store, volume_rows)
 
         # Update images with "In Use" detection
-        self.image_store.clear()
+        image_rows = []
         try:
-            images = self.client.images.list()
-            # Get all containers to check image usage
-            all_containers = self.client.containers.list(all=True)
-            used_image_ids = set()
-            for container in all_containers:
-                image_id = container.attrs.get('Image', '')
-                if image_id:
-                    used_image_ids.add(image_id)
+            for image in inventory.images:
+                image_rows.append(self.image_store_row(image, inventory))
+        except Exception as e:
+            print(f"Error loading images: {e}")
+        sync_list_store(self.image_store, image_rows)
 
-            for image in images:
-                image_id = image.short_id
-
-                # Get repository and tag
-                if image.tags:
-                    # Use first tag
-                    tag_parts = image.tags[0].split(':')
-                    repository = tag_parts[0] if len(tag_parts) > 0 else '<none>'
-                    tag = tag_parts[1] if len(tag_parts) > 1 else 'latest'
-                else:
-                    repository = '<none>'
-                    tag = '<none>'
+        # Update stacks (Docker Compose projects)
+        stack_rows = []
+        try:
+            # Stacks are containers grouped by their com.docker.compose.project label
+            for stack_name, containers in inventory.project_index.items():
+                stack_rows.append(self.stack_store_row(stack_name, containers))
+        except Exception as e:
+            print(f"Error loading stacks: {e}")
+        sync_list_store(self.stack_store, stack_rows)
 
-                # Size in MB
-                size_mb = image.attrs.get('Size', 0) / (1024 * 1024)
-                size_str = f"{size_mb:.1f} MB"
+        self.row_index = {
+            store: index_list_store(store)
+            for store in (self.running_container_store, self.network_store, self.volume_store, self.image_store, self.stack_store)
+        }
+        self.update_count_badge()
 
-                # Created date
-                from datetime import datetime
-                created_str = image.attrs.get('Created', 'N/A')
-                if created_str != 'N/A':
-                    try:
-                        created_dt = datetime.strptime(created_str.split('.')[0], '%Y-%m-%dT%H:%M:%S')
-                        created_str = created_dt.strftime('%Y-%m-%d %H:%M')
-                    except:
-                        pass
-
-                # Check if image is in use
-                in_use = image.id in used_image_ids
-
-                # Determine background color
-                if not image.tags:  # Dangling image
-                    bg_color = "#ffe4e1"  # Light red for dangling
-                elif not in_use:
-                    bg_color = "#fff3cd"  # Light yellow for unused
-                else:
-                    bg_color = "#ffffff"  # White for in use
+    def apply_event_rows(self, inventory, update, previous):
+        """
+        Apply one event update to the resource tabs, row by row.
 
-                self.image_store.append([image_id, repository, tag, size_str, created_str, "Yes" if in_use else "No", bg_color])
-        except Exception as e:
-            print(f"Error loading images: {e}")
+        A container event touches that container's row and the rows of the
+        stack, networks, volumes and image it used before or uses now, all
+        looked up through self.row_index. Image events carry the whole image
+        list, so the image and container tabs are re-synced.
 
-        # Update stacks (Docker Compose projects)
-        self.stack_store.clear()
+        Args:
+            inventory: Snapshot with the update applied
+            update: (kind, key, item) tuple from core.fetch_event_update()
+            previous: Snapshot before the update
+        """
+        kind, key, item = update
+
+        if kind == 'images':
+            self.populate_resource_views(inventory)
+            return
+
+        if kind == 'volume':
+            row = self.volume_store_row(item, inventory) if item is not None else None
+            update_list_store_row(self.volume_store, self.row_index[self.volume_store], key, row)
+        elif kind == 'network':
+            row = self.network_store_row(item, inventory) if item is not None else None
+            update_list_store_row(self.network_store, self.row_index[self.network_store], key[:12], row)
+        elif kind == 'container':
+            row = None
+            if item is not None and item.get('State') == 'running':
+                row = self.container_store_row(inventory.container_row(item))
+            update_list_store_row(self.running_container_store, self.row_index[self.running_container_store], key[:12], row)
+
+            # Rows whose "in use" state or counts depend on this container
+            before = [c for c in previous.containers if c.get('Id') == key]
+            stacks, networks, volumes, images = set(), set(), set(), set()
+            for container in before + ([item] if item is not None else []):
+                project = (container.get('Labels') or {}).get('com.docker.compose.project')
+                if project:
+                    stacks.add(project)
+                networks.update(((container.get('NetworkSettings') or {}).get('Networks') or {}).keys())
+                volumes.update(m.get('Name') for m in container.get('Mounts') or [] if m.get('Type') == 'volume')
+                if container.get('ImageID'):
+                    images.add(container['ImageID'])
+
+            for stack_name in stacks:
+                containers = inventory.project_index.get(stack_name)
+                row = self.stack_store_row(stack_name, containers) if containers else None
+                update_list_store_row(self.stack_store, self.row_index[self.stack_store], stack_name, row)
+            for network in inventory.networks:
+                if network.get('Name') in networks:
+                    update_list_store_row(self.network_store, self.row_index[self.network_store],
+                                          network['Id'][:12], self.network_store_row(network, inventory))
+            for volume in inventory.volumes:
+                if volume['Name'] in volumes:
+                    update_list_store_row(self.volume_store, self.row_index[self.volume_store],
+                                          volume['Name'], self.volume_store_row(volume, inventory))
+            for image in inventory.images:
+                if image['Id'] in images:
+                    update_list_store_row(self.image_store, self.row_index[self.image_store],
+                                          core._short_image_id(image['Id']), self.image_store_row(image, inventory))
+
+        self.update_count_badge()
+
+    def container_store_row(self, container):
+        """Containers tab row from a core container row"""
+        return [
+            container['id'],
+            container['name'],
+            container['status'],
+            container['image'],
+            container['uptime'],
+            container['ports'],
+            container['network']
+        ]
+
+    def network_store_row(self, network, inventory):
+        """Networks tab row from a /networks entry"""
+        network_id = network['Id'][:12]
+        network_name = network.get('Name', '')
+        driver = network.get('Driver', 'N/A')
+        scope = network.get('Scope', 'N/A')
+
+        # Get subnet info
+        ipam = network.get('IPAM') or {}
+        config = ipam.get('Config') or []
+        subnet = config[0].get('Subnet', 'N/A') if config else 'N/A'
+
+        # Check if network is in use
+        in_use = inventory.network_in_use(network_name)
+
+        # Determine background color
+        # System networks (bridge, host, none) should always show as white
+        if network_name in ['bridge', 'host', 'none']:
+            bg_color = "#ffffff"  # White for system networks
+        elif not in_use:
+            bg_color = "#fff3cd"  # Light yellow for unused
+        else:
+            bg_color = "#ffffff"  # White for in use
+
+        return [network_id, network_name, driver, scope, subnet, "Yes" if in_use else "No", bg_color]
+
+    def volume_store_row(self, volume, inventory):
+        """Volumes tab row from a /volumes entry"""
+        volume_name = volume['Name']
+        driver = volume.get('Driver', 'N/A')
+        mountpoint = volume.get('Mountpoint', 'N/A')
+
+        # Check if volume is in use by any container
+        in_use = inventory.volume_in_use(volume_name)
+
+        # Add background color based on usage
+        bg_color = "#ffffff" if in_use else "#fff3cd"  # Light yellow for unused
+
+        return [volume_name, driver, mountpoint, "Yes" if in_use else "No", bg_color]
+
+    def image_store_row(self, image, inventory):
+        """Images tab row from a /images/json entry"""
+        from datetime import datetime
+
+        image_id = core._short_image_id(image['Id'])
+        tags = [t for t in (image.get('RepoTags') or []) if t != '<none>:<none>']
+
+        # Get repository and tag
+        if tags:
+            # Use first tag
+            repository, _, tag = tags[0].rpartition(':')
+        else:
+            repository = '<none>'
+            tag = '<none>'
+
+        # Size in MB
+        size_mb = image.get('Size', 0) / (1024 * 1024)
+        size_str = f"{size_mb:.1f} MB"
+
+        # Created date (unix timestamp from the list endpoint)
+        created = image.get('Created')
         try:
-            import os
-            import subprocess
-            # Try to detect docker compose projects
-            # This is a simplified implementation - looks for containers with com.docker.compose.project label
-            all_containers = self.client.containers.list(all=True)
-            stacks_dict = {}
-
-            for container in all_containers:
-                labels = container.attrs.get('Config', {}).get('Labels', {})
-                project_name = labels.get('com.docker.compose.project')
-                config_file = labels.get('com.docker.compose.project.config_files')
-
-                if project_name:
-                    if project_name not in stacks_dict:
-                        stacks_dict[project_name] = {
-                            'containers': [],
-                            'config_path': config_file or 'N/A'
-                        }
-                    stacks_dict[project_name]['containers'].append(container)
-
-            for stack_name, stack_info in stacks_dict.items():
-                containers = stack_info['containers']
-                running_count = sum(1 for c in containers if c.status == 'running')
-                total_count = len(containers)
-
-                if running_count == total_count:
-                    status = "Running"
-                elif running_count > 0:
-                    status = f"Partial ({running_count}/{total_count})"
-                else:
-                    status = "Stopped"
+            created_str = datetime.fromtimestamp(int(created)).strftime('%Y-%m-%d %H:%M')
+        except (TypeError, ValueError, OSError):
+            created_str = 'N/A'
+
+        # Check if image is in use
+        in_use = inventory.image_in_use(image['Id'])
+
+        # Determine background color
+        if not tags:  # Dangling image
+            bg_color = "#ffe4e1"  # Light red for dangling
+        elif not in_use:
+            bg_color = "#fff3cd"  # Light yellow for unused
+        else:
+            bg_color = "#ffffff"  # White for in use
 
-                services_count = str(total_count)
-                config_path = stack_info['config_path']
+        return [image_id, repository, tag, size_str, created_str, "Yes" if in_use else "No", bg_color]
 
-                self.stack_store.append([stack_name, status, services_count, config_path])
+    def stack_store_row(self, stack_name, containers):
+        """Stacks tab row from a compose project's containers"""
+        labels = containers[0].get('Labels') or {}
+        config_path = labels.get('com.docker.compose.project.config_files') or 'N/A'
 
-        except Exception as e:
-            print(f"Error loading stacks: {e}")
+        running_count = sum(1 for c in containers if c.get('State') == 'running')
+        total_count = len(containers)
+
+        if running_count == total_count:
+            status = "Running"
+        elif running_count > 0:
+            status = f"Partial ({running_count}/{total_count})"
+        else:
+            status = "Stopped"
 
-        # Update count badge based on current tab
+        return [stack_name, status, str(total_count), config_path]
+
+    def update_count_badge(self):
+        """Update count badge based on current tab"""
         current_page = self.resource_notebook.get_current_page()
         if current_page == 0:  # Containers
-            count = len(running_containers)
+            count = len(self.running_container_store)
             self.container_count_label.set_markup(f'<span size="small">{count} running</span>')
         elif current_page == 1:  # Networks
             count = len(self.network_store)
@@ -1761,16 +2254,86 @@ class DockerManagerWindow(Gtk.Window):
 
     def install_services_batch(self, service_names):
         """Install multiple services one at a time"""
+        # Pull every image while the user fills in the install dialogs
+        self.prefetch_service_images(service_names)
+
         for i, service_name in enumerate(service_names):
             result = self.show_install_dialog(service_name, i + 1, len(service_names))
             if result == "cancelled":
                 self.textbuffer.set_text(f"Installation cancelled at service {i+1}/{len(service_names)}: {service_name}")
                 break
 
+    def prefetch_service_images(self, service_names):
+        """Pull the images of the given services concurrently in the background"""
+        images = []
+        for service_name in service_names:
+            try:
+                image = core.load_service_config(service_name).get('image')
+            except (FileNotFoundError, yaml.YAMLError):
+                continue
+            if image and core.normalize_image_reference(image) not in images:
+                images.append(core.normalize_image_reference(image))
+
+        if not images:
+            return
+
+        client = self.client
+
+        def append_line(line):
+            self.textbuffer.insert(self.textbuffer.get_end_iter(), line + "\n")
+            return False
+
+        def show_progress(progress):
+            GLib.idle_add(self.show_progress_line, f"pull:{progress.image}", progress.format(), progress.finished is not None)
+
+        def run_pulls():
+            GLib.idle_add(append_line, f"Pre-pulling {len(images)} image(s)...")
+            with core.ImagePuller(client, progress=show_progress) as puller:
+                pulls = {puller.pull(image): image for image in images}
+                for future in concurrent.futures.as_completed(pulls):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        GLib.idle_add(append_line, f"✗ Could not pull {pulls[future]}: {e}")
+
+        threading.Thread(target=run_pulls, daemon=True).start()
+
+    def show_progress_line(self, key, text, finished=False):
+        """Show a task's progress on one output line that is rewritten in place"""
+        buffer = self.textbuffer
+        mark = buffer.get_mark(key)
+
+        # The line may have been replaced by other output in the meantime
+        if mark is not None:
+            start = buffer.get_iter_at_mark(mark)
+            line_end = start.copy()
+            if not line_end.ends_line():
+                line_end.forward_to_line_end()
+            if buffer.get_text(start, line_end, True) != self.progress_lines.get(key):
+                buffer.delete_mark(mark)
+                mark = None
+
+        if mark is None:
+            end = buffer.get_end_iter()
+            if end.get_line_offset() != 0:
+                buffer.insert(end, "\n")
+                end = buffer.get_end_iter()
+            # Left gravity keeps the mark at the start of the line across rewrites
+            mark = buffer.create_mark(key, end, True)
+            buffer.insert(end, text + "\n")
+        else:
+            buffer.delete(start, line_end)
+            buffer.insert(buffer.get_iter_at_mark(mark), text)
+
+        self.progress_lines[key] = text
+        if finished:
+            buffer.delete_mark(mark)
+            del self.progress_lines[key]
+        return False
+
     def show_install_dialog(self, service_name, service_index=1, total_services=1):
         try:
-            with open(f'services/{service_name}.yml', 'r') as f:
-                service_config = yaml.safe_load(f)
+            service_config = core.load_service_config(service_name)
         except (FileNotFoundError, yaml.YAMLError) as e:
             self.show_error_dialog(f"Could not load or parse service file for {service_name}: {e}")
             return "cancelled"
@@ -2165,12 +2728,8 @@ class DockerManagerWindow(Gtk.Window):
 
                     # Update output display
                     status_msg = f"{'✓' if success else '✗'} Installation of {service_name}:\n{output}\n"
-                    current_text = self.textbuffer.get_text(
-                        self.textbuffer.get_start_iter(),
-                        self.textbuffer.get_end_iter(),
-                        True
-                    )
-                    self.textbuffer.set_text(current_text + status_msg if current_text else status_msg)
+                    # Append, so pull progress lines above keep updating in place
+                    self.textbuffer.insert(self.textbuffer.get_end_iter(), status_msg)
 
                     # Refresh container list
                     self.update_running_container_view()
@@ -2378,6 +2937,45 @@ class DockerManagerWindow(Gtk.Window):
 
         content_area.pack_start(options_box, False, False, 0)
 
+        # Search bar: the daemon limits the time range, lines are filtered as they stream in
+        search_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+        search_box.set_margin_bottom(8)
+
+        search_entry = Gtk.SearchEntry()
+        search_entry.set_placeholder_text("Search logs")
+        search_entry.set_hexpand(True)
+        search_box.pack_start(search_entry, True, True, 0)
+
+        regex_check = Gtk.CheckButton(label="Regex")
+        search_box.pack_start(regex_check, False, False, 0)
+
+        case_check = Gtk.CheckButton(label="Match case")
+        search_box.pack_start(case_check, False, False, 0)
+
+        search_box.pack_start(Gtk.Label(label="Since:"), False, False, 0)
+        since_entry = Gtk.Entry()
+        since_entry.set_width_chars(16)
+        since_entry.set_placeholder_text("e.g. 2h, 2024-05-01 14:00")
+        search_box.pack_start(since_entry, False, False, 0)
+
+        search_box.pack_start(Gtk.Label(label="Until:"), False, False, 0)
+        until_entry = Gtk.Entry()
+        until_entry.set_width_chars(16)
+        until_entry.set_placeholder_text("e.g. 1h")
+        search_box.pack_start(until_entry, False, False, 0)
+
+        search_button = Gtk.Button(label="Search")
+        search_box.pack_start(search_button, False, False, 0)
+
+        clear_button = Gtk.Button(label="Clear")
+        search_box.pack_start(clear_button, False, False, 0)
+
+        content_area.pack_start(search_box, False, False, 0)
+
+        search_status_label = Gtk.Label(xalign=0)
+        search_status_label.set_margin_bottom(4)
+        content_area.pack_start(search_status_label, False, False, 0)
+
         # Logs text view
         scrolled_window = Gtk.ScrolledWindow()
         scrolled_window.set_hexpand(True)
@@ -2399,26 +2997,96 @@ class DockerManagerWindow(Gtk.Window):
         scrolled_window.add(logs_textview)
         content_area.pack_start(scrolled_window, True, True, 0)
 
-        # Function to load logs
-        def load_logs():
+        # Lines are streamed in by a worker thread; only one stream at a time
+        pump = None
+
+        def load_logs(*args):
+            nonlocal pump
+            if pump is not None:
+                pump.stop()
+            logs_textbuffer.set_text("")
+            search_status_label.set_text("")
+
+            client = self.client
+            tail_lines = tail_spin.get_value_as_int()
+            show_timestamps = timestamps_check.get_active()
+            follow = follow_check.get_active()
+
+            def on_finished(error):
+                if error is not None:
+                    append_log_lines(logs_textview, [f"Error retrieving logs: {error}"])
+
+            pump = LogPump(
+                lambda: core.LogStream(client, container_id, tail=tail_lines,
+                                       timestamps=show_timestamps, follow=follow),
+                lambda lines: append_log_lines(logs_textview, lines),
+                on_finished
+            )
+
+        def run_search(*args):
+            nonlocal pump
+            pattern = search_entry.get_text()
+            if not pattern:
+                load_logs()
+                return
+
             try:
-                container = self.client.containers.get(container_id)
-                tail_lines = tail_spin.get_value_as_int()
-                show_timestamps = timestamps_check.get_active()
+                since = core.parse_log_time(since_entry.get_text()) if since_entry.get_text().strip() else None
+                until = core.parse_log_time(until_entry.get_text()) if until_entry.get_text().strip() else None
+            except ValueError as e:
+                search_status_label.set_text(str(e))
+                return
+            if since is not None and until is not None and since > until:
+                search_status_label.set_text("The start time is later than the end time")
+                return
 
-                logs = container.logs(
-                    tail=tail_lines,
-                    timestamps=show_timestamps
-                ).decode('utf-8', errors='replace')
+            if pump is not None:
+                pump.stop()
+            logs_textbuffer.set_text("")
+            search_status_label.set_text("Searching...")
+
+            client = self.client
+            show_timestamps = timestamps_check.get_active()
+            # Following only makes sense without an end time
+            follow = follow_check.get_active() and until is None
+            # Widgets are only read here; open_search runs on the pump's thread
+            regex = regex_check.get_active()
+            ignore_case = not case_check.get_active()
+            search = None
+
+            def open_search():
+                nonlocal search
+                search = core.LogSearch(client, container_id, pattern, regex=regex,
+                                        ignore_case=ignore_case, since=since, until=until,
+                                        timestamps=show_timestamps, follow=follow)
+                return search
+
+            def update_status():
+                # Runs until this search ends or is replaced
+                if pump is not search_pump or search_pump.finished:
+                    return False
+                if search is not None:
+                    search_status_label.set_text(f"{search.matches} matches in {search.scanned} lines"
+                                                 + (" (following)" if follow else "..."))
+                return True
 
-                logs_textbuffer.set_text(logs)
+            def on_finished(error):
+                if error is not None:
+                    search_status_label.set_text(f"Search failed: {error}")
+                elif search is not None:
+                    search_status_label.set_text(f"{search.matches} matches in {search.scanned} lines")
 
-                # Scroll to bottom
-                end_iter = logs_textbuffer.get_end_iter()
-                logs_textview.scroll_to_iter(end_iter, 0.0, False, 0.0, 0.0)
+            search_pump = LogPump(open_search, lambda lines: append_log_lines(logs_textview, lines), on_finished)
+            pump = search_pump
+            GLib.timeout_add(500, update_status)
 
-            except Exception as e:
-                logs_textbuffer.set_text(f"Error retrieving logs: {str(e)}")
+        # Changing an option restarts the stream
+        follow_check.connect("toggled", load_logs)
+        timestamps_check.connect("toggled", load_logs)
+
+        search_entry.connect("activate", run_search)
+        search_button.connect("clicked", run_search)
+        clear_button.connect("clicked", lambda button: (search_entry.set_text(""), load_logs()))
 
         # Initial load
         load_logs()
@@ -2436,6 +3104,116 @@ class DockerManagerWindow(Gtk.Window):
                 # Close button or dialog closed
                 break
 
+        pump.stop()
+        dialog.destroy()
+
+    def view_merged_logs(self, containers, title):
+        """View the logs of several containers merged by timestamp in one dialog"""
+        from datetime import datetime
+
+        dialog = Gtk.Dialog(
+            title=f"Logs: {title}",
+            transient_for=self,
+            flags=0
+        )
+        dialog.add_button("Refresh", Gtk.ResponseType.APPLY)
+        dialog.add_button(Gtk.STOCK_CLOSE, Gtk.ResponseType.CLOSE)
+        dialog.set_default_size(1000, 650)
+
+        content_area = dialog.get_content_area()
+        content_area.set_margin_start(12)
+        content_area.set_margin_end(12)
+        content_area.set_margin_top(12)
+        content_area.set_margin_bottom(12)
+
+        # Options bar
+        options_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+        options_box.set_margin_bottom(8)
+
+        options_box.pack_start(Gtk.Label(label="Tail lines per container:"), False, False, 0)
+        tail_adj = Gtk.Adjustment(value=100, lower=10, upper=10000, step_incr=10)
+        tail_spin = Gtk.SpinButton.new(tail_adj, 1, 0)
+        options_box.pack_start(tail_spin, False, False, 0)
+
+        follow_check = Gtk.CheckButton(label="Follow logs (live)")
+        follow_check.set_active(True)
+        options_box.pack_start(follow_check, False, False, 8)
+
+        content_area.pack_start(options_box, False, False, 0)
+
+        logs_textview = Gtk.TextView()
+        logs_textview.set_editable(False)
+        logs_textview.set_cursor_visible(True)
+        logs_textview.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
+        logs_textview.set_left_margin(8)
+        logs_textview.set_right_margin(8)
+        logs_textview.set_top_margin(8)
+        logs_textview.set_bottom_margin(8)
+        logs_textview.override_font(Pango.FontDescription("monospace 9"))
+        logs_textbuffer = logs_textview.get_buffer()
+
+        # One color per container, shown in a legend above the logs
+        legend_box = Gtk.FlowBox()
+        legend_box.set_selection_mode(Gtk.SelectionMode.NONE)
+        legend_box.set_margin_bottom(8)
+        for i, (_, name) in enumerate(containers):
+            color = LOG_SOURCE_COLORS[i % len(LOG_SOURCE_COLORS)]
+            logs_textbuffer.create_tag(f"source:{name}", foreground=color)
+            legend_label = Gtk.Label(xalign=0)
+            legend_label.set_markup(f"<span foreground='{color}'>■</span> {GLib.markup_escape_text(name)}")
+            legend_box.add(legend_label)
+        content_area.pack_start(legend_box, False, False, 0)
+
+        scrolled_window = Gtk.ScrolledWindow()
+        scrolled_window.set_hexpand(True)
+        scrolled_window.set_vexpand(True)
+        scrolled_window.set_shadow_type(Gtk.ShadowType.ETCHED_IN)
+        scrolled_window.add(logs_textview)
+        content_area.pack_start(scrolled_window, True, True, 0)
+
+        name_width = max(len(name) for _, name in containers)
+        pump = None
+
+        def format_lines(entries):
+            return [
+                (f"{datetime.fromtimestamp(timestamp).strftime('%H:%M:%S.%f')[:-3]} {name:<{name_width}} | {message}",
+                 f"source:{name}")
+                for name, timestamp, message in entries
+            ]
+
+        def load_logs(*args):
+            nonlocal pump
+            if pump is not None:
+                pump.stop()
+            logs_textbuffer.set_text("")
+
+            client = self.client
+            tail_lines = tail_spin.get_value_as_int()
+            follow = follow_check.get_active()
+
+            def on_finished(error):
+                if error is not None:
+                    append_log_lines(logs_textview, [f"Error retrieving logs: {error}"])
+
+            pump = LogPump(
+                lambda: core.MergedLogTail(client, containers, tail=tail_lines, follow=follow),
+                lambda entries: append_log_lines(logs_textview, format_lines(entries)),
+                on_finished
+            )
+
+        follow_check.connect("toggled", load_logs)
+
+        load_logs()
+        dialog.show_all()
+
+        while True:
+            response = dialog.run()
+            if response == Gtk.ResponseType.APPLY:
+                load_logs()
+            else:
+                break
+
+        pump.stop()
         dialog.destroy()
 
     def show_container_context_menu(self, event, container_id, container_name):
@@ -2465,6 +3243,14 @@ class DockerManagerWindow(Gtk.Window):
         logs_item.connect("activate", self.on_context_view_logs, container_id, container_name)
         menu.append(logs_item)
 
+        # Merged logs of every selected container
+        model, paths = self.container_treeview.get_selection().get_selected_rows()
+        selected = [(model[path][0], model[path][1]) for path in paths]
+        if len(selected) > 1 and (container_id, container_name) in selected:
+            merged_item = Gtk.MenuItem(label=f"📋 View Merged Logs of {len(selected)} Containers")
+            merged_item.connect("activate", lambda item: self.view_merged_logs(selected, "Selected containers"))
+            menu.append(merged_item)
+
         # Backup menu item
         backup_item = Gtk.MenuItem(label="💾 Backup Container")
         backup_item.connect("activate", self.on_context_backup, container_id, container_name)
@@ -2688,6 +3474,46 @@ class DockerManagerWindow(Gtk.Window):
         compress_check.set_active(True)
         content_area.pack_start(compress_check, False, False, 2)
 
+        # Compression format and level
+        compression_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        compression_box.set_margin_start(24)
+        compression_box.pack_start(Gtk.Label(label="Format:"), False, False, 0)
+        format_combo = Gtk.ComboBoxText()
+        for fmt in compression.available_formats():
+            if fmt != 'none':
+                format_combo.append(fmt, fmt)
+        format_combo.set_active_id('gzip')
+        compression_box.pack_start(format_combo, False, False, 0)
+
+        compression_box.pack_start(Gtk.Label(label="Level:"), False, False, 6)
+        level_spin = Gtk.SpinButton.new_with_range(*compression.LEVEL_RANGES['gzip'], 1)
+        level_spin.set_value(compression.DEFAULT_LEVELS['gzip'])
+        compression_box.pack_start(level_spin, False, False, 0)
+
+        # Parallel compression, the label shows which compressor will be used
+        compression_box.pack_start(Gtk.Label(label="Threads:"), False, False, 6)
+        threads_spin = Gtk.SpinButton.new_with_range(1, compression.DEFAULT_THREADS, 1)
+        threads_spin.set_value(compression.DEFAULT_THREADS)
+        compression_box.pack_start(threads_spin, False, False, 0)
+        backend_label = Gtk.Label()
+        compression_box.pack_start(backend_label, False, False, 6)
+        content_area.pack_start(compression_box, False, False, 2)
+
+        def update_backend_label(*args):
+            backend = compression.compression_backend(format_combo.get_active_id(), threads_spin.get_value_as_int())
+            backend_label.set_markup(f"<small>({backend})</small>")
+
+        def on_format_changed(combo):
+            fmt = combo.get_active_id()
+            level_spin.set_range(*compression.LEVEL_RANGES[fmt])
+            level_spin.set_value(compression.DEFAULT_LEVELS[fmt])
+            update_backend_label()
+
+        format_combo.connect("changed", on_format_changed)
+        threads_spin.connect("value-changed", update_backend_label)
+        update_backend_label()
+        compress_check.connect("toggled", lambda check: compression_box.set_sensitive(check.get_active()))
+
         save_config_check = Gtk.CheckButton(label="Save container recreation script")
         save_config_check.set_active(True)
         content_area.pack_start(save_config_check, False, False, 2)
@@ -2708,6 +3534,9 @@ class DockerManagerWindow(Gtk.Window):
             options = {
                 "pause": pause_check.get_active(),
                 "compress": compress_check.get_active(),
+                "format": format_combo.get_active_id() if compress_check.get_active() else 'none',
+                "level": level_spin.get_value_as_int(),
+                "threads": threads_spin.get_value_as_int(),
                 "save_config": save_config_check.get_active()
             }
 
@@ -2758,135 +3587,129 @@ class DockerManagerWindow(Gtk.Window):
         dialog.destroy()
 
     def execute_backup(self, container_id, container_name, backup_type, backup_location, options):
-        """Execute the container backup based on selected type"""
-        import os
-        import subprocess
-        import tarfile
+        """Execute the container backup based on selected type, in a background thread"""
         from datetime import datetime
 
-        try:
-            container = self.client.containers.get(container_id)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        client = self.client
+        fmt = options.get("format", "gzip" if options["compress"] else "none")
+        level = options.get("level")
+        threads = options.get("threads", 1)
+        suffix = compression.COMPRESSION_SUFFIXES[fmt]
 
-            # Create backup directory
-            os.makedirs(backup_location, exist_ok=True)
+        def append_line(line):
+            self.textbuffer.insert(self.textbuffer.get_end_iter(), line + "\n")
+            return False
 
-            output_messages = []
+        def report(line):
+            GLib.idle_add(append_line, line)
 
-            # Pause container if requested
-            was_paused = False
-            if options["pause"] and container.status == "running":
-                container.pause()
-                was_paused = True
-                output_messages.append("⏸ Container paused for backup")
+        def transfer(backup, path, label, *args):
+            # Streams go straight into the compressor, progress is one rewritten line
+            key = f"backup:{path}"
 
+            reported = False
+
+            def show_progress(stats):
+                nonlocal reported
+                reported = True
+                GLib.idle_add(self.show_progress_line, key, f"  {label}: {compression.format_transfer(stats)}")
+
+            try:
+                stats = backup(client, container_id, *args, path, fmt, level, show_progress, threads)
+            except Exception:
+                # Close the progress line; the caller reports the error
+                if reported:
+                    GLib.idle_add(self.show_progress_line, key, f"✗ {label}: interrupted", True)
+                raise
+            GLib.idle_add(self.show_progress_line, key, f"✓ {label}: {compression.format_transfer(stats)}", True)
+
+        def run_backup():
             try:
-                if backup_type == "commit":
-                    # Commit to image
-                    image_name = f"{container_name}-backup"
-                    image = container.commit(repository=image_name, tag=timestamp)
-                    output_messages.append(f"✓ Committed to image: {image_name}:{timestamp}")
-                    output_messages.append(f"  Image ID: {image.short_id}")
-
-                elif backup_type == "export":
-                    # Export container to TAR
-                    export_file = os.path.join(backup_location, f"{container_name}_{timestamp}.tar")
-                    if options["compress"]:
-                        export_file += ".gz"
-
-                    output_messages.append(f"📦 Exporting container to {export_file}...")
-
-                    # Export container
-                    bits = container.export()
-                    with open(export_file if not options["compress"] else export_file.replace('.gz', ''), 'wb') as f:
-                        for chunk in bits:
-                            f.write(chunk)
-
-                    # Compress if requested
-                    if options["compress"]:
-                        import gzip
-                        import shutil
-                        with open(export_file.replace('.gz', ''), 'rb') as f_in:
-                            with gzip.open(export_file, 'wb') as f_out:
-                                shutil.copyfileobj(f_in, f_out)
-                        os.remove(export_file.replace('.gz', ''))
-
-                    output_messages.append(f"✓ Container exported successfully")
-
-                elif backup_type == "full":
-                    # Full backup: export + volumes + config
-                    backup_dir = os.path.join(backup_location, f"{container_name}_{timestamp}")
-                    os.makedirs(backup_dir, exist_ok=True)
-
-                    # 1. Export container
-                    export_file = os.path.join(backup_dir, "container.tar")
-                    output_messages.append(f"📦 Exporting container...")
-                    bits = container.export()
-                    with open(export_file, 'wb') as f:
-                        for chunk in bits:
-                            f.write(chunk)
-
-                    if options["compress"]:
-                        subprocess.run(['gzip', export_file], check=True)
-                        export_file += ".gz"
-
-                    output_messages.append(f"✓ Container exported")
-
-                    # 2. Backup volumes
-                    mounts = container.attrs.get('Mounts', [])
-                    if mounts:
-                        volumes_dir = os.path.join(backup_dir, "volumes")
-                        os.makedirs(volumes_dir, exist_ok=True)
-                        output_messages.append(f"💾 Backing up {len(mounts)} volume(s)...")
-
-                        for i, mount in enumerate(mounts):
-                            mount_type = mount.get('Type', 'unknown')
-                            source = mount.get('Source', '')
-                            destination = mount.get('Destination', '')
-
-                            if mount_type in ['volume', 'bind'] and source:
-                                volume_backup = os.path.join(volumes_dir, f"volume_{i}_{os.path.basename(destination)}.tar")
-
-                                try:
-                                    # Create tar of volume data
-                                    with tarfile.open(volume_backup, 'w') as tar:
-                                        tar.add(source, arcname=os.path.basename(source))
-
-                                    if options["compress"]:
-                                        subprocess.run(['gzip', volume_backup], check=True)
-
-                                    output_messages.append(f"  ✓ Volume: {destination}")
-                                except Exception as e:
-                                    output_messages.append(f"  ✗ Failed to backup {destination}: {str(e)}")
-
-                        output_messages.append(f"✓ Volumes backed up")
-
-                    # 3. Save recreation script
-                    if options["save_config"]:
-                        config_file = os.path.join(backup_dir, "recreate.sh")
-                        self.generate_recreation_script(container, config_file)
-                        output_messages.append(f"✓ Recreation script saved: recreate.sh")
-
-                    output_messages.append(f"\n📁 Full backup location: {backup_dir}")
+                container = client.containers.get(container_id)
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            finally:
-                # Unpause container if it was paused
-                if was_paused:
-                    container.unpause()
-                    output_messages.append("▶ Container resumed")
+                # Create backup directory
+                os.makedirs(backup_location, exist_ok=True)
 
-            self.textbuffer.set_text("\n".join(output_messages))
+                # Pause container if requested
+                was_paused = False
+                if options["pause"] and container.status == "running":
+                    container.pause()
+                    was_paused = True
+                    report("⏸ Container paused for backup")
 
-        except Exception as e:
-            self.textbuffer.set_text(f"✗ Backup failed: {str(e)}")
+                try:
+                    if backup_type == "commit":
+                        # Commit to image
+                        image_name = f"{container_name}-backup"
+                        image = container.commit(repository=image_name, tag=timestamp)
+                        report(f"✓ Committed to image: {image_name}:{timestamp}")
+                        report(f"  Image ID: {image.short_id}")
+
+                    elif backup_type == "export":
+                        # Export container to a compressed TAR in one pass
+                        export_file = os.path.join(backup_location, f"{container_name}_{timestamp}.tar{suffix}")
+                        report(f"📦 Exporting container to {export_file}...")
+                        transfer(core.export_container, export_file, "Container exported")
+
+                    elif backup_type == "full":
+                        # Full backup: export + volumes + config
+                        backup_dir = os.path.join(backup_location, f"{container_name}_{timestamp}")
+                        os.makedirs(backup_dir, exist_ok=True)
+
+                        # 1. Export container
+                        report("📦 Exporting container...")
+                        transfer(core.export_container, os.path.join(backup_dir, f"container.tar{suffix}"), "Container exported")
+
+                        # 2. Backup volumes
+                        mounts = container.attrs.get('Mounts', [])
+                        if mounts:
+                            volumes_dir = os.path.join(backup_dir, "volumes")
+                            os.makedirs(volumes_dir, exist_ok=True)
+                            report(f"💾 Backing up {len(mounts)} volume(s)...")
+
+                            for i, mount in enumerate(mounts):
+                                mount_type = mount.get('Type', 'unknown')
+                                destination = mount.get('Destination', '')
+
+                                if mount_type in ['volume', 'bind'] and destination:
+                                    volume_backup = os.path.join(volumes_dir, f"volume_{i}_{os.path.basename(destination)}.tar{suffix}")
+
+                                    try:
+                                        # The Docker host tars the mount, so this also works over ssh://
+                                        transfer(core.backup_mount, volume_backup, f"Volume: {destination}", destination)
+                                    except Exception as e:
+                                        report(f"  ✗ Failed to backup {destination}: {str(e)}")
+
+                            report("✓ Volumes backed up")
+
+                        # 3. Save recreation script
+                        if options["save_config"]:
+                            config_file = os.path.join(backup_dir, "recreate.sh")
+                            self.generate_recreation_script(container, config_file)
+                            report("✓ Recreation script saved: recreate.sh")
+
+                        report(f"\n📁 Full backup location: {backup_dir}")
+
+                finally:
+                    # Unpause container if it was paused
+                    if was_paused:
+                        container.unpause()
+                        report("▶ Container resumed")
+
+            except Exception as e:
+                report(f"✗ Backup failed: {str(e)}")
+
+        self.textbuffer.set_text(f"Backing up {container_name}...\n")
+        threading.Thread(target=run_backup, daemon=True).start()
 
     def generate_recreation_script(self, container, output_file):
         """Generate a shell script to recreate the container"""
         from datetime import datetime
+        import shlex
 
-        attrs = container.attrs
-        config = attrs['Config']
-        host_config = attrs['HostConfig']
+        spec = core.get_container_spec(self.client, container)
+        options, command, extra_networks = core.spec_to_run_args(spec)
 
         script_lines = [
             "#!/bin/bash",
@@ -2895,42 +3718,17 @@ class DockerManagerWindow(Gtk.Window):
             f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             "",
             "docker run -d \\",
-            f"  --name {container.name} \\",
         ]
 
-        # Add environment variables
-        for env in config.get('Env', []):
-            if not env.startswith(('PATH=', 'HOME=')):  # Skip common defaults
-                script_lines.append(f"  -e '{env}' \\")
-
-        # Add port mappings
-        port_bindings = host_config.get('PortBindings', {})
-        for container_port, host_ports in port_bindings.items():
-            if host_ports:
-                host_port = host_ports[0]['HostPort']
-                script_lines.append(f"  -p {host_port}:{container_port} \\")
-
-        # Add volume mounts
-        for mount in attrs.get('Mounts', []):
-            source = mount.get('Source', '')
-            destination = mount.get('Destination', '')
-            if source and destination:
-                script_lines.append(f"  -v {source}:{destination} \\")
-
-        # Add network
-        networks = attrs.get('NetworkSettings', {}).get('Networks', {})
-        for network_name in networks.keys():
-            if network_name != 'bridge':
-                script_lines.append(f"  --network {network_name} \\")
-
-        # Add restart policy
-        restart_policy = host_config.get('RestartPolicy', {}).get('Name', '')
-        if restart_policy:
-            script_lines.append(f"  --restart {restart_policy} \\")
-
-        # Add image
-        image = config.get('Image', '')
-        script_lines.append(f"  {image}")
+        # One option per line, then the image and its command
+        for flag, value in options:
+            script_lines.append(f"  {flag} {shlex.quote(value)} \\" if value is not None else f"  {flag} \\")
+        script_lines.append("  " + " ".join(shlex.quote(arg) for arg in command))
+
+        # Additional networks are connected after the container exists
+        for network, aliases in extra_networks:
+            alias_args = "".join(f" --alias {shlex.quote(alias)}" for alias in aliases)
+            script_lines.append(f"docker network connect{alias_args} {shlex.quote(network)} {shlex.quote(container.name)}")
 
         # Write script
         with open(output_file, 'w') as f:
@@ -3085,17 +3883,18 @@ class DockerManagerWindow(Gtk.Window):
         # Collect unused networks
         unused_networks = []
         try:
-            networks = self.client.networks.list()
-            for network in networks:
-                network_name = network.name
+            # The shared snapshot is kept current by the event stream; the daemon
+            # still refuses to remove anything that came into use since
+            inventory = self.inventory
+            for network in inventory.networks:
+                network_name = network.get('Name', '')
                 # Skip system networks
                 if network_name in ['bridge', 'host', 'none']:
                     continue
 
                 # Check if network is in use
-                containers = network.attrs.get('Containers', {})
-                if len(containers) == 0:
-                    unused_networks.append((network.id, network_name))
+                if not inventory.network_in_use(network_name):
+                    unused_networks.append((network['Id'], network_name))
 
         except Exception as e:
             self.show_error_dialog(f"Error scanning networks: {str(e)}")
@@ -3158,24 +3957,13 @@ class DockerManagerWindow(Gtk.Window):
         # Collect unused volumes
         unused_volumes = []
         try:
-            volumes = self.client.volumes.list()
-            all_containers = self.client.containers.list(all=True)
-
-            for volume in volumes:
-                volume_name = volume.name
-
+            # The shared snapshot is kept current by the event stream; the daemon
+            # still refuses to remove anything that came into use since
+            inventory = self.inventory
+            for volume in inventory.volumes:
                 # Check if volume is in use by any container
-                in_use = False
-                for container in all_containers:
-                    for mount in container.attrs.get('Mounts', []):
-                        if mount.get('Type') == 'volume' and mount.get('Name') == volume_name:
-                            in_use = True
-                            break
-                    if in_use:
-                        break
-
-                if not in_use:
-                    unused_volumes.append(volume_name)
+                if not inventory.volume_in_use(volume['Name']):
+                    unused_volumes.append(volume['Name'])
 
         except Exception as e:
             self.show_error_dialog(f"Error scanning volumes: {str(e)}")
@@ -3239,28 +4027,23 @@ class DockerManagerWindow(Gtk.Window):
         # Collect unused images
         unused_images = []
         try:
-            images = self.client.images.list()
-            all_containers = self.client.containers.list(all=True)
-            used_image_ids = set()
-
-            for container in all_containers:
-                image_id = container.attrs.get('Image', '')
-                if image_id:
-                    used_image_ids.add(image_id)
-
-            for image in images:
+            # The shared snapshot is kept current by the event stream; the daemon
+            # still refuses to remove anything that came into use since
+            inventory = self.inventory
+            for image in inventory.images:
                 # Skip if image is in use
-                if image.id in used_image_ids:
+                if inventory.image_in_use(image['Id']):
                     continue
 
                 # Get tag info
-                if image.tags:
-                    tag_name = image.tags[0]
+                tags = [t for t in (image.get('RepoTags') or []) if t != '<none>:<none>']
+                if tags:
+                    tag_name = tags[0]
                 else:
-                    tag_name = f"<none> ({image.short_id})"
+                    tag_name = f"<none> ({core._short_image_id(image['Id'])})"
 
-                size_mb = image.attrs.get('Size', 0) / (1024 * 1024)
-                unused_images.append((image.id, tag_name, size_mb))
+                size_mb = image.get('Size', 0) / (1024 * 1024)
+                unused_images.append((image['Id'], tag_name, size_mb))
 
         except Exception as e:
             self.show_error_dialog(f"Error scanning images: {str(e)}")
@@ -3393,6 +4176,80 @@ class DockerManagerWindow(Gtk.Window):
             except Exception as e:
                 self.textbuffer.set_text(f"✗ Error pruning dangling images: {str(e)}")
 
+    def on_stack_logs_clicked(self, widget):
+        """Show the merged logs of every container in the selected stack"""
+        selection = self.stack_treeview.get_selection()
+        model, tree_iter = selection.get_selected()
+
+        if tree_iter is None:
+            self.show_error_dialog("Please select a stack to view its logs.")
+            return
+
+        stack_name = model.get_value(tree_iter, 0)
+        try:
+            containers = core.get_stack_containers(self.client, stack_name)
+        except Exception as e:
+            self.show_error_dialog(f"Error listing containers of stack '{stack_name}': {e}")
+            return
+
+        if not containers:
+            self.show_error_dialog(f"No containers found for stack '{stack_name}'.")
+            return
+
+        self.view_merged_logs([(c['Id'], core._container_name(c)) for c in containers], f"Stack {stack_name}")
+
+    def on_stack_lifecycle_clicked(self, widget, action):
+        """Start, stop or restart the selected stack in dependency order"""
+        selection = self.stack_treeview.get_selection()
+        model, tree_iter = selection.get_selected()
+
+        if tree_iter is None:
+            self.show_error_dialog(f"Please select a stack to {action}.")
+            return
+
+        stack_name = model.get_value(tree_iter, 0)
+
+        if action == 'stop':
+            dialog = Gtk.MessageDialog(
+                transient_for=self,
+                flags=0,
+                message_type=Gtk.MessageType.QUESTION,
+                buttons=Gtk.ButtonsType.YES_NO,
+                text=f"Stop all containers of stack {stack_name}?",
+            )
+            response = dialog.run()
+            dialog.destroy()
+            if response != Gtk.ResponseType.YES:
+                return
+
+        self.textbuffer.set_text(f"Running {action} for stack '{stack_name}'...\n")
+        client = self.client
+
+        def append_line(line):
+            self.textbuffer.insert(self.textbuffer.get_end_iter(), line + "\n")
+            return False
+
+        def run_lifecycle():
+            failures = 0
+            try:
+                # Each dependency level runs in parallel; results arrive as containers finish
+                for container_name, result, error in core.stack_lifecycle(client, stack_name, action):
+                    if error is not None:
+                        failures += 1
+                        GLib.idle_add(append_line, f"✗ {container_name}: {error}")
+                    else:
+                        GLib.idle_add(append_line, result)
+            except Exception as e:
+                failures += 1
+                GLib.idle_add(append_line, f"✗ Error: {e}")
+
+            summary = f"✓ Stack '{stack_name}' {action} finished" if not failures else \
+                f"✗ Stack '{stack_name}' {action} finished with {failures} error(s)"
+            GLib.idle_add(append_line, summary)
+            GLib.idle_add(self.update_running_container_view)
+
+        threading.Thread(target=run_lifecycle, daemon=True).start()
+
     def on_export_stack_clicked(self, widget):
         """Export selected stack to docker-compose.yml file"""
         # Get selected stack
@@ -3407,15 +4264,11 @@ class DockerManagerWindow(Gtk.Window):
 
         # Get all containers for this stack
         try:
-            all_containers = self.client.containers.list(all=True)
-            stack_containers = []
-
-            for container in all_containers:
-                labels = container.attrs.get('Config', {}).get('Labels', {})
-                project_name = labels.get('com.docker.compose.project')
-
-                if project_name == stack_name:
-                    stack_containers.append(container)
+            # One filtered list call, then a full inspect of the stack's own containers
+            stack_containers = [
+                self.client.containers.get(c['Id'])
+                for c in core.get_stack_containers(self.client, stack_name)
+            ]
 
             if not stack_containers:
                 self.show_error_dialog(f"No containers found for stack '{stack_name}'.")
@@ -3486,138 +4339,17 @@ class DockerManagerWindow(Gtk.Window):
         networks_defined = set()
 
         for container in containers:
-            attrs = container.attrs
-            config = attrs.get('Config', {})
-            host_config = attrs.get('HostConfig', {})
-            labels = config.get('Labels', {})
+            # Full configuration, minus values the container inherits from its image
+            spec = core.get_container_spec(self.client, container)
+            service, volumes_used, networks_used = core.spec_to_compose_service(spec)
 
             # Get service name from label or container name
+            labels = container.attrs.get('Config', {}).get('Labels') or {}
             service_name = labels.get('com.docker.compose.service', container.name)
 
-            service = {}
-
-            # Image
-            image = config.get('Image', '')
-            if image:
-                service['image'] = image
-
-            # Container name
-            service['container_name'] = container.name
-
-            # Command
-            cmd = config.get('Cmd')
-            if cmd:
-                service['command'] = cmd if isinstance(cmd, str) else ' '.join(cmd)
-
-            # Environment variables
-            env = config.get('Env', [])
-            if env:
-                env_dict = {}
-                for e in env:
-                    if '=' in e and not e.startswith(('PATH=', 'HOME=', 'HOSTNAME=')):
-                        key, value = e.split('=', 1)
-                        env_dict[key] = value
-                if env_dict:
-                    service['environment'] = env_dict
-
-            # Ports
-            port_bindings = host_config.get('PortBindings', {})
-            if port_bindings:
-                ports = []
-                for container_port, host_ports in port_bindings.items():
-                    if host_ports:
-                        host_port = host_ports[0].get('HostPort', '')
-                        host_ip = host_ports[0].get('HostIp', '')
-                        if host_ip and host_ip != '0.0.0.0':
-                            ports.append(f"{host_ip}:{host_port}:{container_port}")
-                        else:
-                            ports.append(f"{host_port}:{container_port}")
-                if ports:
-                    service['ports'] = ports
-
-            # Volumes
-            mounts = attrs.get('Mounts', [])
-            if mounts:
-                volumes = []
-                for mount in mounts:
-                    mount_type = mount.get('Type', '')
-                    source = mount.get('Source', '')
-                    destination = mount.get('Destination', '')
-                    read_only = mount.get('RW', True) == False
-
-                    if mount_type == 'volume':
-                        # Named volume
-                        volume_name = mount.get('Name', source)
-                        volumes_defined.add(volume_name)
-                        volume_str = f"{volume_name}:{destination}"
-                        if read_only:
-                            volume_str += ":ro"
-                        volumes.append(volume_str)
-                    elif mount_type == 'bind':
-                        # Bind mount
-                        volume_str = f"{source}:{destination}"
-                        if read_only:
-                            volume_str += ":ro"
-                        volumes.append(volume_str)
-
-                if volumes:
-                    service['volumes'] = volumes
-
-            # Networks
-            networks = attrs.get('NetworkSettings', {}).get('Networks', {})
-            if networks:
-                network_list = []
-                for network_name in networks.keys():
-                    if network_name != 'bridge':
-                        network_list.append(network_name)
-                        networks_defined.add(network_name)
-                if network_list:
-                    service['networks'] = network_list
-
-            # Restart policy
-            restart_policy = host_config.get('RestartPolicy', {}).get('Name', '')
-            if restart_policy and restart_policy != 'no':
-                service['restart'] = restart_policy
-
-            # Privileged
-            if host_config.get('Privileged', False):
-                service['privileged'] = True
-
-            # Cap add/drop
-            cap_add = host_config.get('CapAdd')
-            if cap_add:
-                service['cap_add'] = cap_add
-
-            cap_drop = host_config.get('CapDrop')
-            if cap_drop:
-                service['cap_drop'] = cap_drop
-
-            # Devices
-            devices = host_config.get('Devices', [])
-            if devices:
-                device_list = []
-                for device in devices:
-                    path_on_host = device.get('PathOnHost', '')
-                    path_in_container = device.get('PathInContainer', '')
-                    if path_on_host and path_in_container:
-                        device_list.append(f"{path_on_host}:{path_in_container}")
-                if device_list:
-                    service['devices'] = device_list
-
-            # Depends on
-            depends_on_label = labels.get('com.docker.compose.depends_on')
-            if depends_on_label:
-                service['depends_on'] = depends_on_label.split(',')
-
-            # Labels (keep only non-compose labels)
-            custom_labels = {}
-            for key, value in labels.items():
-                if not key.startswith('com.docker.compose'):
-                    custom_labels[key] = value
-            if custom_labels:
-                service['labels'] = custom_labels
-
             compose['services'][service_name] = service
+            volumes_defined.update(volumes_used)
+            networks_defined.update(networks_used)
 
         # Add volumes section
         if volumes_defined:
@@ -3628,7 +4360,7 @@ class DockerManagerWindow(Gtk.Window):
             compose['networks'] = {net: {} for net in networks_defined}
 
         # Convert to YAML
-        yaml_output = yaml.dump(compose, default_flow_style=False, sort_keys=False, indent=2)
+        yaml_output = yaml_io.dump(compose, default_flow_style=False, sort_keys=False, indent=2)
 
         # Add header comment
         header = f"# docker-compose.yml for stack: {stack_name}\n"
@@ -3717,7 +4449,7 @@ class DockerManagerWindow(Gtk.Window):
         service_def['restart'] = 'unless-stopped'
 
         # Convert to YAML
-        yaml_output = yaml.dump(compose, default_flow_style=False, sort_keys=False, indent=2)
+        yaml_output = yaml_io.dump(compose, default_flow_style=False, sort_keys=False, indent=2)
 
         # Add header comment
         header = f"# docker-compose.yml for {container_name}\n"
@@ -3920,17 +4652,8 @@ class DockerManagerWindow(Gtk.Window):
             file_store.clear()
 
             def do_list():
-                # Build command based on connection type
-                if self.docker_host:
-                    cmd = ['docker', '-H', self.docker_host, 'exec', container_id, 'ls', '-1Ap', path]
-                else:
-                    cmd = ['docker', 'exec', container_id, 'ls', '-1Ap', path]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-
-                if result.returncode != 0:
-                    raise Exception(f"Cannot access path: {path}\n{result.stderr}")
-
-                return result.stdout.strip().split('\n')
+                # Goes through the API client, reusing its connection to the host
+                return core.list_container_directory(self.client, container_id, path)
 
             # For remote connections, show progress
             if self.docker_host:
@@ -4152,84 +4875,65 @@ class DockerManagerWindow(Gtk.Window):
 
             dialog.destroy()
 
-            # Execute docker cp command
+            # Copy out of the container through the API client
             try:
-                # Build command based on connection type
-                if self.docker_host:
-                    cmd = ['docker', '-H', self.docker_host, 'cp', f'{container_id}:{container_path}', host_path]
-                else:
-                    cmd = ['docker', 'cp', f'{container_id}:{container_path}', host_path]
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=60
+                final_path = core.copy_from_container(self.client, container_id, container_path, host_path)
+
+                exported_name = os.path.basename(container_path.rstrip('/'))
+
+                # Check if we need to create an archive
+                archive_path = None
+                if create_archive and os.path.isdir(final_path):
+                    import tarfile
+                    import zipfile
+                    import shutil
+                    from datetime import datetime
+
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+                    if archive_format == "tar.gz":
+                        archive_path = os.path.join(host_path, f"{exported_name}_{timestamp}.tar.gz")
+                        with tarfile.open(archive_path, "w:gz") as tar:
+                            tar.add(final_path, arcname=exported_name)
+                    elif archive_format == "zip":
+                        archive_path = os.path.join(host_path, f"{exported_name}_{timestamp}.zip")
+                        shutil.make_archive(archive_path.replace('.zip', ''), 'zip', final_path)
+
+                    # Remove the original exported folder after archiving
+                    if archive_path and os.path.exists(archive_path):
+                        shutil.rmtree(final_path)
+                        final_path = archive_path
+
+                success_dialog = Gtk.MessageDialog(
+                    transient_for=self,
+                    flags=0,
+                    message_type=Gtk.MessageType.INFO,
+                    buttons=Gtk.ButtonsType.OK,
+                    text="Export Successful",
                 )
 
-                if result.returncode == 0:
-                    # Success
-                    exported_name = os.path.basename(container_path)
-                    final_path = os.path.join(host_path, exported_name)
-
-                    # Check if we need to create an archive
-                    archive_path = None
-                    if create_archive and os.path.isdir(final_path):
-                        import tarfile
-                        import zipfile
-                        import shutil
-                        from datetime import datetime
-
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-                        if archive_format == "tar.gz":
-                            archive_path = os.path.join(host_path, f"{exported_name}_{timestamp}.tar.gz")
-                            with tarfile.open(archive_path, "w:gz") as tar:
-                                tar.add(final_path, arcname=exported_name)
-                        elif archive_format == "zip":
-                            archive_path = os.path.join(host_path, f"{exported_name}_{timestamp}.zip")
-                            shutil.make_archive(archive_path.replace('.zip', ''), 'zip', final_path)
-
-                        # Remove the original exported folder after archiving
-                        if archive_path and os.path.exists(archive_path):
-                            shutil.rmtree(final_path)
-                            final_path = archive_path
-
-                    success_dialog = Gtk.MessageDialog(
-                        transient_for=self,
-                        flags=0,
-                        message_type=Gtk.MessageType.INFO,
-                        buttons=Gtk.ButtonsType.OK,
-                        text="Export Successful",
+                if archive_path:
+                    success_dialog.format_secondary_text(
+                        f"Exported from container:\n{container_path}\n\n"
+                        f"Archived to:\n{final_path}"
+                    )
+                else:
+                    success_dialog.format_secondary_text(
+                        f"Exported from container:\n{container_path}\n\n"
+                        f"To host location:\n{final_path}"
                     )
 
-                    if archive_path:
-                        success_dialog.format_secondary_text(
-                            f"Exported from container:\n{container_path}\n\n"
-                            f"Archived to:\n{final_path}"
-                        )
-                    else:
-                        success_dialog.format_secondary_text(
-                            f"Exported from container:\n{container_path}\n\n"
-                            f"To host location:\n{final_path}"
-                        )
-
-                    success_dialog.run()
-                    success_dialog.destroy()
+                success_dialog.run()
+                success_dialog.destroy()
 
-                    if archive_path:
-                        self.textbuffer.set_text(f"✓ Exported and archived {container_path} from {container_name} to {final_path}")
-                    else:
-                        self.textbuffer.set_text(f"✓ Exported {container_path} from {container_name} to {final_path}")
+                if archive_path:
+                    self.textbuffer.set_text(f"✓ Exported and archived {container_path} from {container_name} to {final_path}")
                 else:
-                    # Error
-                    error_msg = result.stderr if result.stderr else result.stdout
-                    self.show_error_dialog(f"Export failed:\n{error_msg}")
-                    self.textbuffer.set_text(f"✗ Export failed: {error_msg}")
+                    self.textbuffer.set_text(f"✓ Exported {container_path} from {container_name} to {final_path}")
 
-            except subprocess.TimeoutExpired:
-                self.show_error_dialog("Export operation timed out after 60 seconds.")
             except Exception as e:
                 self.show_error_dialog(f"Export error: {str(e)}")
+                self.textbuffer.set_text(f"✗ Export failed: {e}")
         else:
             dialog.destroy()
 
@@ -4264,6 +4968,12 @@ class DockerManagerWindow(Gtk.Window):
         manage_item.connect("activate", self.on_manage_remotes)
         menu.append(manage_item)
 
+        # Status of all saved remote hosts
+        fleet_item = Gtk.MenuItem(label="Status of All Remote Hosts...")
+        fleet_item.connect("activate", self.on_fleet_status)
+        fleet_item.set_sensitive(bool(remote_hosts))
+        menu.append(fleet_item)
+
         menu.show_all()
         menu.popup_at_widget(button, Gdk.Gravity.SOUTH, Gdk.Gravity.NORTH, None)
 
@@ -4284,6 +4994,70 @@ class DockerManagerWindow(Gtk.Window):
                 config.set_default_host(name)
                 break
 
+    def on_fleet_status(self, menu_item):
+        """Show the status of every saved remote host, filled in as each host answers"""
+        remote_hosts = config.list_remote_hosts()
+
+        dialog = Gtk.Dialog(
+            title="Status of All Remote Hosts",
+            transient_for=self,
+            flags=0
+        )
+        dialog.add_button(Gtk.STOCK_CLOSE, Gtk.ResponseType.CLOSE)
+        dialog.set_default_size(700, 400)
+
+        # Host name, connection, running/total, status, background color
+        fleet_store = Gtk.ListStore(str, str, str, str, str)
+        rows = {}
+        for name, info in remote_hosts.items():
+            rows[name] = fleet_store.append([name, info['docker_host'], "", "Checking...", "#ffffff"])
+
+        treeview = Gtk.TreeView(model=fleet_store)
+        for i, title in enumerate(["Host", "Connection", "Containers", "Status"]):
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(title, renderer, text=i, cell_background=4)
+            column.set_resizable(True)
+            treeview.append_column(column)
+
+        scrolled_window = Gtk.ScrolledWindow()
+        scrolled_window.set_hexpand(True)
+        scrolled_window.set_vexpand(True)
+        scrolled_window.set_margin_start(10)
+        scrolled_window.set_margin_end(10)
+        scrolled_window.set_margin_top(10)
+        scrolled_window.set_margin_bottom(10)
+        scrolled_window.add(treeview)
+        dialog.get_content_area().add(scrolled_window)
+
+        closed = {'value': False}
+
+        def show_result(name, status, error):
+            if closed['value']:
+                return False
+            tree_iter = rows[name]
+            if error:
+                fleet_store.set(tree_iter, [2, 3, 4], ["", f"Unreachable: {error}", "#ffe4e1"])
+            else:
+                fleet_store.set(tree_iter, [2, 3, 4], [
+                    f"{status['running']}/{status['total']} running",
+                    "OK",
+                    "#ffffff"
+                ])
+            return False
+
+        def query_hosts():
+            for name, docker_host, status, error in core.iter_fleet_status(remote_hosts):
+                if closed['value']:
+                    return
+                GLib.idle_add(show_result, name, status, error)
+
+        threading.Thread(target=query_hosts, daemon=True).start()
+
+        dialog.show_all()
+        dialog.run()
+        closed['value'] = True
+        dialog.destroy()
+
     def on_custom_connection(self, menu_item):
         """Show dialog for custom connection string"""
         dialog = Gtk.Dialog(
@@ -4619,17 +5393,10 @@ class DockerManagerWindow(Gtk.Window):
         """Reconnect to a different Docker host"""
 
         def do_reconnect():
-            # Try to connect to the new host
-            new_client = core.get_client(docker_host=docker_host)
-
-            # Close old client if it exists
-            if hasattr(self, 'client') and self.client:
-                try:
-                    self.client.close()
-                except Exception:
-                    pass
-
-            return new_client
+            # Clients are cached per host, so the old one stays open for switching back
+            client = core.get_client(docker_host=docker_host)
+            # Container count for the success message (one list call, without inspecting every container)
+            return client, len(client.api.containers(all=True))
 
         # Show progress dialog for connections
         status_messages = []
@@ -4644,18 +5411,26 @@ class DockerManagerWindow(Gtk.Window):
             status_messages = ["Connecting to local Docker daemon..."]
 
         try:
-            new_client = self.run_with_progress(
+            # Even a cached client may need a health-check ping or a reconnect,
+            # so the lookup always runs on the progress dialog's worker thread
+            result = self.run_with_progress(
                 f"Connecting to {'Remote' if docker_host else 'Local'} Docker",
                 do_reconnect,
                 status_messages
             )
 
-            if new_client is None:
+            if result is None:
                 return  # User cancelled
+            new_client, container_count = result
 
-            # Connection successful, update the client
+            # Connection successful, update the client; the previous one may be
+            # evicted once idle, but not while it is still the active client
+            registry = core.get_client_registry()
+            registry.pin(new_client)
+            registry.unpin(self.client)
             self.client = new_client
             self.docker_host = docker_host
+            self.event_watcher.restart()
 
             # Update the subtitle
             subtitle_text = f'Connected to: {docker_host}' if docker_host else 'Connected to: Local Docker'
@@ -4665,7 +5440,6 @@ class DockerManagerWindow(Gtk.Window):
             self.refresh_views()
 
             # Show success message with container count for verification
-            container_count = len(self.client.containers.list(all=True))
             current_text = self.textbuffer.get_text(
                 self.textbuffer.get_start_iter(),
                 self.textbuffer.get_end_iter(),
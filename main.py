@@ -1,7 +1,29 @@
 import argparse
+import sys
+import yaml
 import core
 import config
 
+def run_service_batch(operation, services, parallel):
+    """
+    Run a service operation for each service and print results as they complete.
+
+    Returns:
+        int: Number of services that failed
+    """
+    failures = 0
+    for service_name, result, error in core.run_batch(operation, services, parallel=parallel):
+        if error is not None:
+            failures += 1
+            print(f"Error: {service_name}: {error}")
+        else:
+            print(result)
+    return failures
+
+def print_pull_progress(progress):
+    """Print the aggregated progress of an image pull (called about once a second)."""
+    print(f"  {progress.format()}", flush=True)
+
 def main():
     parser = argparse.ArgumentParser(description='A Docker management tool with reverse proxy capabilities.')
     parser.add_argument('--gui', action='store_true', help='Launch the GTK GUI.')
@@ -9,26 +31,49 @@ def main():
                         help='Docker host to connect to (e.g., ssh://user@host, ssh://user@host:port, tcp://host:port, or a saved remote name)')
     subparsers = parser.add_subparsers(dest='action')
 
-    install_parser = subparsers.add_parser('install', help='Install services.')
+    # Shared option for commands that act on several services
+    batch_parser = argparse.ArgumentParser(add_help=False)
+    batch_parser.add_argument('--parallel', '-j', type=int, default=1, metavar='N',
+                              help='Run up to N services at the same time (default: 1).')
+
+    install_parser = subparsers.add_parser('install', help='Install services.', parents=[batch_parser])
     install_parser.add_argument('services', nargs='+', help='The services to install.')
+    install_parser.add_argument('--pull-parallel', type=int, default=core.IMAGE_PULL_PARALLEL, metavar='N',
+                                help=f'Pull up to N images at the same time (default: {core.IMAGE_PULL_PARALLEL}).')
 
-    uninstall_parser = subparsers.add_parser('uninstall', help='Uninstall services.')
+    uninstall_parser = subparsers.add_parser('uninstall', help='Uninstall services.', parents=[batch_parser])
     uninstall_parser.add_argument('services', nargs='+', help='The services to uninstall.')
 
-    start_parser = subparsers.add_parser('start', help='Start services.')
+    start_parser = subparsers.add_parser('start', help='Start services.', parents=[batch_parser])
     start_parser.add_argument('services', nargs='+', help='The services to start.')
 
-    stop_parser = subparsers.add_parser('stop', help='Stop services.')
+    stop_parser = subparsers.add_parser('stop', help='Stop services.', parents=[batch_parser])
     stop_parser.add_argument('services', nargs='+', help='The services to stop.')
 
-    restart_parser = subparsers.add_parser('restart', help='Restart services.')
+    restart_parser = subparsers.add_parser('restart', help='Restart services.', parents=[batch_parser])
     restart_parser.add_argument('services', nargs='+', help='The services to restart.')
 
     status_parser = subparsers.add_parser('status', help='Show status of services.')
     status_parser.add_argument('services', nargs='*', help='The services to show the status of.')
+    status_parser.add_argument('--all-hosts', action='store_true',
+                               help='Show status of every saved remote host, queried concurrently.')
+    status_parser.add_argument('--timeout', type=int, default=core.FLEET_HOST_TIMEOUT,
+                               help=f'Seconds to wait for each host with --all-hosts (default: {core.FLEET_HOST_TIMEOUT}).')
 
-    update_parser = subparsers.add_parser('update', help='Update services.')
-    update_parser.add_argument('services', nargs='+', help='The services to update.')
+    update_parser = subparsers.add_parser('update', help='Update services.', parents=[batch_parser])
+    update_parser.add_argument('services', nargs='*', help='The services to update.')
+    update_parser.add_argument('--all', action='store_true', help='Update every container on the host.')
+    update_parser.add_argument('--blue-green', action='store_true',
+                               help='Start the new container next to the old one and only swap once it is ready, '
+                                    'rolling back on failure. Containers that publish host ports, or have writable '
+                                    'volume or bind mounts (unless --allow-shared-mounts is given), are stopped '
+                                    'before the new one starts (stop-then-start, not zero-downtime).')
+    update_parser.add_argument('--allow-shared-mounts', action='store_true',
+                               help='With --blue-green, keep the old container running next to the new one even '
+                                    'if they share writable volume or bind mounts.')
+    update_parser.add_argument('--check-only', action='store_true',
+                               help='Only report which services have a newer image, without updating them. '
+                                    'Exits non-zero if any service could not be checked.')
 
     configure_parser = subparsers.add_parser('configure', help='Configure DuckDNS settings.')
     configure_parser.add_argument('--token', help='Your DuckDNS token.')
@@ -36,6 +81,14 @@ def main():
 
     test_parser = subparsers.add_parser('test', help='Run a test container.')
 
+    stack_parser = subparsers.add_parser('stack', help='Start, stop or restart a compose stack in dependency order.')
+    stack_parser.add_argument('--parallel', '-j', type=int, default=core.STACK_LEVEL_PARALLEL, metavar='N',
+                              help=f'Act on up to N containers of a dependency level at the same time (default: {core.STACK_LEVEL_PARALLEL}).')
+    stack_parser.add_argument('stack_action', choices=['start', 'stop', 'restart'], help='The action to run.')
+    stack_parser.add_argument('stack', help='The compose project name of the stack.')
+
+    subparsers.add_parser('rebuild-index', help='Rebuild the compiled service catalog index.')
+
     # Remote host management
     remote_parser = subparsers.add_parser('remote', help='Manage remote Docker hosts.')
     remote_subparsers = remote_parser.add_subparsers(dest='remote_action')
@@ -117,6 +170,30 @@ def main():
             remote_parser.print_help()
             return
 
+    if args.action == 'rebuild-index':
+        try:
+            count = core.rebuild_service_index()
+            print(f"Service catalog index rebuilt with {count} services: {core.CATALOG_INDEX_FILE}")
+        except FileNotFoundError as e:
+            print(f"Error rebuilding service catalog index: {e}")
+        return
+
+    if args.action == 'status' and args.all_hosts:
+        remote_hosts = config.list_remote_hosts()
+        if not remote_hosts:
+            print("No remote hosts configured.")
+            return
+        # Results are printed as each host answers
+        for name, docker_host, status, error in core.iter_fleet_status(remote_hosts, timeout=args.timeout):
+            if error:
+                print(f"\n{name} ({docker_host}): unreachable - {error}")
+                continue
+            print(f"\n{name} ({docker_host}): {status['running']}/{status['total']} running")
+            states = dict(status['containers'])
+            for service_name in args.services or sorted(states):
+                print(f"  - {service_name}: {states.get(service_name, 'not installed')}")
+        return
+
     # Resolve docker host (command line arg, saved remote name, or config default)
     docker_host = args.docker_host
     if docker_host:
@@ -138,64 +215,98 @@ def main():
         print(e)
         return
 
+    failures = 0
     if args.action == 'install':
+        # Prompt for every service first, then install them as a batch
+        to_install = {}
         for service_name in args.services:
             try:
                 # Load service configuration
                 service_config = core.load_service_config(service_name)
-
-                # Collect configuration values from user
-                config_values = {}
-                if 'variables' in service_config:
-                    print(f"\nConfiguring {service_name}:")
-                    print(f"Description: {service_config.get('description', 'No description available')}\n")
-
-                    for variable in service_config['variables']:
-                        var_name = variable['name']
-                        var_label = variable.get('label', var_name)
-                        var_description = variable.get('description', '')
-                        var_default = variable.get('default', '')
-
-                        # Prompt user for value
-                        prompt = f"  {var_label}"
-                        if var_description:
-                            prompt += f" ({var_description})"
-                        if var_default:
-                            prompt += f" [default: {var_default}]"
-                        prompt += ": "
-
-                        user_input = input(prompt).strip()
-                        config_values[var_name] = user_input if user_input else var_default
-
-                # Install the service
-                result = core.install_service(client, service_config, config_values)
-                print(result)
-
             except FileNotFoundError:
                 print(f"Error: Service configuration for '{service_name}' not found.")
-            except Exception as e:
-                print(f"Error installing {service_name}: {e}")
+                failures += 1
+                continue
+            except (yaml.YAMLError, OSError) as e:
+                # One broken definition fails only its own service
+                print(f"Error: {service_name}: could not load its configuration: {e}")
+                failures += 1
+                continue
+
+            # Collect configuration values from user
+            variables = {}
+            if 'variables' in service_config:
+                print(f"\nConfiguring {service_name}:")
+                print(f"Description: {service_config.get('description', 'No description available')}\n")
+
+                for variable in service_config['variables']:
+                    var_name = variable['name']
+                    var_label = variable.get('label', var_name)
+                    var_description = variable.get('description', '')
+                    var_default = variable.get('default', '')
+
+                    # Prompt user for value
+                    prompt = f"  {var_label}"
+                    if var_description:
+                        prompt += f" ({var_description})"
+                    if var_default:
+                        prompt += f" [default: {var_default}]"
+                    prompt += ": "
+
+                    user_input = input(prompt).strip()
+                    variables[var_name] = user_input if user_input else var_default
+
+            to_install[service_name] = (service_config, {'variables': variables})
+
+        # Images are pulled concurrently; each service starts once its image is ready
+        for service_name, result, error in core.install_services(client, to_install, parallel=args.parallel,
+                                                                 pull_parallel=args.pull_parallel,
+                                                                 progress=print_pull_progress):
+            if error is not None:
+                failures += 1
+                print(f"Error: {service_name}: {error}")
+            else:
+                print(result)
     elif args.action == 'uninstall':
-        for service_name in args.services:
-            print(core.uninstall_service(client, service_name))
+        failures += run_service_batch(lambda name: core.uninstall_service(client, name), args.services, args.parallel)
     elif args.action == 'start':
-        for service_name in args.services:
-            print(core.start_service(client, service_name))
+        failures += run_service_batch(lambda name: core.start_service(client, name), args.services, args.parallel)
     elif args.action == 'stop':
-        for service_name in args.services:
-            print(core.stop_service(client, service_name))
+        failures += run_service_batch(lambda name: core.stop_service(client, name), args.services, args.parallel)
     elif args.action == 'restart':
-        for service_name in args.services:
-            print(core.restart_service(client, service_name))
+        failures += run_service_batch(lambda name: core.restart_service(client, name), args.services, args.parallel)
     elif args.action == 'status':
         print(core.get_status(client, args.services))
     elif args.action == 'update':
-        for service_name in args.services:
-            print(core.update_service(client, service_name))
+        services = core.get_installed_services(client) if args.all else args.services
+        if not services:
+            update_parser.error('specify services to update or --all')
+        strategy = 'blue-green' if args.blue_green else 'recreate'
+
+        def update(service_name):
+            return core.update_service(client, service_name, check_only=args.check_only,
+                                       progress=print_pull_progress, strategy=strategy,
+                                       allow_shared_mounts=args.allow_shared_mounts)
+
+        failures += run_service_batch(update, services, args.parallel)
+    elif args.action == 'stack':
+        try:
+            for container_name, result, error in core.stack_lifecycle(client, args.stack, args.stack_action, parallel=args.parallel):
+                if error is not None:
+                    failures += 1
+                    print(f"Error: {container_name}: {error}")
+                else:
+                    print(result)
+        except ValueError as e:
+            print(f"Error: {e}")
+            failures += 1
     elif args.action == 'configure':
         print(core.handle_configure(args.token, args.domain))
     elif args.action == 'test':
         print(core.test_container(client))
 
+    if failures:
+        sys.exit(1)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Test script to verify streaming backup compression
+
+Uses fake export streams, so no Docker daemon is needed.
+"""
+
+import gzip
+import lzma
+import os
+import shutil
+import subprocess
+import tempfile
+
+import compression
+import core
+
+CHUNKS = [b'container filesystem ' * 4096, b'', b'\x00\x01\x02' * 1000, b'last chunk']
+DATA = b''.join(CHUNKS)
+
+def decompress(path, fmt):
+    if fmt == 'gzip':
+        return gzip.open(path).read()
+    if fmt == 'xz':
+        return lzma.open(path).read()
+    if fmt == 'zstd':
+        return subprocess.run(['zstd', '-d', '-c', path], capture_output=True, check=True).stdout
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_stream_to_file():
+    """Test that every format round-trips and reports its statistics"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in compression.available_formats():
+            if fmt == 'zstd' and not shutil.which('zstd'):
+                continue
+            path = os.path.join(tmp, 'export.tar' + compression.COMPRESSION_SUFFIXES[fmt])
+            stats = compression.stream_to_file(iter(CHUNKS), path, fmt, level=1)
+            assert decompress(path, fmt) == DATA, fmt
+            assert stats['bytes_in'] == len(DATA)
+            assert stats['bytes_out'] == os.path.getsize(path)
+            if fmt != 'none':
+                assert stats['bytes_out'] < stats['bytes_in']
+
+    print("✓ Streaming compression works correctly")
+
+def test_stream_to_file_failure():
+    """Test that a failing stream leaves no partial file behind"""
+    def failing_stream():
+        yield b'partial data'
+        raise OSError("connection lost")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'export.tar.gz')
+        try:
+            compression.stream_to_file(failing_stream(), path)
+            assert False, "stream error not raised"
+        except OSError as e:
+            assert 'connection lost' in str(e)
+        assert not os.path.exists(path)
+
+        # A failing compressor process does not mask the stream's error
+        open_compressor = compression.open_compressor
+        compression.open_compressor = lambda f, *args: compression._ProcessWriter(['sh', '-c', 'cat >/dev/null; exit 1'], f)
+        try:
+            compression.stream_to_file(failing_stream(), path)
+            assert False, "stream error not raised"
+        except OSError as e:
+            assert 'connection lost' in str(e)
+        finally:
+            compression.open_compressor = open_compressor
+        assert not os.path.exists(path)
+
+    try:
+        compression.open_compressor(None, 'bzip2')
+        assert False, "unknown format accepted"
+    except ValueError:
+        pass
+
+    print("✓ Failed streams are cleaned up")
+
+def test_parallel_compression():
+    """Test that block-parallel output decompresses to the original data"""
+    block_size = compression.PARALLEL_BLOCK_SIZE
+    compression.PARALLEL_BLOCK_SIZE = 4096
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in ('gzip', 'xz', 'zstd'):
+                if fmt not in compression.available_formats():
+                    continue
+                path = os.path.join(tmp, 'export.tar' + compression.COMPRESSION_SUFFIXES[fmt])
+                stats = compression.stream_to_file(iter(CHUNKS), path, fmt, level=1, threads=4)
+                assert decompress(path, fmt) == DATA, fmt
+                assert stats['bytes_in'] == len(DATA)
+
+            # The thread-pool fallback writes one xz stream per block, in order
+            path = os.path.join(tmp, 'pool.xz')
+            with open(path, 'wb') as f:
+                writer = compression._ParallelBlockWriter(f, lzma.compress, 3)
+                for chunk in CHUNKS:
+                    writer.write(chunk)
+                writer.close()
+            assert lzma.open(path).read() == DATA
+
+            # Empty input still gives a valid file
+            path = os.path.join(tmp, 'empty.gz')
+            compression.stream_to_file(iter([]), path, 'gzip', threads=4)
+            assert gzip.open(path).read() == b''
+    finally:
+        compression.PARALLEL_BLOCK_SIZE = block_size
+
+    assert compression.compression_backend('gzip', 1) == 'Python'
+    assert compression.compression_backend('none', 8) == 'none'
+
+    print("✓ Parallel compression works correctly")
+
+class FakeAPI:
+    def __init__(self):
+        self.exported = []
+        self.archived = []
+
+    def export(self, container):
+        self.exported.append(container)
+        return (chunk for chunk in CHUNKS)
+
+    def get_archive(self, container, path):
+        self.archived.append((container, path))
+        return (chunk for chunk in CHUNKS), {'name': os.path.basename(path)}
+
+class FakeClient:
+    def __init__(self):
+        self.api = FakeAPI()
+
+def test_export_container():
+    """Test that an export is written compressed without a temporary tar"""
+    client = FakeClient()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'web.tar.gz')
+        stats = core.export_container(client, 'web', path, 'gzip')
+        assert os.listdir(tmp) == ['web.tar.gz']
+        assert gzip.open(path).read() == DATA
+        assert stats['bytes_in'] == len(DATA)
+    assert client.api.exported == ['web']
+    assert 'in' in compression.format_transfer(stats)
+
+    print("✓ Container export works correctly")
+
+def test_backup_mount():
+    """Test that mounts are archived by the daemon, not read from the local path"""
+    client = FakeClient()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'volume_0_data.tar.xz')
+        stats = core.backup_mount(client, 'db', '/var/lib/postgresql/data', path, 'xz', threads=2)
+        assert lzma.open(path).read() == DATA
+        assert stats['bytes_in'] == len(DATA)
+    assert client.api.archived == [('db', '/var/lib/postgresql/data')]
+
+    print("✓ Mount backup works correctly")
+
+if __name__ == '__main__':
+    test_stream_to_file()
+    test_stream_to_file_failure()
+    test_parallel_compression()
+    test_export_container()
+    test_backup_mount()
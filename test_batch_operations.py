@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batch operations on several services
+
+Uses fake operations, so no Docker daemon is needed.
+"""
+
+import logging
+import time
+
+import core
+
+def test_run_batch():
+    """Test that a parallel batch overlaps operations and reports each result"""
+    def slow_stop(service_name):
+        time.sleep(0.2)
+        if service_name == 'broken':
+            raise RuntimeError("container not found")
+        return f"✓ Service '{service_name}' stopped successfully"
+
+    services = ['web', 'db', 'cache', 'broken']
+
+    start = time.monotonic()
+    results = list(core.run_batch(slow_stop, services, parallel=4))
+    elapsed = time.monotonic() - start
+
+    # Four 0.2 s operations in parallel take about one operation's time
+    assert elapsed < 0.6
+    assert sorted(name for name, _, _ in results) == sorted(services)
+
+    by_name = {name: (result, error) for name, result, error in results}
+    assert 'stopped successfully' in by_name['web'][0]
+    assert by_name['web'][1] is None
+    assert isinstance(by_name['broken'][1], RuntimeError)
+
+    # Sequential by default
+    start = time.monotonic()
+    list(core.run_batch(slow_stop, ['web', 'db'], parallel=1))
+    assert time.monotonic() - start >= 0.4
+
+    print("✓ Batch runner works correctly")
+
+def stack_container(name, service, depends_on=''):
+    labels = {'com.docker.compose.project': 'site', 'com.docker.compose.service': service}
+    if depends_on:
+        labels['com.docker.compose.depends_on'] = depends_on
+    return {'Id': name * 8, 'Names': [f"/{name}"], 'Labels': labels}
+
+def test_stack_dependency_levels():
+    """Test that containers are grouped so dependencies come first"""
+    containers = [
+        stack_container('site-web-1', 'web', 'api:service_started:false'),
+        stack_container('site-api-1', 'api', 'db:service_healthy:false,cache:service_started:false'),
+        stack_container('site-db-1', 'db'),
+        stack_container('site-cache-1', 'cache'),
+        # Dependencies outside the stack are ignored
+        stack_container('site-worker-1', 'worker', 'queue'),
+    ]
+    levels = core.stack_dependency_levels(containers)
+    names = [sorted(core._container_name(c) for c in level) for level in levels]
+    assert names == [['site-cache-1', 'site-db-1', 'site-worker-1'], ['site-api-1'], ['site-web-1']]
+
+    cycle = [stack_container('a', 'a', 'b'), stack_container('b', 'b', 'a')]
+    try:
+        core.stack_dependency_levels(cycle)
+        assert False, "cycle not detected"
+    except ValueError as e:
+        assert 'Circular' in str(e)
+
+    print("✓ Stack dependency levels work correctly")
+
+class FakeStackAPI:
+    def __init__(self, containers):
+        self._containers = containers
+
+    def containers(self, all=False, filters=None):
+        return self._containers
+
+class FakeStackClient:
+    def __init__(self, containers):
+        self.api = FakeStackAPI(containers)
+
+def test_stack_lifecycle():
+    """Test that stack start and stop follow the dependency order"""
+    client = FakeStackClient([
+        stack_container('web', 'web', 'db'),
+        stack_container('db', 'db'),
+    ])
+    calls = []
+    original_start, original_stop = core.start_service, core.stop_service
+
+    def fake_start(client, name):
+        calls.append(('start', name))
+        if name == 'db' and fail_start:
+            raise RuntimeError("port already allocated")
+        return f"✓ Service '{name}' started successfully"
+
+    def fake_stop(client, name):
+        calls.append(('stop', name))
+        return f"✓ Service '{name}' stopped successfully"
+
+    core.start_service, core.stop_service = fake_start, fake_stop
+    try:
+        fail_start = False
+        results = list(core.stack_lifecycle(client, 'site', 'restart'))
+        assert calls == [('stop', 'web'), ('stop', 'db'), ('start', 'db'), ('start', 'web')]
+        assert all(error is None for _, _, error in results)
+
+        # A failed dependency skips its dependents
+        calls.clear()
+        fail_start = True
+        results = list(core.stack_lifecycle(client, 'site', 'start'))
+        assert calls == [('start', 'db')]
+        errors = {name: error for name, _, error in results}
+        assert isinstance(errors['db'], RuntimeError)
+        assert 'Skipped' in str(errors['web'])
+    finally:
+        core.start_service, core.stop_service = original_start, original_stop
+
+    try:
+        list(core.stack_lifecycle(FakeStackClient([]), 'missing', 'start'))
+        assert False, "empty stack not reported"
+    except ValueError:
+        pass
+
+    print("✓ Stack lifecycle works correctly")
+
+class FakePullAPI:
+    """Fake low-level API with a slow streaming pull per image"""
+
+    def __init__(self, delays):
+        self.delays = delays
+        self.pulled = []
+
+    def pull(self, reference, stream=False, decode=False):
+        time.sleep(self.delays.get(reference, 0.2))
+        self.pulled.append(reference)
+        yield {'status': 'Pulling from library', 'id': 'latest'}
+        yield {'status': 'Downloading', 'id': 'layer1', 'progressDetail': {'current': 512, 'total': 1024}}
+        yield {'status': 'Pull complete', 'id': 'layer1', 'progressDetail': {}}
+
+class FakeImages:
+    def get(self, reference):
+        return reference
+
+class FakePullClient:
+    def __init__(self, delays):
+        self.api = FakePullAPI(delays)
+        self.images = FakeImages()
+
+def test_install_services():
+    """Test that images are pulled once, concurrently, and installs start when ready"""
+    client = FakePullClient({'gitlab/gitlab-ce:latest': 0.6})
+    installs = {
+        'web': ({'name': 'web', 'image': 'nginx'}, {}),
+        'proxy': ({'name': 'proxy', 'image': 'nginx:latest'}, {}),
+        'db': ({'name': 'db', 'image': 'postgres:16'}, {}),
+        'gitlab': ({'name': 'gitlab', 'image': 'gitlab/gitlab-ce:latest'}, {}),
+    }
+    finished = []
+    original_install = core.install_service
+
+    def fake_install(client, service_config, config_values, puller=None):
+        puller.wait(service_config['image'])
+        finished.append(service_config['name'])
+        return f"✓ Service '{service_config['name']}' installed successfully"
+
+    core.install_service = fake_install
+    try:
+        start = time.monotonic()
+        results = list(core.install_services(client, installs, parallel=1, pull_parallel=4))
+        elapsed = time.monotonic() - start
+    finally:
+        core.install_service = original_install
+
+    # nginx and nginx:latest are the same image
+    assert sorted(client.api.pulled) == ['gitlab/gitlab-ce:latest', 'nginx:latest', 'postgres:16']
+    # Pulls overlap: total time is the slowest pull, not the sum
+    assert elapsed < 0.9
+    # The slow image does not hold back the others
+    assert finished[-1] == 'gitlab'
+    assert all(error is None for _, _, error in results)
+    assert sorted(name for name, _, _ in results) == sorted(installs)
+
+    # Stopping early still lets pulls that finish afterwards hand off their installs
+    errors = []
+    handler = logging.Handler()
+    handler.emit = errors.append
+    logging.getLogger('concurrent.futures').addHandler(handler)
+    core.install_service = fake_install
+    try:
+        batch = core.install_services(FakePullClient({'gitlab/gitlab-ce:latest': 0.3}), installs, pull_parallel=4)
+        next(batch)
+        batch.close()
+    finally:
+        core.install_service = original_install
+        logging.getLogger('concurrent.futures').removeHandler(handler)
+    assert errors == []
+
+    assert core.normalize_image_reference('localhost:5000/app') == 'localhost:5000/app:latest'
+    assert core.normalize_image_reference('app@sha256:abc') == 'app@sha256:abc'
+
+    print("✓ Batch install pre-pull works correctly")
+
+def test_pull_progress():
+    """Test that per-layer events are aggregated into overall progress"""
+    progress = core.PullProgress('nginx:latest')
+    progress.update({'status': 'Pulling fs layer', 'id': 'a'})
+    assert progress.format() == 'nginx:latest: Pulling fs layer'
+
+    progress.started -= 2
+    progress.update({'status': 'Downloading', 'id': 'a', 'progressDetail': {'current': 1024 * 1024, 'total': 2 * 1024 * 1024}})
+    progress.update({'status': 'Downloading', 'id': 'b', 'progressDetail': {'current': 1024 * 1024, 'total': 2 * 1024 * 1024}})
+    # Extraction progress is not download progress
+    progress.update({'status': 'Extracting', 'id': 'a', 'progressDetail': {'current': 10, 'total': 4 * 1024 * 1024}})
+    assert progress.downloaded == 2 * 1024 * 1024
+    assert progress.total == 4 * 1024 * 1024
+    assert 0.9 < progress.rate / (1024 * 1024) < 1.1
+    assert 1.5 < progress.eta < 2.5
+    assert progress.format().startswith('nginx:latest: 50% of 4.0 MB at 1.0 MB/s, ETA 0:0')
+
+    progress.update({'status': 'Pull complete', 'id': 'a'})
+    progress.update({'status': 'Download complete', 'id': 'b'})
+    progress.finish()
+    assert progress.downloaded == progress.total
+    assert 'pulled 4.0 MB' in progress.format()
+
+    # Errors reported in the stream are raised
+    class ErrorAPI:
+        def pull(self, reference, stream=False, decode=False):
+            yield {'error': 'manifest unknown'}
+
+    class ErrorClient:
+        api = ErrorAPI()
+
+    try:
+        core.pull_image(ErrorClient(), 'missing:1.0')
+        assert False, "pull error not raised"
+    except core.docker.errors.APIError as e:
+        assert 'manifest unknown' in str(e)
+
+    reports = []
+    core.pull_image(FakePullClient({'nginx:latest': 0}), 'nginx', progress=reports.append)
+    assert reports[-1].finished is not None
+
+    print("✓ Pull progress works correctly")
+
+if __name__ == '__main__':
+    test_run_batch()
+    test_stack_dependency_levels()
+    test_stack_lifecycle()
+    test_install_services()
+    test_pull_progress()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Docker client registry
+
+Uses fake clients, so no Docker daemon is needed.
+"""
+
+import core
+
+class FakeClient:
+    """Stand-in for docker.DockerClient that records pings and closes"""
+
+    def __init__(self, docker_host):
+        self.docker_host = docker_host
+        self.pings = 0
+        self.closed = False
+        self.healthy = True
+
+    def ping(self):
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError("daemon went away")
+        return True
+
+    def close(self):
+        self.closed = True
+
+def test_client_registry():
+    """Test caching, lazy health checks and idle eviction"""
+    connections = []
+
+    def connect(docker_host):
+        client = FakeClient(docker_host)
+        connections.append(client)
+        return client
+
+    registry = core.ClientRegistry(connect=connect, health_ttl=60, idle_timeout=600)
+
+    # Clients are cached per host
+    local = registry.get(None)
+    remote = registry.get('ssh://admin@server')
+    assert registry.get(None) is local
+    assert registry.get('ssh://admin@server') is remote
+    assert len(connections) == 2
+    assert registry.is_cached('ssh://admin@server')
+
+    # Within the TTL there is no health check
+    assert remote.pings == 0
+
+    # After the TTL the client is pinged once, and replaced if it fails
+    registry.health_ttl = 0
+    remote.healthy = False
+    replacement = registry.get('ssh://admin@server')
+    assert replacement is not remote
+    assert remote.closed
+    assert len(connections) == 3
+
+    # Idle clients are closed and evicted
+    registry.idle_timeout = -1
+    registry.evict_idle()
+    assert local.closed and replacement.closed
+    assert not registry.is_cached(None)
+
+    print("✓ Client registry works correctly")
+
+def test_client_registry_pinning():
+    """Test that pinned clients are neither evicted nor closed while in use"""
+    registry = core.ClientRegistry(connect=FakeClient, health_ttl=60, idle_timeout=-1)
+
+    active = registry.get('ssh://admin@server')
+    registry.pin(active)
+    registry.get(None)  # evicts idle clients, but not the pinned one
+    assert not active.closed
+    assert registry.get('ssh://admin@server') is active
+
+    # A failed health check replaces the pinned client, but does not close it yet
+    registry.idle_timeout = 600
+    registry.health_ttl = 0
+    active.healthy = False
+    replacement = registry.get('ssh://admin@server')
+    assert replacement is not active
+    assert not active.closed
+
+    registry.unpin(active)
+    assert active.closed
+    assert not replacement.closed
+
+    print("✓ Pinned clients are kept open")
+
+if __name__ == '__main__':
+    test_client_registry()
+    test_client_registry_pinning()
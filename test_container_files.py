@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script to verify directory listing inside containers
+
+Uses a fake low-level API client, so no Docker daemon is needed.
+"""
+
+import threading
+
+import core
+
+class FakeAPI:
+    def __init__(self, stdout=b'', exit_code=0, hang=False):
+        self.stdout = stdout
+        self.exit_code = exit_code
+        self.hang = threading.Event() if hang else None
+
+    def exec_create(self, container, cmd, stdout=True, stderr=True):
+        return {'Id': 'exec-1'}
+
+    def exec_start(self, exec_id, demux=False):
+        if self.hang is not None:
+            self.hang.wait(5)
+        return self.stdout, b'ls: cannot access'
+
+    def exec_inspect(self, exec_id):
+        return {'ExitCode': self.exit_code}
+
+class FakeClient:
+    def __init__(self, api):
+        self.api = api
+
+def test_list_container_directory():
+    """Test listing, errors and the timeout for a hung container"""
+    client = FakeClient(FakeAPI(b'bin/\netc/\nhello.txt\n'))
+    assert core.list_container_directory(client, 'web', '/') == ['bin/', 'etc/', 'hello.txt']
+
+    try:
+        core.list_container_directory(FakeClient(FakeAPI(exit_code=2)), 'web', '/missing')
+        assert False, "failed listing not reported"
+    except OSError as e:
+        assert 'Cannot access path' in str(e)
+
+    api = FakeAPI(hang=True)
+    try:
+        core.list_container_directory(FakeClient(api), 'web', '/', timeout=0.1)
+        assert False, "hung listing not timed out"
+    except OSError as e:
+        assert 'Timed out' in str(e)
+    finally:
+        api.hang.set()
+
+    print("✓ Container directory listing works correctly")
+
+if __name__ == '__main__':
+    test_list_container_directory()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the container snapshot API
+
+Uses a fake low-level API client, so no Docker daemon is needed.
+"""
+
+import core
+
+class FakeAPI:
+    """Minimal stand-in for docker.APIClient that counts round-trips"""
+
+    def __init__(self, containers, images, volumes=None, networks=None):
+        self._containers = containers
+        self._images = images
+        self._volumes = volumes or []
+        self._networks = networks or []
+        self.calls = []
+
+    def containers(self, all=False, filters=None):
+        self.calls.append('containers')
+        containers = self._containers
+        if filters and 'id' in filters:
+            containers = [c for c in containers if c['Id'] == filters['id']]
+        if all:
+            return containers
+        return [c for c in containers if c['State'] == 'running']
+
+    def images(self):
+        self.calls.append('images')
+        return self._images
+
+    def volumes(self, filters=None):
+        self.calls.append('volumes')
+        volumes = self._volumes
+        if filters and 'name' in filters:
+            volumes = [v for v in volumes if filters['name'] in v['Name']]
+        return {'Volumes': volumes, 'Warnings': None}
+
+    def networks(self, ids=None):
+        self.calls.append('networks')
+        if ids:
+            return [n for n in self._networks if n['Id'] in ids]
+        return self._networks
+
+class FakeClient:
+    def __init__(self, api):
+        self.api = api
+
+CONTAINERS = [
+    {
+        'Id': 'a1b2c3d4e5f60718293a4b5c6d7e8f90',
+        'Names': ['/web'],
+        'Image': 'nginx:latest',
+        'ImageID': 'sha256:1111111111111111111111',
+        'State': 'running',
+        'Status': 'Up 3 hours (healthy)',
+        'Ports': [
+            {'IP': '0.0.0.0', 'PrivatePort': 80, 'PublicPort': 8080, 'Type': 'tcp'},
+            {'IP': '::', 'PrivatePort': 80, 'PublicPort': 8080, 'Type': 'tcp'},
+            {'PrivatePort': 443, 'Type': 'tcp'},
+        ],
+        'NetworkSettings': {'Networks': {'bridge': {}, 'frontend': {}}},
+        'Labels': {'com.docker.compose.project': 'site'},
+        'Mounts': [
+            {'Type': 'volume', 'Name': 'web-data', 'Destination': '/data'},
+            {'Type': 'bind', 'Source': '/srv/web', 'Destination': '/srv'},
+        ],
+    },
+    {
+        'Id': 'ffeeddccbbaa00998877665544332211',
+        'Names': ['/worker'],
+        'Image': 'sha256:2222222222222222222222',
+        'ImageID': 'sha256:2222222222222222222222',
+        'State': 'exited',
+        'Status': 'Exited (0) 2 days ago',
+        'Ports': [],
+        'NetworkSettings': {'Networks': {}},
+        'Labels': {'com.docker.compose.project': 'site'},
+        'Mounts': [{'Type': 'volume', 'Name': 'web-data', 'Destination': '/data'}],
+    },
+]
+
+IMAGES = [
+    {'Id': 'sha256:1111111111111111111111', 'RepoTags': ['nginx:latest']},
+    {'Id': 'sha256:2222222222222222222222', 'RepoTags': ['<none>:<none>']},
+]
+
+def test_container_snapshot():
+    """Test that the snapshot builds the same rows with two API calls"""
+    api = FakeAPI(CONTAINERS, IMAGES)
+    rows = core.get_container_snapshot(FakeClient(api), all=True)
+
+    assert api.calls == ['containers', 'images']
+    assert len(rows) == 2
+
+    web = rows[0]
+    assert web['id'] == 'a1b2c3d4e5f6'
+    assert web['name'] == 'web'
+    assert web['status'] == 'running'
+    assert web['image'] == 'nginx:latest'
+    assert web['uptime'] == '3 hours'
+    assert web['ports'] == '8080:80'
+    assert web['network'] == 'bridge, frontend'
+
+    worker = rows[1]
+    assert worker['image'] == 'sha256:2222222222'
+    assert worker['uptime'] == 'N/A'
+    assert worker['ports'] == 'N/A'
+    assert worker['network'] == 'N/A'
+
+    # Default is running containers only
+    running = core.get_running_container_details(FakeClient(FakeAPI(CONTAINERS, IMAGES)))
+    assert [r['name'] for r in running] == ['web']
+
+    print("✓ Container snapshot works correctly")
+
+def test_build_mount_index():
+    """Test that only named volume mounts are indexed"""
+    index = core.build_mount_index(CONTAINERS)
+    assert index == {'web-data': [CONTAINERS[0]['Id'], CONTAINERS[1]['Id']]}
+    assert core.build_mount_index([{'Id': 'x', 'Mounts': None}]) == {}
+
+    print("✓ Mount index works correctly")
+
+def test_inventory_snapshot():
+    """Test that the inventory snapshot fetches everything once and indexes it"""
+    volumes = [{'Name': 'web-data'}, {'Name': 'orphan'}]
+    networks = [{'Id': 'n1', 'Name': 'bridge'}, {'Id': 'n2', 'Name': 'frontend'}, {'Id': 'n3', 'Name': 'unused'}]
+    api = FakeAPI(CONTAINERS, IMAGES, volumes, networks)
+    inventory = core.InventorySnapshot.fetch(FakeClient(api))
+
+    assert sorted(api.calls) == ['containers', 'images', 'networks', 'volumes']
+
+    assert inventory.volume_in_use('web-data')
+    assert not inventory.volume_in_use('orphan')
+    assert len(inventory.volume_index['web-data']) == 2
+
+    assert inventory.image_in_use('sha256:1111111111111111111111')
+    assert sorted(inventory.project_index) == ['site']
+    assert len(inventory.project_index['site']) == 2
+
+    assert inventory.network_in_use('frontend')
+    assert not inventory.network_in_use('unused')
+
+    assert [r['name'] for r in inventory.container_rows()] == ['web']
+    assert inventory.container_row(CONTAINERS[1]) == inventory.container_rows(running_only=False)[1]
+    assert len(inventory.container_rows(running_only=False)) == 2
+
+    print("✓ Inventory snapshot works correctly")
+
+def test_event_updates():
+    """Test that events refetch only the affected resource and patch the snapshot"""
+    api = FakeAPI(CONTAINERS, IMAGES, [{'Name': 'web-data'}], [])
+    client = FakeClient(api)
+    inventory = core.InventorySnapshot.fetch(client)
+
+    # A container stops: only that container is listed again
+    api.calls = []
+    stopped = dict(CONTAINERS[0], State='exited', Status='Exited (0) 1 second ago')
+    api._containers = [stopped, CONTAINERS[1]]
+    event = {'Type': 'container', 'Action': 'die', 'Actor': {'ID': stopped['Id']}}
+    update = core.fetch_event_update(client, event)
+    assert api.calls == ['containers']
+    inventory = inventory.apply_update(update)
+    assert inventory.container_rows() == []
+
+    # Exec events are ignored
+    event = {'Type': 'container', 'Action': 'exec_start: sh', 'Actor': {'ID': stopped['Id']}}
+    assert core.fetch_event_update(client, event) is None
+
+    # A volume is destroyed
+    api._volumes = []
+    event = {'Type': 'volume', 'Action': 'destroy', 'Actor': {'ID': 'web-data'}}
+    inventory = inventory.apply_update(core.fetch_event_update(client, event))
+    assert inventory.volumes == []
+
+    # A container is removed
+    api._containers = [CONTAINERS[1]]
+    event = {'Type': 'container', 'Action': 'destroy', 'Actor': {'ID': stopped['Id']}}
+    inventory = inventory.apply_update(core.fetch_event_update(client, event))
+    assert [c['Id'] for c in inventory.containers] == [CONTAINERS[1]['Id']]
+
+    print("✓ Event updates work correctly")
+
+if __name__ == '__main__':
+    test_container_snapshot()
+    test_build_mount_index()
+    test_inventory_snapshot()
+    test_event_updates()
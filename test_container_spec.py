@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the container spec serializer
+
+Uses recorded inspect data and a fake low-level API client, so no Docker
+daemon is needed.
+"""
+
+import copy
+
+import core
+
+IMAGE_CONFIG = {
+    'Env': ['PATH=/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin', 'NGINX_VERSION=1.25.3'],
+    'Cmd': ['nginx', '-g', 'daemon off;'],
+    'Entrypoint': ['/docker-entrypoint.sh'],
+    'ExposedPorts': {'80/tcp': {}},
+    'Labels': {'maintainer': 'NGINX Docker Maintainers'},
+    'StopSignal': 'SIGQUIT',
+}
+
+ATTRS = {
+    'Id': 'a1b2c3d4e5f6a7b8c9d0',
+    'Name': '/site-web-1',
+    'Image': 'sha256:1111',
+    'Config': {
+        'Hostname': 'a1b2c3d4e5f6',
+        'Image': 'nginx:1.25',
+        'Env': IMAGE_CONFIG['Env'] + ['TZ=Europe/Berlin'],
+        'Cmd': ['nginx', '-g', 'daemon off;'],
+        'Entrypoint': ['/docker-entrypoint.sh'],
+        'ExposedPorts': {'80/tcp': {}},
+        'Labels': {
+            'maintainer': 'NGINX Docker Maintainers',
+            'com.docker.compose.project': 'site',
+            'com.docker.compose.service': 'web',
+            'com.docker.compose.depends_on': 'api:service_healthy:false',
+            'traefik.enable': 'true',
+        },
+        'StopSignal': 'SIGQUIT',
+        'Healthcheck': {'Test': ['CMD-SHELL', 'curl -f http://localhost/ || exit 1'], 'Interval': 30000000000, 'Retries': 3},
+    },
+    'HostConfig': {
+        'Binds': ['/srv/web:/usr/share/nginx/html:ro', 'web-cache:/var/cache/nginx:rw'],
+        'PortBindings': {'80/tcp': [{'HostIp': '', 'HostPort': '8080'}], '443/tcp': [{'HostIp': '127.0.0.1', 'HostPort': '8443'}]},
+        'RestartPolicy': {'Name': 'unless-stopped', 'MaximumRetryCount': 0},
+        'NetworkMode': 'site_frontend',
+        'CapAdd': ['NET_ADMIN'],
+        'Devices': [{'PathOnHost': '/dev/dri', 'PathInContainer': '/dev/dri', 'CgroupPermissions': 'rwm'}],
+        'ShmSize': 67108864,
+        'LogConfig': {'Type': 'json-file', 'Config': {}},
+    },
+    'Mounts': [
+        {'Type': 'bind', 'Source': '/srv/web', 'Destination': '/usr/share/nginx/html', 'RW': False},
+        {'Type': 'volume', 'Name': 'web-cache', 'Destination': '/var/cache/nginx', 'RW': True},
+        {'Type': 'volume', 'Name': 'f' * 64, 'Destination': '/var/log/nginx', 'RW': True},
+    ],
+    'NetworkSettings': {
+        'Networks': {
+            'site_frontend': {'Aliases': ['site-web-1', 'web', 'a1b2c3d4e5f6'], 'IPAddress': '172.20.0.3', 'NetworkID': 'n1'},
+            'site_backend': {'Aliases': ['web'], 'IPAMConfig': {'IPv4Address': '172.21.0.10'}, 'NetworkID': 'n2'},
+        },
+    },
+}
+
+def test_container_spec():
+    """Test that the spec keeps the container's own settings and drops image defaults"""
+    spec = core.container_spec(ATTRS, IMAGE_CONFIG)
+
+    assert spec['name'] == 'site-web-1'
+    config = spec['config']
+    assert config['Env'] == ['TZ=Europe/Berlin']
+    assert 'Cmd' not in config and 'Entrypoint' not in config and 'StopSignal' not in config
+    assert 'Hostname' not in config
+    assert 'ExposedPorts' not in config
+    assert 'maintainer' not in config['Labels']
+    assert config['Labels']['traefik.enable'] == 'true'
+    assert config['Healthcheck']['Retries'] == 3
+
+    # Anonymous volume is reused, existing binds are untouched
+    binds = spec['host_config']['Binds']
+    assert binds[:2] == ATTRS['HostConfig']['Binds']
+    assert binds[2] == f"{'f' * 64}:/var/log/nginx"
+
+    # Runtime-assigned endpoint data and the ID alias are dropped
+    assert spec['endpoints']['site_frontend'] == {'Aliases': ['site-web-1', 'web']}
+    assert spec['endpoints']['site_backend']['IPAMConfig'] == {'IPv4Address': '172.21.0.10'}
+
+    # Without the image config every value is kept
+    full = core.container_spec(ATTRS)
+    assert full['config']['Cmd'] == ['nginx', '-g', 'daemon off;']
+
+    print("✓ Container spec works correctly")
+
+class FakeAPI:
+    def __init__(self, api_version):
+        self.api_version = api_version
+        self.created = []
+        self.connected = []
+
+    def create_container_from_config(self, config, name=None):
+        self.created.append((name, config))
+        return {'Id': 'new-id'}
+
+    def connect_container_to_network(self, container, net_id, **kwargs):
+        self.connected.append((net_id, kwargs))
+
+class FakeContainers:
+    def get(self, container_id):
+        return container_id
+
+class FakeClient:
+    def __init__(self, api_version):
+        self.api = FakeAPI(api_version)
+        self.containers = FakeContainers()
+
+def test_create_container_from_spec():
+    """Test that recreation is a single create call on current daemons"""
+    spec = core.container_spec(ATTRS, IMAGE_CONFIG)
+
+    client = FakeClient('1.45')
+    assert core.create_container_from_spec(client, spec, 'web-update') == 'new-id'
+    name, body = client.api.created[0]
+    assert name == 'web-update'
+    assert body['HostConfig']['CapAdd'] == ['NET_ADMIN']
+    assert sorted(body['NetworkingConfig']['EndpointsConfig']) == ['site_backend', 'site_frontend']
+    assert client.api.connected == []
+
+    # Older daemons take one network at create time
+    client = FakeClient('1.41')
+    core.create_container_from_spec(client, spec)
+    name, body = client.api.created[0]
+    assert name == 'site-web-1'
+    assert list(body['NetworkingConfig']['EndpointsConfig']) == ['site_frontend']
+    assert client.api.connected == [('site_backend', {
+        'aliases': ['web'], 'links': None, 'ipv4_address': '172.21.0.10', 'ipv6_address': None, 'driver_opt': None,
+    })]
+
+    print("✓ Create from spec works correctly")
+
+def test_spec_to_run_args():
+    """Test the docker run rendering of a spec"""
+    spec = core.container_spec(ATTRS, IMAGE_CONFIG)
+    options, command, extra_networks = core.spec_to_run_args(spec)
+
+    assert options[0] == ('--name', 'site-web-1')
+    assert ('-e', 'TZ=Europe/Berlin') in options
+    assert ('-p', '8080:80') in options
+    assert ('-p', '127.0.0.1:8443:443') in options
+    assert ('-v', '/srv/web:/usr/share/nginx/html:ro') in options
+    assert ('--network', 'site_frontend') in options
+    assert ('--network-alias', 'web') in options
+    assert ('--restart', 'unless-stopped') in options
+    assert ('--cap-add', 'NET_ADMIN') in options
+    assert ('--device', '/dev/dri:/dev/dri:rwm') in options
+    assert ('--health-cmd', 'curl -f http://localhost/ || exit 1') in options
+    assert ('--health-interval', '30s') in options
+    assert not any(flag in ('--shm-size', '--log-driver', '--entrypoint') for flag, _ in options)
+    assert command == ['nginx:1.25']
+    assert extra_networks == [('site_backend', ['web'])]
+
+    print("✓ docker run rendering works correctly")
+
+def test_spec_to_compose_service():
+    """Test the docker-compose rendering of a spec"""
+    spec = core.container_spec(ATTRS, IMAGE_CONFIG)
+    service, volumes, networks = core.spec_to_compose_service(spec)
+
+    assert service['image'] == 'nginx:1.25'
+    assert service['environment'] == {'TZ': 'Europe/Berlin'}
+    assert service['ports'] == ['8080:80', '127.0.0.1:8443:443']
+    assert service['restart'] == 'unless-stopped'
+    assert service['depends_on'] == {'api': {'condition': 'service_healthy'}}
+    assert service['labels'] == {'traefik.enable': 'true'}
+    assert service['networks']['site_backend'] == {'aliases': ['web'], 'ipv4_address': '172.21.0.10'}
+    assert service['healthcheck']['interval'] == '30s'
+    assert 'command' not in service
+    assert volumes == {'web-cache', 'f' * 64}
+    assert networks == {'site_frontend', 'site_backend'}
+
+    print("✓ docker-compose rendering works correctly")
+
+def test_endpoint_mac_address():
+    """Test that user-assigned endpoint MAC addresses survive and derived ones are dropped"""
+    attrs = copy.deepcopy(ATTRS)
+    networks = attrs['NetworkSettings']['Networks']
+    networks['site_frontend']['MacAddress'] = '02:42:ac:14:00:03'
+    networks['site_frontend']['IPAddress'] = '172.20.0.3'
+    networks['site_backend']['MacAddress'] = '02:00:00:00:be:ef'
+    spec = core.container_spec(attrs, IMAGE_CONFIG)
+
+    assert 'MacAddress' not in spec['endpoints']['site_frontend']
+    assert spec['endpoints']['site_backend']['MacAddress'] == '02:00:00:00:be:ef'
+
+    client = FakeClient('1.45')
+    core.create_container_from_spec(client, spec)
+    _, body = client.api.created[0]
+    assert body['NetworkingConfig']['EndpointsConfig']['site_backend']['MacAddress'] == '02:00:00:00:be:ef'
+
+    service, _, _ = core.spec_to_compose_service(spec)
+    assert service['networks']['site_backend']['mac_address'] == '02:00:00:00:be:ef'
+
+    # docker run sets the MAC of the network it starts on
+    attrs['HostConfig']['NetworkMode'] = 'site_backend'
+    options, _, _ = core.spec_to_run_args(core.container_spec(attrs, IMAGE_CONFIG))
+    assert ('--mac-address', '02:00:00:00:be:ef') in options
+
+    print("✓ Endpoint MAC addresses are preserved")
+
+if __name__ == '__main__':
+    test_container_spec()
+    test_create_container_from_spec()
+    test_spec_to_run_args()
+    test_spec_to_compose_service()
+    test_endpoint_mac_address()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script to verify concurrent status checks across remote hosts
+
+Replaces the per-host query with a fake, so no Docker hosts are needed.
+"""
+
+import threading
+import time
+
+import core
+
+REMOTE_HOSTS = {
+    'fast': {'docker_host': 'ssh://admin@fast'},
+    'slow': {'docker_host': 'ssh://admin@slow'},
+    'down': {'docker_host': 'ssh://admin@down'},
+    'hung': {'docker_host': 'ssh://admin@hung'},
+}
+
+def fake_get_host_status(docker_host, timeout=None):
+    if docker_host.endswith('@slow'):
+        time.sleep(0.3)
+    elif docker_host.endswith('@down'):
+        raise ConnectionError("connection refused")
+    elif docker_host.endswith('@hung'):
+        time.sleep(5)
+    return {'running': 1, 'total': 2, 'containers': [('db', 'exited'), ('web', 'running')]}
+
+def test_fleet_status():
+    """Test that results stream in as hosts answer and hung hosts time out"""
+    original = core.get_host_status
+    core.get_host_status = fake_get_host_status
+    try:
+        start = time.monotonic()
+        results = []
+        for name, docker_host, status, error in core.iter_fleet_status(REMOTE_HOSTS, max_workers=4, timeout=1):
+            results.append((name, time.monotonic() - start, status, error))
+        elapsed = time.monotonic() - start
+    finally:
+        core.get_host_status = original
+
+    order = [name for name, _, _, _ in results]
+    assert sorted(order) == sorted(REMOTE_HOSTS)
+    # The hung host is reported last, after its timeout, without waiting 5 seconds
+    assert order[-1] == 'hung'
+    assert elapsed < 3
+
+    by_name = {name: (status, error) for name, _, status, error in results}
+    assert by_name['fast'][0]['running'] == 1
+    assert 'refused' in by_name['down'][1]
+    assert 'Timed out' in by_name['hung'][1]
+
+    print("✓ Fleet status works correctly")
+
+def test_fleet_status_concurrency():
+    """Test that a timed-out host keeps its slot until its query returns"""
+    lock = threading.Lock()
+    running = [0, 0]  # current, maximum
+
+    def counting_get_host_status(docker_host, timeout=None):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        try:
+            time.sleep(0.6 if docker_host.endswith('@hung') else 0.05)
+            return {'running': 0, 'total': 0, 'containers': []}
+        finally:
+            with lock:
+                running[0] -= 1
+
+    hosts = {'hung': {'docker_host': 'ssh://admin@hung'}}
+    hosts.update({f"host{i}": {'docker_host': f"ssh://admin@host{i}"} for i in range(4)})
+
+    original = core.get_host_status
+    core.get_host_status = counting_get_host_status
+    try:
+        results = list(core.iter_fleet_status(hosts, max_workers=2, timeout=0.2))
+    finally:
+        core.get_host_status = original
+
+    assert len(results) == 5
+    assert running[1] <= 2
+
+    print("✓ Fleet status respects max_workers")
+
+def test_fleet_status_all_slots_hung():
+    """Test that hosts queued behind hung hosts still time out"""
+    def hanging_get_host_status(docker_host, timeout=None):
+        time.sleep(3)
+        return {'running': 0, 'total': 0, 'containers': []}
+
+    hosts = {f"host{i}": {'docker_host': f"ssh://admin@host{i}"} for i in range(4)}
+
+    original = core.get_host_status
+    core.get_host_status = hanging_get_host_status
+    try:
+        start = time.monotonic()
+        results = list(core.iter_fleet_status(hosts, max_workers=2, timeout=0.3))
+        elapsed = time.monotonic() - start
+    finally:
+        core.get_host_status = original
+
+    assert sorted(name for name, _, _, _ in results) == sorted(hosts)
+    assert all('Timed out' in error for _, _, _, error in results)
+    assert elapsed < 2
+
+    print("✓ Queued hosts time out behind hung hosts")
+
+if __name__ == '__main__':
+    test_fleet_status()
+    test_fleet_status_concurrency()
+    test_fleet_status_all_slots_hung()
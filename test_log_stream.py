@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test script to verify log streaming
+
+Uses a fake low-level API client, so no Docker daemon is needed.
+"""
+
+import threading
+import time
+
+import core
+
+class FakeStream:
+    """Stand-in for docker-py's CancellableStream"""
+
+    def __init__(self, chunks, block=False):
+        self.chunks = chunks
+        self.block = block
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield chunk
+        if self.block:
+            # A follow waits for new lines until the stream is closed
+            self.closed.wait(5)
+            raise OSError("socket closed")
+
+    def close(self):
+        self.closed.set()
+
+class FakeAPI:
+    def __init__(self, chunks, block=False):
+        self.stream = FakeStream(chunks, block)
+        self.kwargs = None
+
+    def logs(self, container, **kwargs):
+        self.kwargs = kwargs
+        return self.stream
+
+class FakeClient:
+    def __init__(self, chunks, block=False):
+        self.api = FakeAPI(chunks, block)
+
+def test_log_stream():
+    """Test that chunks are split into lines across chunk boundaries"""
+    client = FakeClient([b'first line\nsec', b'ond line\n', b'caf\xc3', b'\xa9\nno newline'])
+    lines = list(core.LogStream(client, 'web', tail=50))
+    assert lines == ['first line', 'second line', 'café', 'no newline']
+    assert client.api.kwargs['stream'] is True
+    assert client.api.kwargs['tail'] == 50
+
+    print("✓ Log stream works correctly")
+
+def test_log_stream_close():
+    """Test that closing a follow from another thread ends the iteration quietly"""
+    client = FakeClient([b'one\n', b'two\n'], block=True)
+    stream = core.LogStream(client, 'web', follow=True)
+    lines = []
+
+    def read():
+        for line in stream:
+            lines.append(line)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    while len(lines) < 2:
+        time.sleep(0.01)
+    stream.close()
+    reader.join(2)
+
+    assert not reader.is_alive()
+    assert lines == ['one', 'two']
+
+    print("✓ Log stream close works correctly")
+
+def test_log_search():
+    """Test that only matching lines are returned and counted"""
+    chunks = [
+        b'2024-05-01T10:00:00.000000001Z GET /health 200\n',
+        b'2024-05-01T10:00:01.5Z ERROR database timeout\n2024-05-01T10:00:02Z GET /api 500\n',
+        b'2024-05-01T10:00:03Z error: retrying\n',
+    ]
+    client = FakeClient(chunks)
+    search = core.LogSearch(client, 'web', 'error', since=1714557600)
+    lines = list(search)
+    assert lines == [
+        '2024-05-01T10:00:01.5Z ERROR database timeout',
+        '2024-05-01T10:00:03Z error: retrying',
+    ]
+    assert (search.matches, search.scanned) == (2, 4)
+    assert client.api.kwargs['since'] == 1714557600
+    assert client.api.kwargs['tail'] == 'all'
+
+    # Timestamps are not searched, regexes and case are honored
+    assert list(core.LogSearch(FakeClient(chunks), 'web', '2024')) == []
+    assert len(list(core.LogSearch(FakeClient(chunks), 'web', 'error', ignore_case=False))) == 1
+    assert len(list(core.LogSearch(FakeClient(chunks), 'web', r' [45]\d\d$', regex=True))) == 1
+
+    try:
+        core.LogSearch(FakeClient(chunks), 'web', '(', regex=True)
+        assert False, "invalid regex accepted"
+    except ValueError:
+        pass
+
+    try:
+        core.LogSearch(FakeClient(chunks), 'web', 'error', since=1714557600, until=1714554000)
+        assert False, "reversed time range accepted"
+    except ValueError:
+        pass
+
+    print("✓ Log search works correctly")
+
+def test_parse_log_time():
+    """Test relative and absolute time bounds"""
+    now = 1_000_000
+    assert core.parse_log_time('90s', now) == now - 90
+    assert core.parse_log_time('2h', now) == now - 7200
+    assert core.parse_log_time(' 1d ', now) == now - 86400
+    assert core.parse_log_time('2024-05-01 14:00') == core.parse_log_time('2024-05-01T14:00:00')
+    assert core.parse_log_time('2024-05-01') < core.parse_log_time('2024-05-01 00:00:01')
+
+    for invalid in ('', 'yesterday', '2h30', '2024-13-01'):
+        try:
+            core.parse_log_time(invalid)
+            assert False, f"{invalid!r} accepted"
+        except ValueError:
+            pass
+
+    print("✓ Log time parsing works correctly")
+
+class FakeMultiAPI:
+    """Fake API with one log stream per container"""
+
+    def __init__(self, streams):
+        self.streams = streams
+
+    def logs(self, container, **kwargs):
+        return self.streams[container]
+
+class FakeMultiClient:
+    def __init__(self, streams):
+        self.api = FakeMultiAPI(streams)
+
+def test_parse_log_timestamp():
+    """Test that daemon timestamps are parsed with their fraction"""
+    timestamp, message = core.parse_log_timestamp('2024-05-01T10:00:01.5Z GET /api 500')
+    assert message == 'GET /api 500'
+    assert abs(timestamp - 1714557601.5) < 1e-6
+    assert core.parse_log_timestamp('2024-05-01T10:00:00Z started')[0] == 1714557600.0
+    assert core.parse_log_timestamp('no timestamp here') == (None, 'no timestamp here')
+
+    print("✓ Log timestamp parsing works correctly")
+
+def test_merged_log_tail():
+    """Test that logs of several containers are merged by timestamp"""
+    client = FakeMultiClient({
+        'web': FakeStream([b'2024-05-01T10:00:01Z web 1\n2024-05-01T10:00:03.25Z web 2\n']),
+        'db': FakeStream([b'2024-05-01T10:00:00.5Z db 1\n', b'2024-05-01T10:00:02Z db 2\n2024-05-01T10:00:04Z db 3\n']),
+        'cache': FakeStream([]),
+    })
+    merged = core.MergedLogTail(client, [('web', 'web'), ('db', 'db'), ('cache', 'cache')], follow=False)
+    lines = [(name, message) for name, _, message in merged]
+    assert lines == [('db', 'db 1'), ('web', 'web 1'), ('db', 'db 2'), ('web', 'web 2'), ('db', 'db 3')]
+
+    print("✓ Merged log tail works correctly")
+
+def test_merged_log_tail_quiet_container():
+    """Test that a container without new lines does not hold back the others"""
+    client = FakeMultiClient({
+        'web': FakeStream([b'2024-05-01T10:00:01Z web 1\n'], block=True),
+        'db': FakeStream([], block=True),
+    })
+    merged = core.MergedLogTail(client, [('web', 'web'), ('db', 'db')], window=0.2)
+    lines = []
+
+    def read():
+        for entry in merged:
+            lines.append(entry)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    deadline = time.monotonic() + 2
+    while not lines and time.monotonic() < deadline:
+        time.sleep(0.01)
+    merged.close()
+    reader.join(2)
+
+    assert [message for _, _, message in lines] == ['web 1']
+    assert not reader.is_alive()
+
+    print("✓ Merged log tail releases lines of quiet containers")
+
+if __name__ == '__main__':
+    test_log_stream()
+    test_log_stream_close()
+    test_log_search()
+    test_parse_log_time()
+    test_parse_log_timestamp()
+    test_merged_log_tail()
+    test_merged_log_tail_quiet_container()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the compiled service catalog index
+
+Builds an index over a temporary services directory and checks that it is
+reused while fresh and refreshed when a service file changes, and that full
+definitions are loaded on demand.
+"""
+
+import os
+import tempfile
+
+import core
+
+SERVICE_TEMPLATE = """name: {name}
+description: "{description}"
+image: {name}:latest
+"""
+
+def write_service(services_dir, name, description):
+    with open(os.path.join(services_dir, f"{name}.yml"), 'w') as f:
+        f.write(SERVICE_TEMPLATE.format(name=name, description=description))
+
+def test_service_index():
+    """Test that the catalog index is used while fresh and invalidated on change"""
+    with tempfile.TemporaryDirectory() as tmp:
+        services_dir = os.path.join(tmp, 'services')
+        os.makedirs(services_dir)
+        write_service(services_dir, 'alpha', 'First service')
+        write_service(services_dir, 'beta', 'Second service')
+
+        original_dir_func = core.get_services_directory
+        original_index = core.CATALOG_INDEX_FILE
+        core.get_services_directory = lambda: services_dir
+        core.CATALOG_INDEX_FILE = os.path.join(tmp, 'index.json')
+        try:
+            # First call parses the files and writes the index
+            services = core.get_service_summaries()
+            assert sorted(s['name'] for s in services) == ['alpha', 'beta']
+            assert os.path.exists(core.CATALOG_INDEX_FILE)
+            assert set(services[0]) == set(core.SERVICE_SUMMARY_FIELDS)
+
+            entries, skipped = core._read_service_index(services_dir)
+            assert sorted(entries) == ['alpha', 'beta']
+            assert skipped == {}
+            assert 'summary' in entries['alpha']
+
+            # Changing a file (size differs) refreshes its entry
+            write_service(services_dir, 'beta', 'Second service, now updated')
+            services = core.get_service_summaries()
+            beta = [s for s in services if s['name'] == 'beta'][0]
+            assert beta['description'] == 'Second service, now updated'
+            assert core.load_service_config('beta')['description'] == 'Second service, now updated'
+
+            # Adding a file also shows up
+            write_service(services_dir, 'gamma', 'Third service')
+            assert len(core.get_service_summaries()) == 3
+            assert core.get_available_services() == core.get_service_summaries()
+
+            assert core.rebuild_service_index() == 3
+        finally:
+            core.get_services_directory = original_dir_func
+            core.CATALOG_INDEX_FILE = original_index
+
+    print("✓ Service catalog index works correctly")
+
+def test_service_index_skipped_files():
+    """Test that broken and duplicate files are recorded and not re-parsed on every lookup"""
+    with tempfile.TemporaryDirectory() as tmp:
+        services_dir = os.path.join(tmp, 'services')
+        os.makedirs(services_dir)
+        write_service(services_dir, 'alpha', 'First service')
+        with open(os.path.join(services_dir, 'broken.yml'), 'w') as f:
+            f.write("name: [unclosed\n")
+        # Second definition of alpha under another file name
+        with open(os.path.join(services_dir, 'zz-alpha-copy.yml'), 'w') as f:
+            f.write(SERVICE_TEMPLATE.format(name='alpha', description='Copy'))
+
+        original_dir_func = core.get_services_directory
+        original_index = core.CATALOG_INDEX_FILE
+        original_write = core._write_service_index
+        writes = []
+
+        def counting_write(*args):
+            writes.append(args)
+            original_write(*args)
+
+        core.get_services_directory = lambda: services_dir
+        core.CATALOG_INDEX_FILE = os.path.join(tmp, 'index.json')
+        core._write_service_index = counting_write
+        try:
+            summaries = core.get_service_summaries()
+            assert [s['description'] for s in summaries] == ['First service']
+            _, skipped = core._read_service_index(services_dir)
+            assert sorted(skipped) == ['broken.yml', 'zz-alpha-copy.yml']
+            assert skipped['zz-alpha-copy.yml']['duplicate_of'] == 'alpha'
+
+            # Nothing changed: the index is not rewritten
+            core.get_service_summaries()
+            core.get_available_services()
+            assert len(writes) == 1
+
+            # Fixing the broken file indexes it
+            write_service(services_dir, 'broken', 'Fixed service')
+            assert len(core.get_service_summaries()) == 2
+            assert len(writes) == 2
+
+            # Removing the original lets the duplicate take over the name
+            os.remove(os.path.join(services_dir, 'alpha.yml'))
+            alpha = [s for s in core.get_service_summaries() if s['name'] == 'alpha'][0]
+            assert alpha['description'] == 'Copy'
+        finally:
+            core.get_services_directory = original_dir_func
+            core.CATALOG_INDEX_FILE = original_index
+            core._write_service_index = original_write
+
+    print("✓ Skipped service files are recorded in the index")
+
+def test_load_service_config_cache():
+    """Test that full definitions are cached and callers get independent copies"""
+    with tempfile.TemporaryDirectory() as tmp:
+        services_dir = os.path.join(tmp, 'services')
+        os.makedirs(services_dir)
+        write_service(services_dir, 'alpha', 'First service')
+        # File name differs from the service name
+        with open(os.path.join(services_dir, 'misnamed.yml'), 'w') as f:
+            f.write(SERVICE_TEMPLATE.format(name='renamed', description='Renamed service'))
+
+        original_dir_func = core.get_services_directory
+        original_index = core.CATALOG_INDEX_FILE
+        core.get_services_directory = lambda: services_dir
+        core.CATALOG_INDEX_FILE = os.path.join(tmp, 'index.json')
+        core._parse_service_definition.cache_clear()
+        try:
+            first = core.load_service_config('alpha')
+            first['description'] = 'modified by caller'
+            second = core.load_service_config('alpha')
+            assert second['description'] == 'First service'
+            assert core._parse_service_definition.cache_info().hits >= 1
+
+            assert core.load_service_config('renamed')['image'] == 'renamed:latest'
+        finally:
+            core.get_services_directory = original_dir_func
+            core.CATALOG_INDEX_FILE = original_index
+
+    print("✓ Service definition cache works correctly")
+
+if __name__ == '__main__':
+    test_service_index()
+    test_service_index_skipped_files()
+    test_load_service_config_cache()
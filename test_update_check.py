@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the registry digest check in update_service
+
+Uses fake clients, so no Docker daemon or registry is needed.
+"""
+
+import docker
+
+import core
+
+class FakeImage:
+    def __init__(self, image_id, repo_digests):
+        self.id = image_id
+        self.attrs = {'Id': image_id, 'RepoDigests': repo_digests}
+
+class FakeRegistryData:
+    def __init__(self, digest):
+        self.id = digest
+
+class FakeImages:
+    def __init__(self, local, remote_digest):
+        self.local = local
+        self.remote_digest = remote_digest
+        self.pulled = []
+
+    def get(self, name):
+        if self.local is None:
+            raise docker.errors.ImageNotFound(name)
+        return self.local
+
+    def get_registry_data(self, name):
+        if self.remote_digest is None:
+            raise docker.errors.APIError("registry unreachable")
+        return FakeRegistryData(self.remote_digest)
+
+class FakeAPI:
+    base_url = 'http+docker://ssh'
+    api_version = '1.45'
+
+    def __init__(self, images, containers):
+        self.images = images
+        self.containers = containers
+        self.connected = []
+
+    def disconnect_container_from_network(self, container, net_id):
+        self.connected = [c for c in self.connected if c[1] != net_id]
+
+    def connect_container_to_network(self, container, net_id, **kwargs):
+        self.connected.append((container, net_id, kwargs))
+
+    def pull(self, reference, stream=False, decode=False):
+        self.images.pulled.append(reference)
+        yield {'status': 'Status: Downloaded newer image for ' + reference}
+
+    def inspect_image(self, image_id):
+        return {'Config': {'Image': '', 'Env': ['PATH=/usr/bin'], 'Cmd': ['nginx']}}
+
+    def create_container_from_config(self, config, name=None):
+        self.containers.created.append(dict(config, name=name))
+        new = FakeContainer('sha256:new', name, self.containers.new_health)
+        new.fail_rename = self.containers.fail_rename
+        self.containers.by_id[new.id] = new
+        return {'Id': new.id}
+
+class FakeContainer:
+    def __init__(self, image_id, name='web', health=None):
+        self.id = f"{name}-id"
+        self.name = name
+        self.status = 'running'
+        self.removed = False
+        self.short_id = 'abc123'
+        self.attrs = {
+            'Id': '0123456789abcdef',
+            'Name': f"/{name}",
+            'Image': image_id,
+            'Config': {'Image': 'nginx:latest', 'Env': ['PATH=/usr/bin', 'TZ=UTC'], 'Cmd': ['nginx']},
+            'HostConfig': {'Binds': [], 'PortBindings': {}, 'RestartPolicy': {}},
+            'NetworkSettings': {'Ports': {}, 'Networks': {}},
+            'State': {'Status': 'created'},
+        }
+        if health:
+            self.attrs['State']['Health'] = {'Status': health}
+
+    def start(self):
+        self.status = 'running'
+        self.attrs['State']['Status'] = 'running'
+
+    def stop(self, timeout=10):
+        self.status = 'exited'
+
+    def remove(self, force=False):
+        self.removed = True
+
+    def reload(self):
+        pass
+
+    def rename(self, name):
+        if getattr(self, 'fail_rename', False):
+            raise docker.errors.APIError("name in use")
+        self.name = name
+
+class FakeContainers:
+    def __init__(self, container, new_health='healthy'):
+        self.container = container
+        self.new_health = new_health
+        self.fail_rename = False
+        self.created = []
+        self.by_id = {}
+
+    def get(self, name):
+        if name in self.by_id:
+            return self.by_id[name]
+        if name != self.container.name:
+            raise docker.errors.NotFound(name)
+        return self.container
+
+class FakeClient:
+    def __init__(self, container_image, local, remote_digest):
+        self.containers = FakeContainers(FakeContainer(container_image))
+        self.images = FakeImages(local, remote_digest)
+        self.api = FakeAPI(self.images, self.containers)
+
+def test_update_check():
+    """Test that unchanged images skip the pull and the recreation"""
+    local = FakeImage('sha256:aaa', ['nginx@sha256:digest1'])
+
+    # Same digest, container runs the current image: nothing to do
+    client = FakeClient('sha256:aaa', local, 'sha256:digest1')
+    assert 'is up to date' in core.update_service(client, 'web', check_only=True)
+    assert 'already up to date' in core.update_service(client, 'web')
+    assert client.images.pulled == []
+    assert not client.containers.container.removed
+
+    # New digest in the registry: check only reports it
+    client = FakeClient('sha256:aaa', local, 'sha256:digest2')
+    assert 'Update available' in core.update_service(client, 'web', check_only=True)
+    assert client.images.pulled == []
+
+    # ... and a real update pulls and recreates
+    assert 'updated successfully' in core.update_service(client, 'web')
+    assert client.images.pulled == ['nginx:latest']
+    assert client.containers.container.removed
+    assert len(client.containers.created) == 1
+    # Only the container's own settings are carried over, the image supplies the rest
+    assert client.containers.created[0]['Env'] == ['TZ=UTC']
+    assert 'Cmd' not in client.containers.created[0]
+
+    # Tag already pulled but container not recreated: recreate without pulling
+    client = FakeClient('sha256:old', local, 'sha256:digest1')
+    assert 'updated successfully' in core.update_service(client, 'web')
+    assert client.images.pulled == []
+
+    # Registry unreachable: fall back to pulling
+    client = FakeClient('sha256:aaa', local, None)
+    try:
+        core.update_service(client, 'web', check_only=True)
+        assert False, "failed check not reported as an error"
+    except RuntimeError as e:
+        assert 'Could not check' in str(e)
+    core.update_service(client, 'web')
+    assert client.images.pulled == ['nginx:latest']
+
+    print("✓ Update digest check works correctly")
+
+def test_blue_green_update():
+    """Test that the old container is only replaced once the new one is healthy"""
+    local = FakeImage('sha256:aaa', ['nginx@sha256:digest1'])
+
+    client = FakeClient('sha256:aaa', local, 'sha256:digest2')
+    old = client.containers.container
+    assert 'healthy' in core.update_service(client, 'web', strategy='blue-green')
+    assert client.containers.created[0]['name'] == 'web' + core.BLUE_GREEN_SUFFIX
+    assert old.removed
+
+    # An unhealthy replacement is removed and the old container keeps running
+    client = FakeClient('sha256:aaa', local, 'sha256:digest2')
+    client.containers.new_health = 'unhealthy'
+    old = client.containers.container
+    try:
+        core.update_service(client, 'web', strategy='blue-green')
+        assert False, "failed update not reported"
+    except RuntimeError as e:
+        assert 'rolled back' in str(e)
+    assert not old.removed
+    assert old.status == 'running'
+
+    # Fixed addresses are left out of the temporary container and restored afterwards
+    client = FakeClient('sha256:aaa', local, 'sha256:digest2')
+    old = client.containers.container
+    old.attrs['Config']['MacAddress'] = '02:42:ac:11:00:09'
+    old.attrs['HostConfig']['NetworkMode'] = 'app'
+    old.attrs['NetworkSettings']['Networks'] = {
+        'app': {'IPAMConfig': {'IPv4Address': '172.20.0.9'}, 'Aliases': ['web'], 'IPAddress': '172.20.0.9'},
+    }
+    core.update_service(client, 'web', strategy='blue-green')
+    created = client.containers.created[0]
+    assert 'MacAddress' not in created
+    assert 'IPAMConfig' not in created['NetworkingConfig']['EndpointsConfig']['app']
+    (container_id, network, options), = client.api.connected
+    assert container_id == 'web-update-id' and network == 'app'
+    assert options['ipv4_address'] == '172.20.0.9'
+    assert options['mac_address'] == '02:42:ac:11:00:09'
+    assert options['aliases'] == ['web']
+
+    # Writable mounts would be shared, so the old container is stopped first and restarted on failure
+    mounts = [{'Type': 'volume', 'Name': 'data', 'Destination': '/data', 'RW': True}]
+    client = FakeClient('sha256:aaa', local, 'sha256:digest2')
+    client.containers.container.attrs['Mounts'] = mounts
+    client.containers.new_health = 'unhealthy'
+    old = client.containers.container
+    old.start = lambda: setattr(old, 'restarted', True)
+    try:
+        core.update_service(client, 'web', strategy='blue-green')
+        assert False, "failed update not reported"
+    except RuntimeError as e:
+        assert 'rolled back' in str(e)
+    assert client.containers.created[0]['name'] == 'web' + core.BLUE_GREEN_SUFFIX
+    assert old.restarted and not old.removed
+
+    # ... unless the caller opts in
+    client = FakeClient('sha256:aaa', local, 'sha256:digest2')
+    client.containers.container.attrs['Mounts'] = mounts
+    core.update_service(client, 'web', strategy='blue-green', allow_shared_mounts=True)
+    assert client.containers.container.status == 'running'
+
+    # A failed rename of the new container gives the old one its name back
+    client = FakeClient('sha256:aaa', local, 'sha256:digest2')
+    client.containers.fail_rename = True
+    old = client.containers.container
+    try:
+        core.update_service(client, 'web', strategy='blue-green')
+        assert False, "failed rename not reported"
+    except RuntimeError as e:
+        assert 'rolled back' in str(e)
+    assert old.name == 'web' and not old.removed
+
+    # Without healthcheck or reachable port only the grace period is waited for
+    container = FakeContainer('sha256:aaa')
+    container.start()
+    assert 'assumed ready' in core.wait_until_ready(client, container, grace=0)
+
+    try:
+        core.update_service(client, 'web', strategy='rolling')
+        assert False, "unknown strategy accepted"
+    except ValueError:
+        pass
+
+    print("✓ Blue/green update works correctly")
+
+if __name__ == '__main__':
+    test_update_check()
+    test_blue_green_update()
@@ -0,0 +1,43 @@
+"""
+YAML input/output for docker_helper
+Uses the libyaml C loader/dumper when PyYAML was built with it
+"""
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    YAML_BACKEND = 'libyaml'
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    YAML_BACKEND = 'python'
+
+def safe_load(stream, loader=None):
+    """
+    Parse a YAML document using the fastest available safe loader.
+
+    Args:
+        stream: YAML string or open file
+        loader: Optional loader class to force a specific backend
+
+    Returns:
+        The parsed Python object
+
+    Raises:
+        yaml.YAMLError: If YAML is invalid
+    """
+    return yaml.load(stream, Loader=loader or SafeLoader)
+
+def dump(data, stream=None, **kwargs):
+    """
+    Serialize data to YAML using the fastest available safe dumper.
+
+    Args:
+        data: Python object to serialize
+        stream: Optional open file to write to; if omitted, the YAML is returned
+        **kwargs: Formatting options passed to yaml.dump (default_flow_style, sort_keys, indent, ...)
+
+    Returns:
+        str or None: YAML text if no stream was given
+    """
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)